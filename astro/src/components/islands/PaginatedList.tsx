@@ -4,9 +4,19 @@ import QuestionCard from "./QuestionCard";
 import BillCard from "./BillCard";
 import SittingCard from "./SittingCard";
 
-interface DataResponse {
-  items: ListItem[];
+// Date-sharded list feed written by python/export_lists_sqlite.py
+interface ListShard {
+  key: string; // YYYY-MM, or "undated"
+  count: number;
+  hash: string;
+  path: string;
+  gzipPath: string;
+}
+
+interface ListManifest {
+  feed: string;
   total: number;
+  shards: ListShard[]; // newest first, matching the list order
 }
 
 interface PagefindResult {
@@ -54,6 +64,31 @@ function filterByDateRange(
   });
 }
 
+// Whether a month shard can hold items dated within [from, to]
+function shardInRange(key: string, from: string, to: string): boolean {
+  if (!from && !to) return true;
+  if (key === "undated") return false;
+  if (from && key < from.slice(0, 7)) return false;
+  if (to && key > to.slice(0, 7)) return false;
+  return true;
+}
+
+// Fetch one shard, inflating the pre-compressed copy where the browser supports it
+async function fetchShard(manifestUrl: string, shard: ListShard): Promise<ListItem[]> {
+  const base = new URL(manifestUrl, window.location.href);
+  const version = `?v=${shard.hash.slice(0, 12)}`;
+  if (typeof DecompressionStream === "undefined") {
+    const response = await fetch(new URL(shard.path + version, base));
+    return ((await response.json()) as { items: ListItem[] }).items;
+  }
+  const response = await fetch(new URL(shard.gzipPath + version, base));
+  // Hosts that serve .gz files with Content-Encoding have already inflated the body
+  const body = response.headers.get("Content-Encoding")?.includes("gzip")
+    ? response.body!
+    : response.body!.pipeThrough(new DecompressionStream("gzip"));
+  return ((await new Response(body).json()) as { items: ListItem[] }).items;
+}
+
 // Number of extra pages to prefetch ahead of the current page
 const PREFETCH_PAGES = 2;
 
@@ -75,7 +110,6 @@ export default function PaginatedList({
   const [searchResults, setSearchResults] = useState<ListItem[]>([]);
   const [searchTotalCount, setSearchTotalCount] = useState(0);
   const [isSearchMode, setIsSearchMode] = useState(false);
-  const [allData, setAllData] = useState<ListItem[] | null>(null);
   const [isLoading, setIsLoading] = useState(false);
   const [dateFrom, setDateFrom] = useState("");
   const [dateTo, setDateTo] = useState("");
@@ -84,6 +118,9 @@ export default function PaginatedList({
   const [searchHasDateFilter, setSearchHasDateFilter] = useState(false);
 
   const pagefindRef = useRef<Pagefind | null>(null);
+  const manifestRef = useRef<ListManifest | null>(null);
+  // Shard key -> items, kept as promises so concurrent requests share one fetch
+  const shardCacheRef = useRef<Map<string, Promise<ListItem[]>>>(new Map());
   const debounceRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const inputRef = useRef<HTMLInputElement>(null);
   const searchSeqRef = useRef(0);
@@ -157,19 +194,73 @@ export default function PaginatedList({
     }
   }, []);
 
-  // Fetch all JSON data
-  const fetchAllData = useCallback(async (): Promise<ListItem[]> => {
-    if (allData) return allData;
-    try {
+  const loadManifest = useCallback(async (): Promise<ListManifest> => {
+    if (!manifestRef.current) {
       const response = await fetch(dataUrl);
-      const data: DataResponse = await response.json();
-      setAllData(data.items);
-      return data.items;
-    } catch (e) {
-      console.error("Failed to fetch JSON data:", e);
-      return [];
+      manifestRef.current = (await response.json()) as ListManifest;
     }
-  }, [dataUrl, allData]);
+    return manifestRef.current;
+  }, [dataUrl]);
+
+  const loadShards = useCallback(
+    async (shards: ListShard[]): Promise<ListItem[]> => {
+      const lists = await Promise.all(
+        shards.map((shard) => {
+          let pending = shardCacheRef.current.get(shard.key);
+          if (!pending) {
+            pending = fetchShard(dataUrl, shard);
+            pending.catch(() => shardCacheRef.current.delete(shard.key));
+            shardCacheRef.current.set(shard.key, pending);
+          }
+          return pending;
+        }),
+      );
+      return lists.flat();
+    },
+    [dataUrl],
+  );
+
+  // Fetch the items dated within [from, to], or every item when neither is set.
+  // Only the month shards overlapping the range are downloaded.
+  const fetchData = useCallback(
+    async (from = "", to = ""): Promise<ListItem[]> => {
+      try {
+        const manifest = await loadManifest();
+        return await loadShards(
+          manifest.shards.filter((shard) => shardInRange(shard.key, from, to)),
+        );
+      } catch (e) {
+        console.error("Failed to fetch JSON data:", e);
+        return [];
+      }
+    },
+    [loadManifest, loadShards],
+  );
+
+  // Fetch items [start, end) of the full list, downloading only the shards that cover them
+  const fetchSlice = useCallback(
+    async (start: number, end: number): Promise<ListItem[]> => {
+      try {
+        const manifest = await loadManifest();
+        const shards: ListShard[] = [];
+        let offset = 0;
+        let firstOffset = 0;
+        for (const shard of manifest.shards) {
+          if (offset + shard.count > start && offset < end) {
+            if (!shards.length) firstOffset = offset;
+            shards.push(shard);
+          }
+          offset += shard.count;
+        }
+        const items = await loadShards(shards);
+        return items.slice(start - firstOffset, end - firstOffset);
+      } catch (e) {
+        console.error("Failed to fetch JSON data:", e);
+        return [];
+      }
+    },
+    [loadManifest, loadShards],
+  );
 
   // Resolve a set of pagefind result indices and cache index -> id mappings.
   const resolveFragmentIndices = useCallback(
@@ -330,14 +421,14 @@ export default function PaginatedList({
       }
 
       setIsLoading(true);
-      const data = await fetchAllData();
+      const data = await fetchData(from, to);
       const filtered = filterByDateRange(data, from, to);
       setFilteredResults(filtered);
       setPage(1);
       updateUrlParams(1, "", from, to);
       setIsLoading(false);
     },
-    [fetchAllData, initialItems, updateUrlParams],
+    [fetchData, initialItems, updateUrlParams],
   );
 
   // Perform search
@@ -370,7 +461,7 @@ export default function PaginatedList({
 
       setIsLoading(true);
       const pf = await loadPagefind();
-      const data = await fetchAllData();
+      const data = await fetchData(filterFrom, filterTo);
       if (searchSeq !== searchSeqRef.current) return;
 
       if (!pf) {
@@ -469,7 +560,7 @@ export default function PaginatedList({
       contentType,
       dateFrom,
       dateTo,
-      fetchAllData,
+      fetchData,
       initialItems,
       loadPagefind,
       resolveSearchPage,
@@ -487,13 +578,12 @@ export default function PaginatedList({
       }
 
       setIsLoading(true);
-      const data = await fetchAllData();
       const start = (pageNum - 1) * pageSize;
-      const pageItems = data.slice(start, start + pageSize);
+      const pageItems = await fetchSlice(start, start + pageSize);
       setItems(pageItems);
       setIsLoading(false);
     },
-    [fetchAllData, initialItems, pageSize],
+    [fetchSlice, initialItems, pageSize],
   );
 
   // Handle page change
@@ -504,7 +594,7 @@ export default function PaginatedList({
       if (isSearchMode && !searchHasDateFilter) {
         // Lazy search mode: resolve fragments for the new page
         setIsLoading(true);
-        const data = await fetchAllData();
+        const data = await fetchData();
         const seq = searchSeqRef.current;
         const pageItems = await resolveSearchPage(newPage, data, seq);
         if (pageItems !== null) {
@@ -525,7 +615,7 @@ export default function PaginatedList({
       isSearchMode,
       searchHasDateFilter,
       isDateFilterMode,
-      fetchAllData,
+      fetchData,
       resolveSearchPage,
       loadPage,
       query,
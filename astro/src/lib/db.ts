@@ -62,6 +62,17 @@ export interface Section {
   speakers?: Speaker[];
   sourceUrl?: string | null;
   summary?: string | null;
+  turns?: TranscriptTurn[];
+}
+
+// A section transcript pre-split into speaker turns by the Python ingest
+export interface TranscriptTurn {
+  turnIndex: number;
+  kind: 'speech' | 'procedural' | 'timestamp' | 'standalone';
+  speakerLabel: string | null;
+  memberId: string | null;
+  contentHtml: string;
+  contentPlain: string;
 }
 
 export interface Bill {
@@ -75,6 +86,16 @@ export interface Bill {
   summary?: string | null;
 }
 
+export interface SittingBill {
+  billId: string;
+  billTitle: string;
+  sectionTitle: string;
+  ministry: string | null;
+  ministryId: string | null;
+  readingTypes: string[];
+  sectionOrder: number;
+}
+
 export interface Attendee {
   id: string;
   name: string;
@@ -129,6 +150,26 @@ export function getSitting(id: string): Sitting | undefined {
   return db.prepare(sql).get(id) as Sitting | undefined;
 }
 
+// Pre-built sitting page data written by the Python ingest (sitting_documents.py)
+export interface SittingDocument {
+  sitting: Sitting;
+  sections: Section[];
+  attendees: Attendee[];
+  bills: SittingBill[];
+}
+
+const hasSittingDocuments = !!db.prepare(
+  `SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sitting_documents'`
+).get();
+
+// Everything a sitting page renders in one primary-key read. Returns undefined
+// when the document has not been built, so callers can fall back to the queries below.
+export function getSittingDocument(sittingId: string): SittingDocument | undefined {
+  if (!hasSittingDocuments) return undefined;
+  const row = db.prepare('SELECT document FROM sitting_documents WHERE sitting_id = ?').get(sittingId) as { document: string } | undefined;
+  return row ? JSON.parse(row.document) as SittingDocument : undefined;
+}
+
 export function getSittingSections(sittingId: string): Section[] {
   const sql = `
     SELECT
@@ -210,7 +251,7 @@ export function getSittingAttendees(sittingId: string): Attendee[] {
   }));
 }
 
-export function getSittingBills(sittingId: string): { billId: string; billTitle: string; sectionTitle: string; ministry: string | null; ministryId: string | null; readingTypes: string[]; sectionOrder: number }[] {
+export function getSittingBills(sittingId: string): SittingBill[] {
   const sql = `
     SELECT
       sec.bill_id as billId,
@@ -229,7 +270,7 @@ export function getSittingBills(sittingId: string): { billId: string; billTitle:
   const results = db.prepare(sql).all(sittingId) as { billId: string; billTitle: string; sectionTitle: string; ministry: string | null; ministryId: string | null; sectionType: string; sectionOrder: number }[];
 
   // Group by bill and collect reading types
-  const billMap = new Map<string, { billId: string; billTitle: string; sectionTitle: string; ministry: string | null; ministryId: string | null; readingTypes: string[]; sectionOrder: number }>();
+  const billMap = new Map<string, SittingBill>();
 
   for (const row of results) {
     if (!billMap.has(row.billId)) {
@@ -291,8 +332,6 @@ export function getMember(id: string): Member | undefined {
       m.name,
       ms.summary,
       COUNT(DISTINCT ss.section_id) as sectionCount,
-      (SELECT COUNT(*) FROM sitting_attendance WHERE member_id = m.id) as attendanceTotal,
-      (SELECT COUNT(*) FROM sitting_attendance WHERE member_id = m.id AND present = 1) as attendancePresent,
       (
         SELECT sa.constituency FROM sitting_attendance sa
         JOIN sittings s ON sa.sitting_id = s.id
@@ -313,9 +352,29 @@ export function getMember(id: string): Member | undefined {
     WHERE m.id = ?
     GROUP BY m.id
   `;
-  return db.prepare(sql).get(id) as Member | undefined;
+  const member = db.prepare(sql).get(id) as Member | undefined;
+  if (member) {
+    Object.assign(member, getAttendanceCounts(id));
+  }
+  return member;
 }
 
+// Rollup tables maintained by the Python ingest (rollups.py).
+// Databases built before they existed, or where they are created but not yet
+// filled, fall back to aggregating sections.
+const hasRollups = !!db.prepare(
+  `SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bill_status'`
+).get() && !!db.prepare(
+  `SELECT 1 FROM bill_status UNION ALL SELECT 1 FROM ministry_activity LIMIT 1`
+).get();
+
+const hasSecondReadingColumn = hasRollups
+  ? `COALESCE((SELECT bs.has_second_reading FROM bill_status bs WHERE bs.bill_id = b.id), 0) as hasSecondReading`
+  : `EXISTS(
+        SELECT 1 FROM sections sec
+        WHERE sec.bill_id = b.id AND sec.section_type = 'BP'
+      ) as hasSecondReading`;
+
 export function getBills(limit?: number, offset?: number): Bill[] {
   const sql = `
     SELECT
@@ -326,10 +385,7 @@ export function getBills(limit?: number, offset?: number): Bill[] {
       b.first_reading_date as firstReadingDate,
       b.first_reading_sitting_id as firstReadingSittingId,
       b.summary,
-      EXISTS(
-        SELECT 1 FROM sections sec
-        WHERE sec.bill_id = b.id AND sec.section_type = 'BP'
-      ) as hasSecondReading
+      ${hasSecondReadingColumn}
     FROM bills b
     LEFT JOIN ministries m ON b.ministry_id = m.id
     ORDER BY b.first_reading_date DESC NULLS LAST
@@ -355,10 +411,7 @@ export function getBill(id: string): Bill | undefined {
       b.first_reading_date as firstReadingDate,
       b.first_reading_sitting_id as firstReadingSittingId,
       b.summary,
-      EXISTS(
-        SELECT 1 FROM sections sec
-        WHERE sec.bill_id = b.id AND sec.section_type = 'BP'
-      ) as hasSecondReading
+      ${hasSecondReadingColumn}
     FROM bills b
     LEFT JOIN ministries m ON b.ministry_id = m.id
     WHERE b.id = ?
@@ -368,6 +421,8 @@ export function getBill(id: string): Bill | undefined {
   return { ...result, hasSecondReading: result.hasSecondReading === 1 };
 }
 
+// Sections count towards their bill's ministry first, as in ministry_activity
+// and getMinistryParliamentStats
 export function getMinistries(): Ministry[] {
   const latestParl = getLatestParliament();
   const sql = `
@@ -375,11 +430,17 @@ export function getMinistries(): Ministry[] {
       m.id,
       m.name,
       m.acronym,
-      (
+      ${hasRollups
+        ? `(
+        SELECT COALESCE(SUM(ma.section_count), 0) FROM ministry_activity ma
+        WHERE ma.ministry_id = m.id AND ma.parliament = ?
+      )`
+        : `(
         SELECT COUNT(*) FROM sections sec
         JOIN sittings sit ON sec.sitting_id = sit.id
-        WHERE sec.ministry_id = m.id AND sit.parliament = ?
-      ) as sectionCount
+        LEFT JOIN bills b ON sec.bill_id = b.id
+        WHERE COALESCE(b.ministry_id, sec.ministry_id) = m.id AND sit.parliament = ?
+      )`} as sectionCount
     FROM ministries m
     ORDER BY m.name ASC
   `;
@@ -387,20 +448,61 @@ export function getMinistries(): Ministry[] {
 }
 
 export function getMinistry(id: string): Ministry | undefined {
+  if (hasRollups) {
+    return db.prepare(`
+      SELECT
+        m.id,
+        m.name,
+        m.acronym,
+        COALESCE(SUM(ma.section_count), 0) as sectionCount
+      FROM ministries m
+      LEFT JOIN ministry_activity ma ON m.id = ma.ministry_id
+      WHERE m.id = ?
+      GROUP BY m.id
+    `).get(id) as Ministry | undefined;
+  }
+
   const sql = `
     SELECT
       m.id,
       m.name,
       m.acronym,
-      COUNT(sec.id) as sectionCount
+      (
+        SELECT COUNT(*) FROM sections sec
+        LEFT JOIN bills b ON sec.bill_id = b.id
+        WHERE COALESCE(b.ministry_id, sec.ministry_id) = m.id
+      ) as sectionCount
     FROM ministries m
-    LEFT JOIN sections sec ON m.id = sec.ministry_id
     WHERE m.id = ?
-    GROUP BY m.id
   `;
   return db.prepare(sql).get(id) as Ministry | undefined;
 }
 
+// Sort keys maintained by python/pagination.py; databases without them sort the sections instead
+const hasSectionListKeys = !!db.prepare(
+  `SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'section_list_keys'`
+).get() && !!db.prepare(`SELECT 1 FROM section_list_keys LIMIT 1`).get();
+
+// FROM, WHERE and ORDER BY for a section list feed. With section_list_keys the
+// rows are read in list order straight off its primary key.
+function sectionFeedSource(feed: 'questions' | 'motions' | 'clarifications', condition: string): string {
+  if (!hasSectionListKeys) {
+    return `
+    FROM sections sec
+    JOIN sittings s ON sec.sitting_id = s.id
+    LEFT JOIN ministries m ON sec.ministry_id = m.id
+    WHERE ${condition}
+    ORDER BY s.date DESC, sec.section_order ASC`;
+  }
+  return `
+    FROM section_list_keys k
+    JOIN sections sec ON sec.id = k.section_id
+    JOIN sittings s ON sec.sitting_id = s.id
+    LEFT JOIN ministries m ON sec.ministry_id = m.id
+    WHERE k.feed = '${feed}'
+    ORDER BY k.sitting_date DESC, k.section_order ASC, k.section_id ASC`;
+}
+
 // Questions - sections that are questions (OA, WA, WANA) and not bill readings
 export function getQuestions(limit?: number, offset?: number): Section[] {
   const sql = `
@@ -418,12 +520,7 @@ export function getQuestions(limit?: number, offset?: number): Section[] {
       sec.summary,
       m.name as ministry,
       sec.ministry_id as ministryId
-    FROM sections sec
-    JOIN sittings s ON sec.sitting_id = s.id
-    LEFT JOIN ministries m ON sec.ministry_id = m.id
-    WHERE sec.section_type IN ('OA', 'WA', 'WANA')
-      AND sec.section_type NOT IN ('BI', 'BP')
-    ORDER BY s.date DESC, sec.section_order ASC
+    ${sectionFeedSource('questions', `sec.section_type IN ('OA', 'WA', 'WANA')`)}
     ${limit ? `LIMIT ${limit}` : ''}
     ${offset ? `OFFSET ${offset}` : ''}
   `;
@@ -491,11 +588,7 @@ export function getMotions(limit?: number, offset?: number): Section[] {
       sec.summary,
       m.name as ministry,
       sec.ministry_id as ministryId
-    FROM sections sec
-    JOIN sittings s ON sec.sitting_id = s.id
-    LEFT JOIN ministries m ON sec.ministry_id = m.id
-    WHERE sec.category IN ('motion', 'adjournment_motion')
-    ORDER BY s.date DESC, sec.section_order ASC
+    ${sectionFeedSource('motions', `sec.category IN ('motion', 'adjournment_motion')`)}
     ${limit ? `LIMIT ${limit}` : ''}
     ${offset ? `OFFSET ${offset}` : ''}
   `;
@@ -562,11 +655,7 @@ export function getClarifications(limit?: number, offset?: number): Section[] {
       sec.summary,
       m.name as ministry,
       sec.ministry_id as ministryId
-    FROM sections sec
-    JOIN sittings s ON sec.sitting_id = s.id
-    LEFT JOIN ministries m ON sec.ministry_id = m.id
-    WHERE sec.category = 'clarification'
-    ORDER BY s.date DESC, sec.section_order ASC
+    ${sectionFeedSource('clarifications', `sec.category = 'clarification'`)}
     ${limit ? `LIMIT ${limit}` : ''}
     ${offset ? `OFFSET ${offset}` : ''}
   `;
@@ -616,6 +705,42 @@ export function getClarificationCount(): number {
   return result.count;
 }
 
+// Databases ingested before section_utterances existed fall back to client-side splitting
+const hasUtterances = !!db.prepare(
+  `SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'section_utterances'`
+).get();
+
+// Get pre-split transcript turns for a set of sections, keyed by section ID
+function getSectionTurns(sectionIds: string[]): Map<string, TranscriptTurn[]> {
+  const turnMap = new Map<string, TranscriptTurn[]>();
+  if (!hasUtterances || sectionIds.length === 0) {
+    return turnMap;
+  }
+
+  const sql = `
+    SELECT
+      section_id as sectionId,
+      turn_index as turnIndex,
+      kind,
+      speaker_label as speakerLabel,
+      member_id as memberId,
+      content_html as contentHtml,
+      content_plain as contentPlain
+    FROM section_utterances
+    WHERE section_id IN (${sectionIds.map(() => '?').join(',')})
+    ORDER BY section_id, turn_index
+  `;
+  const turns = db.prepare(sql).all(...sectionIds) as (TranscriptTurn & { sectionId: string })[];
+
+  for (const { sectionId, ...turn } of turns) {
+    if (!turnMap.has(sectionId)) {
+      turnMap.set(sectionId, []);
+    }
+    turnMap.get(sectionId)!.push(turn);
+  }
+  return turnMap;
+}
+
 // Get a single section with full content
 export function getSection(id: string): Section | undefined {
   const sql = `
@@ -656,6 +781,7 @@ export function getSection(id: string): Section | undefined {
       WHERE ss.section_id = ?
     `;
     section.speakers = db.prepare(speakerSql).all(id) as Speaker[];
+    section.turns = getSectionTurns([id]).get(id) || [];
   }
 
   return section;
@@ -734,7 +860,105 @@ export interface AttendanceRecord {
   present: boolean;
 }
 
+// Packed per-parliament attendance maintained by the Python ingest (attendance_bitmaps.py).
+// Databases built before member_attendance existed, or where it has been created but not yet
+// built, fall back to sitting_attendance.
+const hasAttendanceBitmaps = !!db.prepare(
+  `SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'member_attendance'`
+).get() && !!db.prepare(`SELECT 1 FROM member_attendance LIMIT 1`).get();
+
+// Sittings of a parliament in bitmap order (shared by every member, so cached per build)
+const parliamentSittingsCache = new Map<number, { sittingId: string; date: string; sittingNo: number }[]>();
+
+function getParliamentSittings(parliament: number) {
+  let sittings = parliamentSittingsCache.get(parliament);
+  if (!sittings) {
+    sittings = db.prepare(`
+      SELECT id as sittingId, date, sitting_no as sittingNo
+      FROM sittings
+      WHERE parliament = ?
+      ORDER BY date
+    `).all(parliament) as { sittingId: string; date: string; sittingNo: number }[];
+    parliamentSittingsCache.set(parliament, sittings);
+  }
+  return sittings;
+}
+
+function isBitSet(bits: Buffer, index: number): boolean {
+  return (bits[index >> 3] & (1 << (index & 7))) !== 0;
+}
+
+// Present/total attendance for a member in one parliament, or across all parliaments
+function getAttendanceCounts(memberId: string, parliament?: number): { attendancePresent: number; attendanceTotal: number } {
+  if (hasAttendanceBitmaps) {
+    return db.prepare(`
+      SELECT
+        COALESCE(SUM(present_count), 0) as attendancePresent,
+        COALESCE(SUM(present_count + absent_count), 0) as attendanceTotal
+      FROM member_attendance
+      WHERE member_id = ? AND (? IS NULL OR parliament = ?)
+    `).get(memberId, parliament ?? null, parliament ?? null) as { attendancePresent: number; attendanceTotal: number };
+  }
+
+  return db.prepare(`
+    SELECT
+      COUNT(*) as attendanceTotal,
+      COALESCE(SUM(sa.present), 0) as attendancePresent
+    FROM sitting_attendance sa
+    JOIN sittings s ON sa.sitting_id = s.id
+    WHERE sa.member_id = ? AND (? IS NULL OR s.parliament = ?)
+  `).get(memberId, parliament ?? null, parliament ?? null) as { attendancePresent: number; attendanceTotal: number };
+}
+
+// Member list columns: attendanceTotal and attendancePresent for one parliament (two ? parameters)
+const parliamentAttendanceColumns = hasAttendanceBitmaps
+  ? `
+      (SELECT present_count + absent_count FROM member_attendance WHERE member_id = m.id AND parliament = ?) as attendanceTotal,
+      (SELECT present_count FROM member_attendance WHERE member_id = m.id AND parliament = ?) as attendancePresent,`
+  : `
+      (
+        SELECT COUNT(*) FROM sitting_attendance sa2
+        JOIN sittings s2 ON sa2.sitting_id = s2.id
+        WHERE sa2.member_id = m.id AND s2.parliament = ?
+      ) as attendanceTotal,
+      (
+        SELECT COUNT(*) FROM sitting_attendance sa3
+        JOIN sittings s3 ON sa3.sitting_id = s3.id
+        WHERE sa3.member_id = m.id AND sa3.present = 1 AND s3.parliament = ?
+      ) as attendancePresent,`;
+
+// Member list columns: attendanceTotal and attendancePresent across all parliaments
+const allTimeAttendanceColumns = hasAttendanceBitmaps
+  ? `
+      (SELECT SUM(present_count + absent_count) FROM member_attendance WHERE member_id = m.id) as attendanceTotal,
+      (SELECT SUM(present_count) FROM member_attendance WHERE member_id = m.id) as attendancePresent,`
+  : `
+      (SELECT COUNT(*) FROM sitting_attendance WHERE member_id = m.id) as attendanceTotal,
+      (SELECT COUNT(*) FROM sitting_attendance WHERE member_id = m.id AND present = 1) as attendancePresent,`;
+
 export function getMemberAttendance(memberId: string): AttendanceRecord[] {
+  if (hasAttendanceBitmaps) {
+    const rows = db.prepare(`
+      SELECT parliament, sitting_count as sittingCount, present_bits as presentBits, absent_bits as absentBits
+      FROM member_attendance
+      WHERE member_id = ?
+      ORDER BY parliament DESC
+    `).all(memberId) as { parliament: number; sittingCount: number; presentBits: Buffer; absentBits: Buffer }[];
+
+    const records: AttendanceRecord[] = [];
+    for (const row of rows) {
+      const sittings = getParliamentSittings(row.parliament);
+      const count = Math.min(row.sittingCount, sittings.length);
+      for (let i = count - 1; i >= 0; i--) {
+        const present = isBitSet(row.presentBits, i);
+        if (present || isBitSet(row.absentBits, i)) {
+          records.push({ ...sittings[i], present });
+        }
+      }
+    }
+    return records;
+  }
+
   const sql = `
     SELECT
       sa.sitting_id as sittingId,
@@ -811,17 +1035,7 @@ export function getMemberCurrentParliamentStats(memberId: string): CurrentParlia
       AND sec.section_type IN ('BI', 'BP')
   `).get(memberId, latestParl) as { count: number }).count;
 
-  const attendanceTotal = (db.prepare(`
-    SELECT COUNT(*) as count FROM sitting_attendance sa
-    JOIN sittings s ON sa.sitting_id = s.id
-    WHERE sa.member_id = ? AND s.parliament = ?
-  `).get(memberId, latestParl) as { count: number }).count;
-
-  const attendancePresent = (db.prepare(`
-    SELECT COUNT(*) as count FROM sitting_attendance sa
-    JOIN sittings s ON sa.sitting_id = s.id
-    WHERE sa.member_id = ? AND s.parliament = ? AND sa.present = 1
-  `).get(memberId, latestParl) as { count: number }).count;
+  const { attendancePresent, attendanceTotal } = getAttendanceCounts(memberId, latestParl);
 
   return { involvements, questions, motions, bills, attendancePresent, attendanceTotal };
 }
@@ -903,17 +1117,7 @@ export function getMemberParliamentStats(memberId: string): ParliamentStats[] {
         AND sec.section_type IN ('BI', 'BP')
     `).get(memberId, parliament) as { count: number }).count;
 
-    const attendanceTotal = (db.prepare(`
-      SELECT COUNT(*) as count FROM sitting_attendance sa
-      JOIN sittings s ON sa.sitting_id = s.id
-      WHERE sa.member_id = ? AND s.parliament = ?
-    `).get(memberId, parliament) as { count: number }).count;
-
-    const attendancePresent = (db.prepare(`
-      SELECT COUNT(*) as count FROM sitting_attendance sa
-      JOIN sittings s ON sa.sitting_id = s.id
-      WHERE sa.member_id = ? AND s.parliament = ? AND sa.present = 1
-    `).get(memberId, parliament) as { count: number }).count;
+    const { attendancePresent, attendanceTotal } = getAttendanceCounts(memberId, parliament);
 
     return { parliament, involvements, oralQuestions, writtenQuestions, unansweredQuestions, motions, bills, attendancePresent, attendanceTotal };
   });
@@ -968,6 +1172,7 @@ export interface BillSection {
   contentPlain: string;
   sourceUrl: string | null;
   speakers: Speaker[];
+  turns: TranscriptTurn[];
 }
 
 export function getBillSections(billId: string): BillSection[] {
@@ -1017,8 +1222,11 @@ export function getBillSections(billId: string): BillSection[] {
       });
     }
 
+    const turnMap = getSectionTurns(sections.map(s => s.id));
+
     for (const section of sections) {
       section.speakers = speakerMap.get(section.id) || [];
+      section.turns = turnMap.get(section.id) || [];
     }
   }
 
@@ -1100,6 +1308,26 @@ export interface MinistryParliamentStats {
 }
 
 export function getMinistryParliamentStats(ministryId: string): MinistryParliamentStats[] {
+  if (hasRollups) {
+    return db.prepare(`
+      SELECT
+        ma.parliament,
+        SUM(ma.section_count) as involvements,
+        SUM(CASE WHEN ma.section_type = 'OA' THEN ma.section_count ELSE 0 END) as oralQuestions,
+        SUM(CASE WHEN ma.section_type = 'WA' THEN ma.section_count ELSE 0 END) as writtenQuestions,
+        SUM(CASE WHEN ma.section_type = 'WANA' THEN ma.section_count ELSE 0 END) as unansweredQuestions,
+        SUM(CASE WHEN ma.category IN ('motion', 'adjournment_motion', 'statement') THEN ma.section_count ELSE 0 END) as motions,
+        (
+          SELECT COUNT(*) FROM bill_status bs, json_each(bs.parliaments) p
+          WHERE bs.ministry_id = ma.ministry_id AND p.value = ma.parliament
+        ) as bills
+      FROM ministry_activity ma
+      WHERE ma.ministry_id = ?
+      GROUP BY ma.parliament
+      ORDER BY ma.parliament DESC
+    `).all(ministryId) as MinistryParliamentStats[];
+  }
+
   const sql = `
     SELECT
       sit.parliament,
@@ -1130,10 +1358,7 @@ export function getMinistryBills(ministryId: string): Bill[] {
       b.first_reading_date as firstReadingDate,
       b.first_reading_sitting_id as firstReadingSittingId,
       b.summary,
-      EXISTS(
-        SELECT 1 FROM sections sec
-        WHERE sec.bill_id = b.id AND sec.section_type = 'BP'
-      ) as hasSecondReading
+      ${hasSecondReadingColumn}
     FROM bills b
     LEFT JOIN ministries m ON b.ministry_id = m.id
     WHERE b.ministry_id = ?
@@ -1158,16 +1383,7 @@ export function getMembersWithInfo(limit?: number, offset?: number): Member[] {
         JOIN sittings sit ON sec.sitting_id = sit.id
         WHERE ss2.member_id = m.id AND sit.parliament = ?
       ) as sectionCount,
-      (
-        SELECT COUNT(*) FROM sitting_attendance sa2
-        JOIN sittings s2 ON sa2.sitting_id = s2.id
-        WHERE sa2.member_id = m.id AND s2.parliament = ?
-      ) as attendanceTotal,
-      (
-        SELECT COUNT(*) FROM sitting_attendance sa3
-        JOIN sittings s3 ON sa3.sitting_id = s3.id
-        WHERE sa3.member_id = m.id AND sa3.present = 1 AND s3.parliament = ?
-      ) as attendancePresent,
+      ${parliamentAttendanceColumns}
       (
         SELECT sa.constituency FROM sitting_attendance sa
         JOIN sittings s ON sa.sitting_id = s.id
@@ -1216,16 +1432,7 @@ export function getMembersForParliament(parliament: number): Member[] {
         JOIN sittings sit ON sec.sitting_id = sit.id
         WHERE ss2.member_id = m.id AND sit.parliament = ?
       ) as sectionCount,
-      (
-        SELECT COUNT(*) FROM sitting_attendance sa2
-        JOIN sittings s2 ON sa2.sitting_id = s2.id
-        WHERE sa2.member_id = m.id AND s2.parliament = ?
-      ) as attendanceTotal,
-      (
-        SELECT COUNT(*) FROM sitting_attendance sa3
-        JOIN sittings s3 ON sa3.sitting_id = s3.id
-        WHERE sa3.member_id = m.id AND sa3.present = 1 AND s3.parliament = ?
-      ) as attendancePresent,
+      ${parliamentAttendanceColumns}
       (
         SELECT sa.constituency FROM sitting_attendance sa
         JOIN sittings s ON sa.sitting_id = s.id
@@ -1267,8 +1474,7 @@ export function getAllMembersWithInfo(): Member[] {
       m.name,
       ms.summary,
       COUNT(DISTINCT ss.section_id) as sectionCount,
-      (SELECT COUNT(*) FROM sitting_attendance WHERE member_id = m.id) as attendanceTotal,
-      (SELECT COUNT(*) FROM sitting_attendance WHERE member_id = m.id AND present = 1) as attendancePresent,
+      ${allTimeAttendanceColumns}
       (
         SELECT sa.constituency FROM sitting_attendance sa
         JOIN sittings s ON sa.sitting_id = s.id
@@ -0,0 +1,144 @@
+"""
+Packed attendance bitmaps per member and parliament.
+
+For each (member, parliament), member_attendance holds two bitsets over
+the parliament's sittings in date order: bit i of present_bits is set if
+the member attended the i-th sitting, and bit i of absent_bits if they
+were recorded absent. Neither bit set means the member was not in the
+attendance list for that sitting. Bits are little-endian within each
+byte, and present/absent counts are cached alongside.
+
+Ingest calls update_sitting_bitmaps() after a sitting's attendance is
+saved. A sitting appended after the last known one (or re-ingested) only
+touches that sitting's bit; anything that shifts positions, such as
+backfilling an older sitting, rebuilds the parliament, as does a
+parliament with earlier sittings but no bitmaps yet.
+
+Run directly to rebuild every parliament.
+"""
+from typing import Dict, List
+
+import db_sqlite as db
+
+
+def pack(bits: int, length: int) -> bytes:
+    return bits.to_bytes((length + 7) // 8, 'little')
+
+
+def unpack(blob: bytes) -> int:
+    return int.from_bytes(blob or b'', 'little')
+
+
+def get_parliament_sittings(parliament: int) -> List[str]:
+    """Sitting IDs for a parliament in bit order."""
+    conn = db.get_connection()
+    rows = conn.execute(
+        'SELECT id FROM sittings WHERE parliament = ? ORDER BY date', (parliament,)
+    ).fetchall()
+    return [row['id'] for row in rows]
+
+
+def _write_rows(parliament: int, sitting_count: int, bitmaps: Dict[str, List[int]]):
+    """Upsert {member_id: [present_bits, absent_bits]} for a parliament."""
+    conn = db.get_connection()
+    conn.executemany(
+        '''INSERT INTO member_attendance
+           (member_id, parliament, sitting_count, present_bits, absent_bits, present_count, absent_count)
+           VALUES (?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT (member_id, parliament) DO UPDATE SET
+           sitting_count = excluded.sitting_count,
+           present_bits = excluded.present_bits,
+           absent_bits = excluded.absent_bits,
+           present_count = excluded.present_count,
+           absent_count = excluded.absent_count,
+           updated_at = datetime('now')''',
+        [
+            (member_id, parliament, sitting_count,
+             pack(present, sitting_count), pack(absent, sitting_count),
+             present.bit_count(), absent.bit_count())
+            for member_id, (present, absent) in bitmaps.items()
+        ]
+    )
+
+
+def rebuild_parliament(parliament: int):
+    """Recompute every member's bitmaps for a parliament from sitting_attendance."""
+    conn = db.get_connection()
+    sittings = get_parliament_sittings(parliament)
+    position = {sitting_id: i for i, sitting_id in enumerate(sittings)}
+
+    bitmaps = {}
+    rows = conn.execute(
+        '''SELECT sa.member_id, sa.sitting_id, sa.present
+           FROM sitting_attendance sa
+           JOIN sittings s ON s.id = sa.sitting_id
+           WHERE s.parliament = ?''',
+        (parliament,)
+    )
+    for row in rows:
+        bits = bitmaps.setdefault(row['member_id'], [0, 0])
+        bits[0 if row['present'] else 1] |= 1 << position[row['sitting_id']]
+
+    conn.execute('DELETE FROM member_attendance WHERE parliament = ?', (parliament,))
+    _write_rows(parliament, len(sittings), bitmaps)
+    conn.commit()
+
+
+def update_sitting_bitmaps(sitting_id: str):
+    """Fold one sitting's attendance into its parliament's bitmaps."""
+    conn = db.get_connection()
+    sitting = conn.execute('SELECT parliament FROM sittings WHERE id = ?', (sitting_id,)).fetchone()
+    if not sitting or sitting['parliament'] is None:
+        return
+    parliament = sitting['parliament']
+
+    sittings = get_parliament_sittings(parliament)
+    n, idx = len(sittings), sittings.index(sitting_id)
+
+    rows = conn.execute(
+        'SELECT member_id, sitting_count, present_bits, absent_bits FROM member_attendance WHERE parliament = ?',
+        (parliament,)
+    ).fetchall()
+    counts = {row['sitting_count'] for row in rows}
+
+    # Existing bits stay valid only if this sitting was already counted or is appended at the end.
+    # No rows for a parliament with earlier sittings means its bitmaps were never built (e.g. the
+    # table was just created on an existing database), so they are built from scratch
+    if (not rows and n > 1) or not counts <= {n, n - 1} or (n - 1 in counts and idx != n - 1):
+        rebuild_parliament(parliament)
+        return
+
+    bitmaps = {row['member_id']: [unpack(row['present_bits']), unpack(row['absent_bits'])] for row in rows}
+    mask = ~(1 << idx)
+    for bits in bitmaps.values():
+        bits[0] &= mask
+        bits[1] &= mask
+
+    attendance = conn.execute(
+        'SELECT member_id, present FROM sitting_attendance WHERE sitting_id = ?', (sitting_id,)
+    )
+    for row in attendance:
+        bits = bitmaps.setdefault(row['member_id'], [0, 0])
+        bits[0 if row['present'] else 1] |= 1 << idx
+
+    _write_rows(parliament, n, bitmaps)
+    conn.commit()
+
+
+def rebuild_all():
+    """Rebuild bitmaps for every parliament."""
+    conn = db.get_connection()
+    parliaments = [
+        row['parliament'] for row in conn.execute(
+            'SELECT DISTINCT parliament FROM sittings WHERE parliament IS NOT NULL ORDER BY parliament'
+        )
+    ]
+    for parliament in parliaments:
+        rebuild_parliament(parliament)
+        print(f"Rebuilt attendance bitmaps for parliament {parliament}")
+
+
+if __name__ == "__main__":
+    db.init_db()
+    rebuild_all()
+    db.close_connection()
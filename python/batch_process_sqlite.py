@@ -22,9 +22,18 @@ from db_sqlite import (
     get_section_count,
     get_sitting_count,
     init_db,
+    replace_section_utterances,
+    transaction,
 )
+import memory_profile
+import metrics
+import run_ledger
+from attendance_bitmaps import update_sitting_bitmaps
 from hansard_api import HansardAPI
+from pagination import refresh_for_sittings as refresh_list_keys
 from parliament_sitting import BILL_TYPES
+from rollups import refresh_for_sittings
+from sitting_documents import refresh_sitting_documents
 
 logging.basicConfig(
     level=logging.INFO,
@@ -161,64 +170,84 @@ def process_speaker(section_id, speaker):
     )
 
 
-def process_section(sitting_id, idx, section, date_str):
-    """Process a single section and its speakers."""
+def detect_section_ministry(section):
+    """Ministry acronym for a section, by its category."""
     # Adjournment motions are raised by individual MPs on any topic;
     # the answering minister is incidental, so skip ministry tagging.
     if section.get("category") == "adjournment_motion":
-        ministry_id = None
-        ministry_acronym = None
-    elif section.get("category") == "motion":
+        return None
+    if section.get("category") == "motion":
         ministry_acronym = detect_ministry_from_title(section.get("title", ""))
         if not ministry_acronym:
             ministry_acronym = detect_ministry_from_content(section.get("content_plain", ""))
-        ministry_id = (
-            find_ministry_by_acronym(ministry_acronym) if ministry_acronym else None
-        )
-    else:
-        ministry_acronym = detect_ministry(section)
-        ministry_id = (
-            find_ministry_by_acronym(ministry_acronym) if ministry_acronym else None
-        )
+        return ministry_acronym
+    return detect_ministry(section)
+
+
+def process_section(sitting_id, idx, section, date_str):
+    """Process a single section and its speakers."""
+    with metrics.span('ministry_detection'):
+        ministry_acronym = detect_section_ministry(section)
+    ministry_id = (
+        find_ministry_by_acronym(ministry_acronym) if ministry_acronym else None
+    )
 
     bill_id = None
     section_type = section["section_type"]
 
-    # Handle bill sections
-    if section_type == "BI":
-        bill_id = create_bill(
-            title=section["title"],
+    # Handle bill sections and create the section
+    with metrics.span('db_write', table='sections'):
+        if section_type == "BI":
+            bill_id = create_bill(
+                title=section["title"],
+                ministry_id=ministry_id,
+                first_reading_date=date_str,
+                first_reading_sitting_id=sitting_id,
+            )
+        elif section_type == "BP":
+            bill_id = find_bill_for_second_reading(
+                title=section["title"],
+                ministry_id=ministry_id,
+            )
+
+        section_id = create_section(
+            sitting_id=sitting_id,
             ministry_id=ministry_id,
-            first_reading_date=date_str,
-            first_reading_sitting_id=sitting_id,
-        )
-    elif section_type == "BP":
-        bill_id = find_bill_for_second_reading(
+            bill_id=bill_id,
+            category=section.get("category", "other"),
+            section_type=section_type,
             title=section["title"],
-            ministry_id=ministry_id,
+            content_html=section["content_html"],
+            content_plain=section["content_plain"],
+            section_order=section["order"],
+            source_url=section.get("source_url"),
         )
-
-    # Create section
-    section_id = create_section(
-        sitting_id=sitting_id,
-        ministry_id=ministry_id,
-        bill_id=bill_id,
-        category=section.get("category", "other"),
-        section_type=section_type,
-        title=section["title"],
-        content_html=section["content_html"],
-        content_plain=section["content_plain"],
-        section_order=section["order"],
-        source_url=section.get("source_url"),
-    )
+    metrics.inc("rows_written_total", table="sections")
 
     # Process speakers
-    for speaker in section["speakers"]:
-        process_speaker(section_id, speaker)
+    with metrics.span('db_write', table='section_speakers'):
+        for speaker in section["speakers"]:
+            process_speaker(section_id, speaker)
+    metrics.inc("rows_written_total", len(section["speakers"]), table="section_speakers")
+
+    with metrics.span('db_write', table='section_utterances'):
+        process_utterances(section_id, section.get("turns", []))
+    metrics.inc("rows_written_total", len(section.get("turns", [])), table="section_utterances")
 
     return section_id
 
 
+def process_utterances(section_id, turns):
+    """Store a section's speaker turns, resolving matched MPs to member IDs."""
+    member_ids = {}
+    for turn in turns:
+        mp = turn.get("mp")
+        if mp and mp.name not in member_ids:
+            member_ids[mp.name] = find_or_create_member(mp.name)
+        turn["member_id"] = member_ids[mp.name] if mp else None
+    replace_section_utterances(section_id, turns)
+
+
 def process_attendance(sitting_id, mp, present):
     """Process attendance for a single MP."""
     member_id = find_or_create_member(mp.name)
@@ -231,28 +260,58 @@ def process_attendance(sitting_id, mp, present):
     )
 
 
-def ingest_sitting(date_str: str) -> str:
+def ingest_sitting(date_str: str, api: HansardAPI = None) -> str:
     """
     Fetch and ingest a single sitting into SQLite.
+    Pass a shared api to reuse its HTTP session across sittings.
     Returns sitting ID if successful, None otherwise.
     """
     logger.info(f"Processing sitting for {date_str}...")
 
     # Fetch from Hansard API
-    api = HansardAPI()
+    api = api or HansardAPI()
     parliament_sitting = api.fetch_by_date(date_str)
 
     if not parliament_sitting:
         logger.info(f"No data found for {date_str}")
         return None
 
-    sections = parliament_sitting.get_sections()
     metadata = parliament_sitting.get_metadata()
 
-    if not sections:
+    # Sections are written as they are parsed, each once its merge group is
+    # complete, so only the groups still open are held in memory. BI (first
+    # readings) arrive before BP (second readings) of the same bill, so the
+    # bill exists before the second reading section looks it up. The sitting
+    # is written in one transaction, so a failure leaves none of it behind
+    # and each changed entity is logged once rather than once per row.
+    sitting_id = None
+    section_count = 0
+    with transaction():
+        for section in parliament_sitting.stream_sections():
+            if sitting_id is None:
+                sitting_id = save_sitting(parliament_sitting, date_str)
+
+            # Split transcripts into speaker turns once, at ingest, instead of on every page render
+            section["turns"] = parliament_sitting.get_section_turns(section)
+            process_section(sitting_id, section["order"], section, metadata.get("date"))
+            section_count += 1
+
+            # Log progress every 10 sections
+            if section_count % 10 == 0:
+                logger.info(f"     Processed {section_count} sections")
+
+    if sitting_id is None:
         logger.info(f"No sections found for {date_str}")
         return None
 
+    logger.info(f"   Processed {section_count} sections for {date_str}")
+    return sitting_id
+
+
+def save_sitting(parliament_sitting, date_str: str) -> str:
+    """Create or update a sitting and its attendance. Returns the sitting ID."""
+    metadata = parliament_sitting.get_metadata()
+
     # Create sitting URL
     sitting_url = f"https://sprs.parl.gov.sg/search/#/fullreport?sittingdate={date_str}"
 
@@ -270,51 +329,26 @@ def ingest_sitting(date_str: str) -> str:
 
     # Process attendance
     attendance_count = 0
-    for mp in parliament_sitting.present_members:
-        process_attendance(sitting_id, mp, True)
-        attendance_count += 1
+    with metrics.span('db_write', table='sitting_attendance'):
+        for mp in parliament_sitting.present_members:
+            process_attendance(sitting_id, mp, True)
+            attendance_count += 1
 
-    for mp in parliament_sitting.absent_members:
-        process_attendance(sitting_id, mp, False)
-        attendance_count += 1
+        for mp in parliament_sitting.absent_members:
+            process_attendance(sitting_id, mp, False)
+            attendance_count += 1
+    metrics.inc("rows_written_total", attendance_count, table="sitting_attendance")
 
     logger.info(f"   Saved attendance for {attendance_count} members")
-
-    # Process sections — ensure BI (first readings) are processed before BP (second readings)
-    # so that bills exist before second reading sections try to find them (same-day case)
-    def section_sort_key(item):
-        idx, section = item
-        st = section.get("section_type", "")
-        if st == "BI":
-            return (0, idx)  # BI first
-        elif st == "BP":
-            return (2, idx)  # BP last
-        return (1, idx)      # everything else in between
-
-    sorted_sections = sorted(enumerate(sections), key=section_sort_key)
-
-    logger.info(f"   Processing {len(sections)} sections...")
-    section_ids = []
-
-    for idx, section in sorted_sections:
-        section_id = process_section(sitting_id, idx, section, metadata.get("date"))
-        section_ids.append(section_id)
-
-        # Log progress every 10 sections
-        if (idx + 1) % 10 == 0:
-            logger.info(f"     Processed {idx + 1}/{len(sections)} sections")
-
-    logger.info(f"   Processed {len(section_ids)} sections for {date_str}")
+    update_sitting_bitmaps(sitting_id)
     return sitting_id
 
 
-def batch_process(start_date_str: str, end_date_str: str):
+def ingest_range(start_date_str: str, end_date_str: str) -> list:
     """
-    Process all sittings in a date range.
+    Ingest every sitting in a date range and refresh the tables derived
+    from them. Returns the IDs of the sittings ingested.
     """
-    # Initialize database
-    init_db()
-
     start_date = datetime.strptime(start_date_str, "%d-%m-%Y")
     end_date = datetime.strptime(end_date_str, "%d-%m-%Y")
 
@@ -330,11 +364,42 @@ def batch_process(start_date_str: str, end_date_str: str):
     )
 
     ingested_sittings = []
+    api = HansardAPI()
 
     for date_str in dates:
-        sitting_id = ingest_sitting(date_str)
+        with metrics.span('ingest_sitting', attrs={'date': date_str}), \
+                memory_profile.sitting(date_str) as profiled:
+            sitting_id = ingest_sitting(date_str, api)
+            if not sitting_id:
+                profiled.skip()
         if sitting_id:
             ingested_sittings.append(sitting_id)
+            metrics.inc("sittings_ingested_total")
+
+    if ingested_sittings:
+        refresh_derived(ingested_sittings)
+
+    return ingested_sittings
+
+
+def refresh_derived(sitting_ids: list):
+    """Refresh rollups, sitting documents and list keys for newly ingested sittings."""
+    with metrics.span('refresh_derived'):
+        ministry_ids, bill_ids = refresh_for_sittings(sitting_ids)
+        logger.info(f"Refreshed rollups for {len(ministry_ids)} ministries and {len(bill_ids)} bills")
+        written = refresh_sitting_documents(sitting_ids)
+        logger.info(f"Rewrote {written} sitting document(s)")
+        refresh_list_keys(sitting_ids)
+
+
+def batch_process(start_date_str: str, end_date_str: str):
+    """
+    Process all sittings in a date range.
+    """
+    # Initialize database
+    init_db()
+
+    ingested_sittings = ingest_range(start_date_str, end_date_str)
 
     # Print summary
     logger.info("\n" + "=" * 50)
@@ -362,11 +427,12 @@ def show_stats():
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python batch_process_sqlite.py START_DATE [END_DATE]")
+        print("Usage: python batch_process_sqlite.py START_DATE [END_DATE] [--profile-memory]")
         print("       python batch_process_sqlite.py --stats")
         print("\nExamples:")
         print("  python batch_process_sqlite.py 01-10-2024")
         print("  python batch_process_sqlite.py 01-10-2024 31-10-2024")
+        print("  python batch_process_sqlite.py 01-01-2024 31-12-2024 --profile-memory")
         print("  python batch_process_sqlite.py --stats")
         sys.exit(1)
 
@@ -384,4 +450,8 @@ if __name__ == "__main__":
     start = dates[0]
     end = dates[1] if len(dates) > 1 else start
 
-    batch_process(start, end)
+    if "--profile-memory" in args:
+        memory_profile.enable()
+
+    with run_ledger.stage('ingest'):
+        batch_process(start, end)
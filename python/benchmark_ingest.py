@@ -0,0 +1,317 @@
+"""
+Micro-benchmarks for the parsing and ingest hot paths, on recorded sittings.
+
+Runs against the anonymised getHansardReport payloads in fixtures/hansard/:
+a short sitting, a typical one with question time and bill debates, and a
+Committee of Supply day whose Heads arrive as dozens of same-titled cuts
+(the worst case for section merging and speaker matching). Each benchmark
+is timed over several repeats per fixture and reported as the median and
+minimum in milliseconds. --output saves the results as JSON and --compare
+prints each median against a saved file, so a change can be measured
+across commits.
+
+--record fetches a live sitting and saves it as a fixture, with member
+names replaced by pseudonyms throughout.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import re
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import db_sqlite as db
+from batch_process_sqlite import (
+    detect_ministry_from_content,
+    detect_ministry_from_designation,
+    detect_ministry_from_speakers,
+    detect_ministry_from_title,
+    detect_section_ministry,
+    ingest_sitting,
+)
+from hansard_api import HansardAPI
+from parliament_sitting import ParliamentSitting
+from util import clean_html_for_display, parse_mp_name, split_transcript_turns, strip_all_html
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'hansard'
+
+# Only the fields ingest reads are kept when recording a fixture
+SECTION_FIELDS = ('sectionId', 'sectionType', 'title', 'content', 'reportType')
+METADATA_FIELDS = ('sittingDate', 'sittingNO', 'parlimentNO', 'sessionNO', 'volumeNO')
+
+
+class FixtureAPI(HansardAPI):
+    """Serves one recorded payload through the same streamed report parsing as a live fetch."""
+
+    def __init__(self, payload):
+        super().__init__()
+        self.report = json.dumps(payload).encode()
+
+    def fetch_by_date(self, date_str):
+        return self.parse_report_file(date_str, io.BytesIO(self.report))
+
+
+def load_fixtures(names=None) -> dict:
+    paths = sorted(FIXTURES_DIR.glob('*.json'))
+    fixtures = {path.stem: json.loads(path.read_text()) for path in paths if not names or path.stem in names}
+    missing = set(names or []) - set(fixtures)
+    if missing:
+        raise SystemExit(f"No fixture named: {', '.join(sorted(missing))}")
+    return fixtures
+
+
+def parsed_sitting(payload) -> ParliamentSitting:
+    return HansardAPI().parse_report(payload['metadata']['sittingDate'], payload)
+
+
+def speaker_texts(payload) -> list:
+    """Bold speaker labels of every section, as set_sections matches them."""
+    sitting = ParliamentSitting(payload['metadata']['sittingDate'])
+    texts = []
+    for section in payload['takesSectionVOList']:
+        texts.extend(sitting._extract_speakers_from_html(section.get('content', '')))
+    return texts
+
+
+# Each benchmark takes a payload and returns (setup, run): setup() is called
+# untimed before every repeat and its result passed to the timed run()
+
+def bench_set_attendance(payload):
+    date_str = payload['metadata']['sittingDate']
+    return None, lambda _: ParliamentSitting(date_str).set_attendance(payload['attendanceList'])
+
+
+def bench_set_sections(payload):
+    base = parsed_sitting(payload)
+
+    def setup():
+        sitting = ParliamentSitting(base.metadata['date'])
+        sitting.set_members(base.present_members, base.absent_members)
+        return sitting
+
+    return setup, lambda sitting: sitting.set_sections(payload['takesSectionVOList'])
+
+
+def bench_stream_sections(payload):
+    """Parse a report from its bytes, as fetch_by_date does, through to every merged section."""
+    date_str = payload['metadata']['sittingDate']
+    report = json.dumps(payload).encode()
+    return None, lambda _: list(HansardAPI().parse_report_file(date_str, io.BytesIO(report)).stream_sections())
+
+
+def bench_clean_html_for_display(payload):
+    contents = [section.get('content', '') for section in payload['takesSectionVOList']]
+    return None, lambda _: [clean_html_for_display(content) for content in contents]
+
+
+def bench_strip_all_html(payload):
+    contents = [section.get('content', '') for section in payload['takesSectionVOList']]
+    return None, lambda _: [strip_all_html(content) for content in contents]
+
+
+def bench_split_transcript_turns(payload):
+    sections = parsed_sitting(payload).get_sections()
+    return None, lambda _: [split_transcript_turns(section['content_html']) for section in sections]
+
+
+def bench_match_speaker(payload):
+    sitting = parsed_sitting(payload)
+    texts = speaker_texts(payload)
+    return None, lambda _: [sitting.match_speaker(text) for text in texts]
+
+
+def bench_detect_ministry_from_designation(payload):
+    sitting = parsed_sitting(payload)
+    designations = [mp.appointment for mp in sitting.present_members + sitting.absent_members]
+    return None, lambda _: [detect_ministry_from_designation(designation) for designation in designations]
+
+
+def bench_detect_ministry_from_content(payload):
+    contents = [section['content_plain'] for section in parsed_sitting(payload).get_sections()]
+    return None, lambda _: [detect_ministry_from_content(content) for content in contents]
+
+
+def bench_detect_ministry_from_speakers(payload):
+    speakers = [section['speakers'] for section in parsed_sitting(payload).get_sections()]
+    return None, lambda _: [detect_ministry_from_speakers(section_speakers) for section_speakers in speakers]
+
+
+def bench_detect_ministry_from_title(payload):
+    titles = [section['title'] for section in parsed_sitting(payload).get_sections()]
+    return None, lambda _: [detect_ministry_from_title(title) for title in titles]
+
+
+def bench_detect_section_ministry(payload):
+    sections = parsed_sitting(payload).get_sections()
+    return None, lambda _: [detect_section_ministry(section) for section in sections]
+
+
+def bench_ingest_sitting(payload):
+    """Fetch (from the fixture), parse, match and write a sitting into an empty database."""
+    date_str = payload['metadata']['sittingDate']
+
+    def setup():
+        db.close_connection()
+        for suffix in ('', '-wal', '-shm'):
+            Path(db.DB_PATH + suffix).unlink(missing_ok=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.init_db()
+        return FixtureAPI(payload)
+
+    return setup, lambda api: ingest_sitting(date_str, api=api)
+
+
+BENCHMARKS = {
+    name[len('bench_'):]: function for name, function in globals().items() if name.startswith('bench_')
+}
+
+
+def time_benchmark(setup, run, repeats: int) -> dict:
+    samples = []
+    for _ in range(repeats):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        run(arg)
+        samples.append(time.perf_counter() - start)
+    return {
+        'median_ms': round(statistics.median(samples) * 1000, 3),
+        'min_ms': round(min(samples) * 1000, 3),
+    }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).parent)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmarks(fixtures: dict, names, repeats: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # ingest_sitting writes to a scratch database, recreated before each repeat
+        db.close_connection()
+        db.DB_PATH = str(Path(tmp) / 'benchmark.db')
+        for fixture, payload in fixtures.items():
+            results[fixture] = {}
+            for name in names:
+                setup, run = BENCHMARKS[name](payload)
+                results[fixture][name] = time_benchmark(setup, run, repeats)
+        db.close_connection()
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'repeats': repeats,
+        'fixtures': {
+            fixture: {
+                'sections': len(payload['takesSectionVOList']),
+                'members': len(payload['attendanceList']),
+                'bytes': len(json.dumps(payload)),
+            }
+            for fixture, payload in fixtures.items()
+        },
+        'results': results,
+    }
+
+
+def format_report(report: dict, baseline: dict = None) -> str:
+    width = max(len(name) for name in BENCHMARKS)
+    lines = []
+    for fixture, benchmarks in report['results'].items():
+        info = report['fixtures'][fixture]
+        lines.append(f"{fixture} ({info['sections']} sections, {info['bytes'] / 1000:.0f} KB)")
+        previous = (baseline or {}).get('results', {}).get(fixture, {})
+        for name, timing in benchmarks.items():
+            line = f"  {name:<{width}}  {timing['median_ms']:10.3f}ms"
+            if name in previous and previous[name]['median_ms']:
+                ratio = timing['median_ms'] / previous[name]['median_ms']
+                line += f"  {previous[name]['median_ms']:10.3f}ms  {ratio:5.2f}x"
+            lines.append(line)
+    if baseline:
+        lines.insert(0, f"Compared with {baseline.get('commit') or 'baseline'} ({baseline.get('timestamp')})")
+    return "\n".join(lines)
+
+
+def anonymise(payload: dict) -> dict:
+    """
+    Keep only the fields ingest reads, and replace every attending member's
+    name, in the attendance list and in section text, with a pseudonym.
+    Salutations, constituencies and appointments are kept, since speaker
+    matching and ministry detection depend on them.
+    """
+    pseudonyms = {}
+    for entry in payload.get('attendanceList', []):
+        name, _, _ = parse_mp_name(entry['mpName'])
+        pseudonyms.setdefault(name, f"Member {len(pseudonyms) + 1:03d}")
+
+    # Longest first, so a name is replaced before any shorter name inside it
+    pattern = re.compile('|'.join(re.escape(name) for name in sorted(pseudonyms, key=len, reverse=True)))
+
+    def replace(text):
+        return pattern.sub(lambda match: pseudonyms[match.group(0)], text or '') if pseudonyms else text
+
+    return {
+        'metadata': {key: payload['metadata'].get(key) for key in METADATA_FIELDS},
+        'attendanceList': [
+            {'mpName': replace(entry['mpName']), 'attendance': entry['attendance']}
+            for entry in payload.get('attendanceList', [])
+        ],
+        'takesSectionVOList': [
+            {key: replace(section.get(key)) if key in ('title', 'content') else section.get(key)
+             for key in SECTION_FIELDS}
+            for section in payload.get('takesSectionVOList', [])
+        ],
+    }
+
+
+def record(date_str: str, name: str) -> Path:
+    response = HansardAPI().session.post(f"{HansardAPI.BASE_URL}?sittingDate={date_str}")
+    response.raise_for_status()
+    payload = response.json()
+    if not payload.get('takesSectionVOList'):
+        raise SystemExit(f"No sections for {date_str}")
+
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    path = FIXTURES_DIR / f'{name}.json'
+    with open(path, 'w') as f:
+        json.dump(anonymise(payload), f, indent=1, ensure_ascii=False)
+        f.write('\n')
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('fixtures', nargs='*', help='fixtures to run (default: all)')
+    parser.add_argument('--benchmark', action='append', choices=list(BENCHMARKS),
+                        help='run only this benchmark (repeatable)')
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--output', help='write results as JSON to this path')
+    parser.add_argument('--compare', help='results JSON from an earlier run to compare against')
+    parser.add_argument('--record', nargs=2, metavar=('DATE', 'NAME'),
+                        help='fetch the sitting on DATE (DD-MM-YYYY) and save it as fixture NAME')
+    args = parser.parse_args()
+
+    if args.record:
+        print(f"Recorded {record(*args.record)}")
+        raise SystemExit(0)
+
+    # Ingest logs every sitting and section; only the timings are wanted here
+    logging.getLogger('batch_process_sqlite').setLevel(logging.WARNING)
+
+    report = run_benchmarks(load_fixtures(args.fixtures), args.benchmark or list(BENCHMARKS), args.repeats)
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print(format_report(report, baseline))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,129 @@
+"""
+Per-page latency benchmark for list pagination.
+
+Seeds a temporary SQLite database with synthetic question sections, then
+walks the questions feed page by page twice: once with the LIMIT/OFFSET
+query db.ts has used, and once with pagination.py's keyset cursors.
+Reports the mean time per page at checkpoints from page 1 to the last
+page, and each approach's growth from the first pages to the last.
+"""
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import db_sqlite as db
+import pagination
+
+OFFSET_QUERY = '''
+    SELECT sec.id, sec.sitting_id, s.date AS sitting_date, sec.section_type, sec.section_title,
+           sec.category, sec.ministry_id, sec.section_order
+    FROM sections sec
+    JOIN sittings s ON sec.sitting_id = s.id
+    WHERE sec.section_type IN ('OA', 'WA', 'WANA')
+    ORDER BY s.date DESC, sec.section_order ASC
+    LIMIT ? OFFSET ?'''
+
+CHECKPOINTS = (1, 10, 50, 100, 200, 300, 400, 500)
+
+
+def seed_database(num_sittings: int, sections_per_sitting: int):
+    db.init_db()
+    conn = db.get_connection()
+    start = datetime(2000, 1, 3)
+    for i in range(num_sittings):
+        date_str = (start + timedelta(days=i)).strftime('%d-%m-%Y')
+        sitting_id = db.create_or_update_sitting(date_str, sitting_no=i + 1, parliament=15)
+        conn.executemany(
+            '''INSERT INTO sections
+               (id, sitting_id, category, section_type, section_title, content_plain, section_order)
+               VALUES (?, ?, 'question', ?, ?, ?, ?)''',
+            [
+                (db.generate_id(), sitting_id, ('OA', 'WA', 'WANA')[order % 3],
+                 f"Benchmark Question {i}-{order}", f"Question {i}-{order}. " * 20, order)
+                for order in range(sections_per_sitting)
+            ]
+        )
+    conn.commit()
+    pagination.rebuild_all()
+
+
+def time_pages(fetch, pages: int, repeats: int) -> list:
+    """Mean seconds per page for pages 1..pages, fetching each page `repeats` times."""
+    timings = []
+    for page in range(pages):
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            rows = fetch(page)
+            samples.append(time.perf_counter() - start)
+        if not rows:
+            break
+        timings.append(statistics.mean(samples))
+    return timings
+
+
+def run_benchmark(args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db.close_connection()
+        db.DB_PATH = str(Path(tmp) / 'benchmark.db')
+        seed_database(args.sittings, args.sections)
+        conn = db.get_connection()
+
+        offset_timings = time_pages(
+            lambda page: conn.execute(OFFSET_QUERY, (args.page_size, page * args.page_size)).fetchall(),
+            args.pages, args.repeats
+        )
+
+        # Cursors are recorded on the way through so each page can be re-fetched from its own start
+        cursors = [None]
+
+        def keyset_page(page):
+            rows, cursor = pagination.fetch_section_page('questions', args.page_size, cursors[page])
+            if len(cursors) == page + 1:
+                cursors.append(cursor)
+            return rows
+
+        keyset_timings = time_pages(keyset_page, args.pages, args.repeats)
+        db.close_connection()
+
+    def checkpoints(timings):
+        return {page: round(timings[page - 1] * 1000, 4) for page in CHECKPOINTS if page <= len(timings)}
+
+    def growth(timings):
+        # Last page relative to the first, averaged over 5 pages to smooth noise
+        head, tail = statistics.mean(timings[:5]), statistics.mean(timings[-5:])
+        return round(tail / head, 2) if head else None
+
+    return {
+        'sections': args.sittings * args.sections,
+        'page_size': args.page_size,
+        'pages': len(keyset_timings),
+        'offset_ms_per_page': checkpoints(offset_timings),
+        'keyset_ms_per_page': checkpoints(keyset_timings),
+        'offset_growth': growth(offset_timings),
+        'keyset_growth': growth(keyset_timings),
+        'offset_total_seconds': round(sum(offset_timings), 4),
+        'keyset_total_seconds': round(sum(keyset_timings), 4),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sittings', type=int, default=1000)
+    parser.add_argument('--sections', type=int, default=20, help='question sections per sitting')
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--repeats', type=int, default=3, help='times each page is fetched')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
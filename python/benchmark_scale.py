@@ -0,0 +1,399 @@
+"""
+Load test for ingest and the site's queries at multiples of production size.
+
+For each scale, builds a database from synthetic_hansard.py payloads
+covering BASE_YEARS (about what production holds) times the scale, going
+back from --end. Every sitting goes through ParliamentSitting and
+ingest_sitting() as in a real run, and the derived tables are refreshed
+once at the end. It then runs each query workload --samples times against
+randomly chosen sittings, sections, members, ministries and list pages,
+and reports latency percentiles:
+
+- ingest: one sitting's ingest_sitting() (parsing, speaker matching and
+  DB writes; payload generation is excluded);
+- the summary selection queries in generate_summaries_sqlite.py;
+- the page queries in astro/src/lib/db.ts, ported here with the branches
+  that apply once rollups, list keys and attendance bitmaps exist.
+
+Building takes a few tenths of a second per sitting, so the default 10x
+scale (about 7,000 sittings) takes around half an hour. Built databases
+are kept under --db-dir if given, and reused by later runs with the same
+seed, size and end date.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import db_sqlite as db
+import generate_summaries_sqlite as gs
+from batch_process_sqlite import ingest_sitting, refresh_derived
+from benchmark_ingest import FixtureAPI
+from synthetic_hansard import SyntheticHansard, sitting_dates
+
+# Years of sittings in the production database
+BASE_YEARS = 10
+PAGE_SIZE = 20
+
+SPEAKERS_QUERY = '''
+    SELECT ss.section_id as sectionId, ss.member_id as memberId, m.name, ss.constituency, ss.designation
+    FROM section_speakers ss
+    JOIN members m ON ss.member_id = m.id
+    WHERE ss.section_id IN ({placeholders})'''
+
+# Page queries from astro/src/lib/db.ts
+SITTINGS_PAGE = '''
+    SELECT s.id, s.date, s.sitting_no as sittingNo, s.parliament, s.session_no as sessionNo,
+           s.volume_no as volumeNo, s.format, s.url, COUNT(sec.id) as sectionCount
+    FROM sittings s
+    LEFT JOIN sections sec ON s.id = sec.sitting_id
+    GROUP BY s.id
+    ORDER BY s.date DESC
+    LIMIT ? OFFSET ?'''
+
+SITTING_DOCUMENT = 'SELECT document FROM sitting_documents WHERE sitting_id = ?'
+
+SITTING_SECTIONS = '''
+    SELECT sec.id, sec.sitting_id as sittingId, sec.section_type as sectionType,
+           sec.section_title as sectionTitle, sec.content_html as contentHtml,
+           sec.content_plain as contentPlain, sec.section_order as sectionOrder, sec.category,
+           sec.source_url as sourceUrl, sec.summary, m.name as ministry,
+           COALESCE(b.ministry_id, sec.ministry_id) as ministryId, sec.bill_id as billId
+    FROM sections sec
+    LEFT JOIN bills b ON sec.bill_id = b.id
+    LEFT JOIN ministries m ON COALESCE(b.ministry_id, sec.ministry_id) = m.id
+    WHERE sec.sitting_id = ?
+    ORDER BY sec.section_order ASC'''
+
+SECTION = '''
+    SELECT sec.id, sec.sitting_id as sittingId, s.date as sittingDate, s.sitting_no as sittingNo,
+           s.url as sittingUrl, sec.section_type as sectionType, sec.section_title as sectionTitle,
+           sec.content_html as contentHtml, sec.content_plain as contentPlain,
+           sec.section_order as sectionOrder, sec.category, sec.source_url as sourceUrl, sec.summary,
+           m.name as ministry, COALESCE(b.ministry_id, sec.ministry_id) as ministryId
+    FROM sections sec
+    JOIN sittings s ON sec.sitting_id = s.id
+    LEFT JOIN bills b ON sec.bill_id = b.id
+    LEFT JOIN ministries m ON COALESCE(b.ministry_id, sec.ministry_id) = m.id
+    WHERE sec.id = ?'''
+
+SECTION_TURNS = '''
+    SELECT section_id as sectionId, turn_index as turnIndex, kind, speaker_label as speakerLabel,
+           member_id as memberId, content_html as contentHtml, content_plain as contentPlain
+    FROM section_utterances
+    WHERE section_id IN (?)
+    ORDER BY section_id, turn_index'''
+
+MEMBER = '''
+    SELECT m.id, m.name, ms.summary, COUNT(DISTINCT ss.section_id) as sectionCount,
+      (SELECT sa.constituency FROM sitting_attendance sa JOIN sittings s ON sa.sitting_id = s.id
+       WHERE sa.member_id = m.id ORDER BY s.date DESC LIMIT 1) as constituency,
+      (SELECT sa.designation FROM sitting_attendance sa JOIN sittings s ON sa.sitting_id = s.id
+       WHERE sa.member_id = m.id ORDER BY s.date DESC LIMIT 1) as designation
+    FROM members m
+    LEFT JOIN member_summaries ms ON m.id = ms.member_id
+    LEFT JOIN section_speakers ss ON m.id = ss.member_id
+    WHERE m.id = ?
+    GROUP BY m.id'''
+
+MEMBER_ATTENDANCE_COUNTS = '''
+    SELECT COALESCE(SUM(present_count), 0) as attendancePresent,
+           COALESCE(SUM(present_count + absent_count), 0) as attendanceTotal
+    FROM member_attendance
+    WHERE member_id = ? AND (? IS NULL OR parliament = ?)'''
+
+MEMBER_SECTIONS = '''
+    SELECT sec.id, sec.sitting_id as sittingId, s.date as sittingDate, s.sitting_no as sittingNo,
+           sec.section_type as sectionType, sec.section_title as sectionTitle,
+           sec.content_plain as contentPlain, sec.section_order as sectionOrder, sec.category,
+           sec.source_url as sourceUrl, sec.summary, m.name as ministry,
+           COALESCE(b.ministry_id, sec.ministry_id) as ministryId, sec.bill_id as billId, b.title as billTitle
+    FROM sections sec
+    JOIN sittings s ON sec.sitting_id = s.id
+    LEFT JOIN bills b ON sec.bill_id = b.id
+    LEFT JOIN ministries m ON COALESCE(b.ministry_id, sec.ministry_id) = m.id
+    JOIN section_speakers ss ON sec.id = ss.section_id
+    WHERE ss.member_id = ?
+    ORDER BY s.date DESC, sec.section_order ASC'''
+
+MINISTRY_SECTIONS = '''
+    SELECT sec.id, sec.sitting_id as sittingId, s.date as sittingDate, s.sitting_no as sittingNo,
+           sec.section_type as sectionType, sec.section_title as sectionTitle,
+           sec.content_plain as contentPlain, sec.section_order as sectionOrder, sec.category,
+           sec.source_url as sourceUrl, sec.summary, m.name as ministry,
+           COALESCE(b.ministry_id, sec.ministry_id) as ministryId, sec.bill_id as billId
+    FROM sections sec
+    JOIN sittings s ON sec.sitting_id = s.id
+    LEFT JOIN bills b ON sec.bill_id = b.id
+    LEFT JOIN ministries m ON COALESCE(b.ministry_id, sec.ministry_id) = m.id
+    WHERE COALESCE(b.ministry_id, sec.ministry_id) = ?
+    ORDER BY s.date DESC, sec.section_order ASC'''
+
+BILLS_PAGE = '''
+    SELECT b.id, b.title, b.ministry_id as ministryId, m.name as ministry,
+           b.first_reading_date as firstReadingDate, b.first_reading_sitting_id as firstReadingSittingId,
+           b.summary,
+           COALESCE((SELECT bs.has_second_reading FROM bill_status bs WHERE bs.bill_id = b.id), 0) as hasSecondReading
+    FROM bills b
+    LEFT JOIN ministries m ON b.ministry_id = m.id
+    ORDER BY b.first_reading_date DESC NULLS LAST
+    LIMIT ? OFFSET ?'''
+
+QUESTIONS_PAGE = '''
+    SELECT sec.id, sec.sitting_id as sittingId, s.date as sittingDate, s.sitting_no as sittingNo,
+           sec.section_type as sectionType, sec.section_title as sectionTitle,
+           sec.content_plain as contentPlain, sec.section_order as sectionOrder, sec.category,
+           sec.source_url as sourceUrl, sec.summary, m.name as ministry, sec.ministry_id as ministryId
+    FROM section_list_keys k
+    JOIN sections sec ON sec.id = k.section_id
+    JOIN sittings s ON sec.sitting_id = s.id
+    LEFT JOIN ministries m ON sec.ministry_id = m.id
+    WHERE k.feed = 'questions'
+    ORDER BY k.sitting_date DESC, k.section_order ASC, k.section_id ASC
+    LIMIT ? OFFSET ?'''
+
+STATS = [
+    'SELECT COUNT(*) as count FROM sittings WHERE parliament = ?',
+    '''SELECT COUNT(DISTINCT sa.member_id) as count FROM sitting_attendance sa
+       JOIN sittings s ON sa.sitting_id = s.id WHERE s.parliament = ?''',
+    '''SELECT COUNT(*) as count FROM bills b
+       JOIN sittings s ON b.first_reading_sitting_id = s.id WHERE s.parliament = ?''',
+    '''SELECT COUNT(*) as count FROM sections sec
+       JOIN sittings s ON sec.sitting_id = s.id WHERE s.parliament = ?''',
+    '''SELECT COUNT(*) as count FROM sections sec
+       JOIN sittings s ON sec.sitting_id = s.id
+       WHERE sec.section_type IN ('OA', 'WA', 'WANA') AND sec.section_type NOT IN ('BI', 'BP')
+         AND s.parliament = ?''',
+    '''SELECT COUNT(*) as count FROM sections sec
+       JOIN sittings s ON sec.sitting_id = s.id
+       WHERE sec.category IN ('motion', 'adjournment_motion') AND s.parliament = ?''',
+]
+
+
+def with_speakers(conn, sections):
+    """The speakers lookup db.ts runs after each section list."""
+    if sections:
+        placeholders = ','.join('?' * len(sections))
+        conn.execute(SPEAKERS_QUERY.format(placeholders=placeholders), [row[0] for row in sections]).fetchall()
+    return sections
+
+
+class Workload:
+    """IDs to sample from, and one function per query workload."""
+
+    def __init__(self, conn, rng):
+        self.conn = conn
+        self.rng = rng
+
+        def ids(query):
+            return [row[0] for row in conn.execute(query)]
+
+        self.sittings = ids('SELECT id FROM sittings')
+        self.sections = ids('SELECT id FROM sections')
+        self.members = ids('SELECT id FROM members')
+        self.ministries = ids('SELECT DISTINCT ministry_id FROM sections WHERE ministry_id IS NOT NULL')
+        self.latest_parliament = conn.execute('SELECT MAX(parliament) FROM sittings').fetchone()[0]
+        self.question_count = conn.execute("SELECT COUNT(*) FROM section_list_keys WHERE feed = 'questions'").fetchone()[0]
+        self.bill_count = conn.execute('SELECT COUNT(*) FROM bills').fetchone()[0]
+
+    def offset(self, count):
+        return self.rng.randrange(max(count // PAGE_SIZE, 1)) * PAGE_SIZE
+
+    # Summary selection
+
+    def select_sections_for_sitting(self):
+        gs.select_sections_for_sitting(self.rng.choice(self.sittings), only_blanks=True)
+
+    def select_bills_for_sitting(self):
+        gs.select_bills_for_sitting(self.rng.choice(self.sittings), only_blanks=True)
+
+    def select_members(self):
+        gs.select_members(only_blanks=False)
+
+    def member_activity(self):
+        for _ in gs.iter_member_activity(self.rng.sample(self.members, min(20, len(self.members)))):
+            pass
+
+    # Site pages
+
+    def sittings_page(self):
+        self.conn.execute(SITTINGS_PAGE, (PAGE_SIZE, self.offset(len(self.sittings)))).fetchall()
+
+    def sitting_document(self):
+        row = self.conn.execute(SITTING_DOCUMENT, (self.rng.choice(self.sittings),)).fetchone()
+        if row:
+            json.loads(row[0])
+
+    def sitting_sections(self):
+        with_speakers(self.conn, self.conn.execute(SITTING_SECTIONS, (self.rng.choice(self.sittings),)).fetchall())
+
+    def section_page(self):
+        section_id = self.rng.choice(self.sections)
+        with_speakers(self.conn, self.conn.execute(SECTION, (section_id,)).fetchall())
+        self.conn.execute(SECTION_TURNS, (section_id,)).fetchall()
+
+    def member_page(self):
+        member_id = self.rng.choice(self.members)
+        self.conn.execute(MEMBER, (member_id,)).fetchone()
+        self.conn.execute(MEMBER_ATTENDANCE_COUNTS, (member_id, None, None)).fetchone()
+        with_speakers(self.conn, self.conn.execute(MEMBER_SECTIONS, (member_id,)).fetchall())
+
+    def ministry_page(self):
+        with_speakers(self.conn, self.conn.execute(MINISTRY_SECTIONS, (self.rng.choice(self.ministries),)).fetchall())
+
+    def bills_page(self):
+        self.conn.execute(BILLS_PAGE, (PAGE_SIZE, self.offset(self.bill_count))).fetchall()
+
+    def questions_page(self):
+        with_speakers(self.conn, self.conn.execute(QUESTIONS_PAGE, (PAGE_SIZE, self.offset(self.question_count))).fetchall())
+
+    def home_stats(self):
+        for query in STATS:
+            self.conn.execute(query, (self.latest_parliament,)).fetchone()
+
+
+WORKLOADS = [
+    'select_sections_for_sitting', 'select_bills_for_sitting', 'select_members', 'member_activity',
+    'sittings_page', 'sitting_document', 'sitting_sections', 'section_page', 'member_page',
+    'ministry_page', 'bills_page', 'questions_page', 'home_stats',
+]
+
+
+def percentiles(samples) -> dict:
+    """p50, p95, p99 and max of a list of seconds, in milliseconds."""
+    if len(samples) < 2:
+        samples = samples * 2
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {
+        'p50_ms': round(cuts[49] * 1000, 3),
+        'p95_ms': round(cuts[94] * 1000, 3),
+        'p99_ms': round(cuts[98] * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3),
+    }
+
+
+def build_database(path: Path, years: float, seed: int, end: datetime) -> dict:
+    """Ingest `years` of synthetic sittings ending at `end` into a new database at path."""
+    db.close_connection()
+    db.DB_PATH = str(path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.init_db()
+
+    generator = SyntheticHansard(seed)
+    start = end - timedelta(days=round(years * 365.25))
+    timings = []
+    sitting_ids = []
+    build_start = time.perf_counter()
+    for date_str in sitting_dates(start.date(), end.date()):
+        api = FixtureAPI(generator.payload(datetime.strptime(date_str, '%d-%m-%Y').date()))
+        sitting_start = time.perf_counter()
+        sitting_ids.append(ingest_sitting(date_str, api))
+        timings.append(time.perf_counter() - sitting_start)
+
+    refresh_start = time.perf_counter()
+    refresh_derived(sitting_ids)
+    refresh_seconds = time.perf_counter() - refresh_start
+    db.close_connection()
+    return {
+        'ingest': percentiles(timings),
+        'ingest_seconds': round(sum(timings), 1),
+        'refresh_seconds': round(refresh_seconds, 1),
+        'build_seconds': round(time.perf_counter() - build_start, 1),
+    }
+
+
+def run_workloads(samples: int, seed: int) -> dict:
+    conn = db.get_connection()
+    workload = Workload(conn, random.Random(seed))
+    results = {}
+    for name in WORKLOADS:
+        run = getattr(workload, name)
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        results[name] = percentiles(timings)
+    return results
+
+
+def run_scale(scale: float, args, db_dir: Path) -> dict:
+    years = BASE_YEARS * scale
+    path = db_dir / f'synthetic-seed{args.seed}-{years:g}y-{args.end}.db'
+    end = datetime.strptime(args.end, '%d-%m-%Y')
+
+    build = None
+    if not path.exists():
+        logging.info(f"Building {years:g} years of sittings into {path}")
+        build = build_database(path, years, args.seed, end)
+
+    db.close_connection()
+    db.DB_PATH = str(path)
+    conn = db.get_connection()
+    size = {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in ('sittings', 'sections', 'members', 'bills', 'section_utterances')}
+    result = {
+        'scale': scale,
+        'years': years,
+        'rows': size,
+        'db_mb': round(path.stat().st_size / 1e6, 1),
+        'build': build,
+        'queries': run_workloads(args.samples, args.seed),
+    }
+    db.close_connection()
+    return result
+
+
+def format_report(results) -> str:
+    names = ['ingest'] + WORKLOADS
+    width = max(len(name) for name in names)
+    lines = []
+    for result in results:
+        lines.append(f"\nScale {result['scale']:g}x: {result['years']:g} years, {result['rows']['sittings']} sittings, "
+                     f"{result['rows']['sections']} sections, {result['db_mb']} MB")
+        if result['build']:
+            build = result['build']
+            lines.append(f"  built in {build['build_seconds']}s (ingest {build['ingest_seconds']}s, "
+                         f"derived tables {build['refresh_seconds']}s)")
+        lines.append(f"  {'':<{width}}  {'p50':>9}  {'p95':>9}  {'p99':>9}  {'max':>9}")
+        rows = dict(result['queries'])
+        if result['build']:
+            rows = {'ingest': result['build']['ingest'], **rows}
+        for name, stats in rows.items():
+            lines.append(f"  {name:<{width}}  " + "  ".join(
+                f"{stats[key]:7.2f}ms" for key in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms')
+            ))
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 5, 10],
+                        help=f'multiples of {BASE_YEARS} years of sittings')
+    parser.add_argument('--samples', type=int, default=200, help='runs of each query workload per scale')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--end', default=datetime.now().strftime('%d-%m-%Y'), help='last sitting date (DD-MM-YYYY)')
+    parser.add_argument('--db-dir', help='keep built databases here and reuse them on later runs')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args()
+
+    # Ingest logs every sitting and section; only the timings are wanted here
+    logging.getLogger('batch_process_sqlite').setLevel(logging.WARNING)
+    logging.getLogger('generate_summaries_sqlite').setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_dir = Path(args.db_dir or tmp)
+        db_dir.mkdir(parents=True, exist_ok=True)
+        results = [run_scale(scale, args, db_dir) for scale in args.scales]
+
+    print(format_report(results))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
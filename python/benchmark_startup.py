@@ -0,0 +1,118 @@
+"""
+Import-time budget check for the Python entry points.
+
+Imports each CLI module in a fresh interpreter with -X importtime, several
+times, and takes the median of the module's cumulative import time (its
+own imports and everything they pull in, excluding interpreter start-up).
+Each entry point has a budget in milliseconds; the run exits non-zero if
+any median is over budget. The slowest imports under each module are
+listed so a regression points at the dependency that caused it.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PYTHON_DIR = Path(__file__).parent
+
+# Milliseconds of import time allowed per entry point. Heavy dependencies
+# (bs4, requests, LLM SDKs) are imported on first use, so the CLIs that
+# only need SQLite stay in the tens of milliseconds. The analytics
+# scripts need numpy/scipy or pyarrow at module level.
+BUDGETS_MS = {
+    'db_sqlite': 20,
+    'change_log': 30,
+    'cleanup_duplicates_sqlite': 40,
+    'export_lists_sqlite': 50,
+    'segment_sections_sqlite': 50,
+    'batch_process_sqlite': 60,
+    'generate_summaries_sqlite': 120,
+    'reprocess_sqlite': 120,
+    'pipeline_sqlite': 150,
+    'export_parquet_sqlite': 300,
+    'member_graph_sqlite': 600,
+    'related_sections_sqlite': 600,
+}
+
+TOP_IMPORTS = 5
+
+
+def parse_importtime(stderr: str):
+    """(name, cumulative microseconds) for each line of -X importtime output."""
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        yield name.strip(), int(cumulative)
+
+
+def measure(module: str):
+    """Cumulative import time of module in microseconds, and the slowest imports beneath it."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PYTHON_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    # Imports are reported children first, so everything listed before the
+    # module's own line (and after interpreter start-up) was imported by it
+    timings = list(parse_importtime(result.stderr))
+    end = next(i for i, (name, _) in enumerate(timings) if name == module)
+    start = next((i + 1 for i, (name, _) in enumerate(timings) if name == 'site'), 0)
+    children = sorted(timings[start:end], key=lambda item: item[1], reverse=True)
+    return timings[end][1], children[:TOP_IMPORTS]
+
+
+def run_benchmark(modules, repeats: int) -> dict:
+    results = {}
+    for module in modules:
+        samples, slowest = [], None
+        for _ in range(repeats):
+            micros, top = measure(module)
+            samples.append(micros)
+            slowest = slowest or top
+        median_ms = statistics.median(samples) / 1000
+        results[module] = {
+            'median_ms': round(median_ms, 1),
+            'min_ms': round(min(samples) / 1000, 1),
+            'budget_ms': BUDGETS_MS[module],
+            'within_budget': median_ms <= BUDGETS_MS[module],
+            'slowest_imports': {name: round(micros / 1000, 1) for name, micros in slowest},
+        }
+    return results
+
+
+def format_report(results: dict) -> str:
+    width = max(len(module) for module in results)
+    lines = [f"{'module':<{width}}  {'median':>8}  {'budget':>8}"]
+    for module, result in results.items():
+        flag = '' if result['within_budget'] else '  OVER BUDGET'
+        lines.append(f"{module:<{width}}  {result['median_ms']:>6.1f}ms  {result['budget_ms']:>6}ms{flag}")
+        if not result['within_budget']:
+            for name, ms in result['slowest_imports'].items():
+                lines.append(f"{'':<{width}}    {name} {ms}ms")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('modules', nargs='*', help='entry points to check (default: all)')
+    parser.add_argument('--repeats', type=int, default=5, help='fresh interpreters per module')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args()
+
+    unknown = set(args.modules) - set(BUDGETS_MS)
+    if unknown:
+        parser.error(f"no budget for: {', '.join(sorted(unknown))}")
+
+    results = run_benchmark(args.modules or list(BUDGETS_MS), args.repeats)
+    print(format_report(results))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    sys.exit(0 if all(result['within_budget'] for result in results.values()) else 1)
@@ -0,0 +1,165 @@
+"""
+Throughput benchmark for summary generation.
+
+Seeds a temporary SQLite database with synthetic sittings, then runs the
+real sitting summary pipeline against the mock LLM provider. Reports
+end-to-end summaries/second and the time spent writing summaries back to
+the database, so scheduler changes can be compared without API keys or
+network access.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import db_sqlite as db
+import generate_summaries_sqlite as gs
+from llm_providers import MockProvider, set_provider
+
+WRITE_PREFIXES = ('UPDATE', 'INSERT')
+
+
+class TimedCursor:
+    """Cursor proxy that accumulates time spent in write statements."""
+
+    def __init__(self, cursor, stats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def execute(self, sql, params=()):
+        if not sql.lstrip().upper().startswith(WRITE_PREFIXES):
+            return self._cursor.execute(sql, params)
+        start = time.perf_counter()
+        result = self._cursor.execute(sql, params)
+        self._stats['write_seconds'] += time.perf_counter() - start
+        self._stats['writes'] += 1
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class TimedConnection:
+    """Connection proxy that times writes and commits."""
+
+    def __init__(self, conn, stats):
+        self._conn = conn
+        self._stats = stats
+
+    def cursor(self):
+        return TimedCursor(self._conn.cursor(), self._stats)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        start = time.perf_counter()
+        result = self._conn.executemany(sql, seq_of_params)
+        self._stats['write_seconds'] += time.perf_counter() - start
+        self._stats['writes'] += 1
+        return result
+
+    def commit(self):
+        start = time.perf_counter()
+        self._conn.commit()
+        self._stats['write_seconds'] += time.perf_counter() - start
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def seed_database(num_sittings: int, sections_per_sitting: int, section_chars: int) -> tuple:
+    """Create sittings with summarisable sections. Returns (start, end) as DD-MM-YYYY."""
+    db.init_db()
+    start = datetime(2025, 1, 6)
+    paragraph = "The Minister replied that the Government will continue to review the policy. "
+    body = (paragraph * (section_chars // len(paragraph) + 1))[:section_chars]
+
+    for i in range(num_sittings):
+        date_str = (start + timedelta(days=i)).strftime('%d-%m-%Y')
+        sitting_id = db.create_or_update_sitting(date_str, sitting_no=i + 1, parliament=15)
+        for order in range(sections_per_sitting):
+            db.create_section(
+                sitting_id=sitting_id,
+                category='question',
+                section_type='OA',
+                title=f"Benchmark Question {i}-{order}",
+                content_html=f"<p>{body}</p>",
+                content_plain=f"Question {i}-{order}. {body}",
+                section_order=order,
+            )
+    end = start + timedelta(days=num_sittings - 1)
+    return start.strftime('%d-%m-%Y'), end.strftime('%d-%m-%Y')
+
+
+def run_benchmark(args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db.close_connection()
+        db.DB_PATH = str(Path(tmp) / 'benchmark.db')
+        start, end = seed_database(args.sittings, args.sections, args.section_chars)
+
+        provider = MockProvider(latency=args.latency, jitter=args.jitter,
+                                error_rate=args.error_rate, seed=args.seed)
+        set_provider(provider)
+        gs.AI_COOLDOWN = args.cooldown
+        gs.AI_SEMAPHORE = asyncio.Semaphore(args.concurrency)
+
+        stats = {'write_seconds': 0.0, 'writes': 0}
+        db._conn = TimedConnection(db.get_connection(), stats)
+
+        wall_start = time.perf_counter()
+        asyncio.run(gs.generate_sitting_summaries(start, end))
+        wall = time.perf_counter() - wall_start
+
+        conn = sqlite3.connect(db.DB_PATH)
+        written = conn.execute('SELECT COUNT(*) FROM sections WHERE summary IS NOT NULL').fetchone()[0]
+        conn.close()
+
+    jobs = args.sittings * args.sections
+    return {
+        'jobs': jobs,
+        'summaries_written': written,
+        'llm_calls': provider.calls,
+        'llm_errors': provider.errors,
+        'wall_seconds': round(wall, 3),
+        'summaries_per_second': round(written / wall, 2) if wall else None,
+        'db_write_seconds': round(stats['write_seconds'], 4),
+        'db_writes': stats['writes'],
+        'db_write_share': round(stats['write_seconds'] / wall, 4) if wall else None,
+        'config': {
+            'latency': args.latency,
+            'jitter': args.jitter,
+            'error_rate': args.error_rate,
+            'cooldown': args.cooldown,
+            'concurrency': args.concurrency,
+            'seed': args.seed,
+        },
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sittings', type=int, default=5)
+    parser.add_argument('--sections', type=int, default=40, help='summarisable sections per sitting')
+    parser.add_argument('--section-chars', type=int, default=4000)
+    parser.add_argument('--latency', type=float, default=0.2, help='mock base latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.1, help='mock latency jitter in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--cooldown', type=float, default=gs.AI_COOLDOWN, help='per-call cooldown in seconds')
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results = run_benchmark(args)
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
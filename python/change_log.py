@@ -0,0 +1,182 @@
+"""
+Row-level change log for incremental site rebuilds.
+
+Every write through db_sqlite (and the summary, cleanup, reprocess,
+related sections and member graph scripts) appends the IDs of the
+sittings, sections, bills, members and ministries it changed to
+change_log in the same transaction, once per entity per transaction. Entries carry
+a monotonically increasing seq, so a run records head() before it starts
+and afterwards asks for changes_since() that seq: a range scan over only
+the new entries. affected_pages() expands those entities into the site
+paths that render them, e.g. a changed section also touches its sitting,
+bill, ministry and speakers' pages.
+
+Usage:
+  uv run change_log.py head                 # print the latest seq
+  uv run change_log.py since SEQ [--output FILE]
+  uv run change_log.py prune SEQ            # drop entries up to and including SEQ
+"""
+import json
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import db_sqlite as db
+from pagination import SECTION_FEEDS
+
+ENTITY_TYPES = ('sitting', 'section', 'bill', 'member', 'ministry')
+
+
+def slugify(text: str, entity_id: str) -> str:
+    """Page slug for an entity, matching astro/src/lib/slugify.ts."""
+    slug = re.sub(r'[^a-z0-9]+', '-', (text or '').lower().replace("'", '')).strip('-')
+    slug = slug[:80]
+    if slug.endswith('-'):
+        slug = slug[:-1]
+    short_id = entity_id[:8]
+    return f"{slug}-{short_id}" if slug else short_id
+
+
+def _has_log(conn) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'change_log'"
+    ).fetchone() is not None
+
+
+def head() -> int:
+    """The latest seq in the log, 0 if nothing has been logged."""
+    if not Path(db.DB_PATH).exists():
+        return 0
+    conn = db.get_connection()
+    if not _has_log(conn):
+        return 0
+    return conn.execute('SELECT COALESCE(MAX(seq), 0) FROM change_log').fetchone()[0]
+
+
+def changes_since(seq: int):
+    """
+    Entities changed after seq, as {entity_type: {entity_id: op}} with each
+    entity's latest op, and the seq they run through.
+    """
+    conn = db.get_connection()
+    changes = defaultdict(dict)
+    through = seq
+    if not _has_log(conn):
+        return changes, through
+    for row in conn.execute(
+        'SELECT seq, entity_type, entity_id, op FROM change_log WHERE seq > ? ORDER BY seq', (seq,)
+    ):
+        changes[row['entity_type']][row['entity_id']] = row['op']
+        through = row['seq']
+    return changes, through
+
+
+def _upserted(changes, entity_type):
+    return {entity_id for entity_id, op in changes.get(entity_type, {}).items() if op == 'upsert'}
+
+
+def _select(query, ids):
+    if not ids:
+        return []
+    return db.get_connection().execute(query, (json.dumps(sorted(ids)),)).fetchall()
+
+
+def affected_pages(changes) -> list:
+    """Sorted site paths whose content depends on the changed entities."""
+    pages = set()
+    sittings = _upserted(changes, 'sitting')
+    bills = _upserted(changes, 'bill')
+    members = _upserted(changes, 'member')
+    ministries = _upserted(changes, 'ministry')
+    sections = _upserted(changes, 'section')
+
+    for feed, condition in SECTION_FEEDS.items():
+        for row in _select(
+            f'''SELECT sec.id, sec.section_title FROM sections sec
+                WHERE sec.id IN (SELECT value FROM json_each(?)) AND {condition}''',
+            sections
+        ):
+            pages.update({f"/{feed}", f"/{feed}/{slugify(row['section_title'], row['id'])}"})
+
+    for row in _select(
+        '''SELECT sec.sitting_id, sec.ministry_id, sec.bill_id FROM sections sec
+           WHERE sec.id IN (SELECT value FROM json_each(?))''',
+        sections
+    ):
+        sittings.add(row['sitting_id'])
+        ministries.update(filter(None, [row['ministry_id']]))
+        bills.update(filter(None, [row['bill_id']]))
+    members.update(
+        row['member_id'] for row in _select(
+            'SELECT DISTINCT member_id FROM section_speakers WHERE section_id IN (SELECT value FROM json_each(?))',
+            sections
+        )
+    )
+
+    for row in _select('SELECT id, title, ministry_id FROM bills WHERE id IN (SELECT value FROM json_each(?))', bills):
+        pages.add(f"/bills/{slugify(row['title'], row['id'])}")
+        ministries.update(filter(None, [row['ministry_id']]))
+
+    for row in _select('SELECT id, date FROM sittings WHERE id IN (SELECT value FROM json_each(?))', sittings):
+        pages.add(f"/sittings/{slugify(row['date'], row['id'])}")
+    for row in _select('SELECT id, name FROM members WHERE id IN (SELECT value FROM json_each(?))', members):
+        pages.add(f"/members/{slugify(row['name'], row['id'])}")
+    for row in _select('SELECT id, name FROM ministries WHERE id IN (SELECT value FROM json_each(?))', ministries):
+        pages.add(f"/ministries/{slugify(row['name'], row['id'])}")
+
+    # Index pages list their entities, and the home page shows the latest of everything.
+    # A deleted section's feed is no longer known, so every feed index is rebuilt
+    if 'delete' in changes.get('section', {}).values():
+        pages.update(f"/{feed}" for feed in SECTION_FEEDS)
+    for index, entity_ids in (('sittings', sittings), ('bills', bills), ('members', members),
+                              ('ministries', ministries)):
+        if entity_ids:
+            pages.add(f"/{index}")
+    if pages:
+        pages.add('/')
+    return sorted(pages)
+
+
+def summarize_since(seq: int) -> dict:
+    """What changed after seq: counts per entity type and op, and the pages to rebuild."""
+    changes, through = changes_since(seq)
+    counts = {}
+    for entity_type in ENTITY_TYPES:
+        ops = list(changes.get(entity_type, {}).values())
+        if ops:
+            counts[entity_type] = {'upsert': ops.count('upsert'), 'delete': ops.count('delete')}
+    return {'from': seq, 'through': through, 'changes': counts, 'pages': affected_pages(changes)}
+
+
+def prune(through_seq: int) -> int:
+    """Delete entries up to and including through_seq. Returns the number removed."""
+    conn = db.get_connection()
+    cursor = conn.execute('DELETE FROM change_log WHERE seq <= ?', (through_seq,))
+    conn.commit()
+    return cursor.rowcount
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args or args[0] not in ('head', 'since', 'prune') or (args[0] != 'head' and len(args) < 2):
+        print(__doc__.split('Usage:')[1].rstrip())
+        sys.exit(1)
+
+    command = args[0]
+    if command == 'head':
+        print(head())
+    elif command == 'since':
+        summary = summarize_since(int(args[1]))
+        output = json.dumps(summary, indent=2)
+        if "--output" in args:
+            with open(args[args.index("--output") + 1], 'w') as f:
+                f.write(output)
+            changed = sum(sum(ops.values()) for ops in summary['changes'].values())
+            print(f"{changed} changed entities, {len(summary['pages'])} page(s) to rebuild")
+        else:
+            print(output)
+    else:
+        db.init_db()
+        print(f"Pruned {prune(int(args[1]))} change log entries")
+    db.close_connection()
@@ -3,10 +3,15 @@ Cleanup duplicate sections in the SQLite database.
 Duplicates are identified by (sitting_id, section_title, section_type).
 """
 
+import json
 import sys
 from datetime import datetime
 
-from db_sqlite import get_connection, close_connection, init_db
+import metrics
+import run_ledger
+from db_sqlite import get_connection, close_connection, init_db, record_changes
+from rollups import refresh_bill_status, refresh_ministry_activity, touched_by_sittings
+from sitting_documents import refresh_sitting_documents
 
 
 def cleanup(start_date_str, end_date_str, keep_newest=False):
@@ -26,8 +31,14 @@ def cleanup(start_date_str, end_date_str, keep_newest=False):
         print(f"No sittings found in range {start_date_str} to {end_date_str}.")
         return
 
-    sitting_ids = [row[0] for row in sittings]
-    print(f"Cleaning duplicates in {len(sittings)} sitting(s)...")
+    cleanup_sittings([row[0] for row in sittings], keep_newest)
+    close_connection()
+
+
+def cleanup_sittings(sitting_ids, keep_newest=False):
+    """Delete duplicate sections within the given sittings. Returns the number deleted."""
+    conn = get_connection()
+    print(f"Cleaning duplicates in {len(sitting_ids)} sitting(s)...")
 
     # 2. Count duplicates before deletion
     placeholders = ','.join('?' * len(sitting_ids))
@@ -49,34 +60,55 @@ def cleanup(start_date_str, end_date_str, keep_newest=False):
 
     if dup_count == 0:
         print("Nothing to clean up.")
-        close_connection()
-        return
+        return 0
 
     # 3. Delete duplicates (keep first by created_at, or newest if --keep-newest)
-    delete_query = f"""
-    DELETE FROM sections
-    WHERE id IN (
-        SELECT id FROM (
-            SELECT id,
-                   ROW_NUMBER() OVER (
-                       PARTITION BY sitting_id, section_title, section_type
-                       ORDER BY created_at {order}, id ASC
-                   ) as rnum
-            FROM sections
-            WHERE sitting_id IN ({placeholders})
-        ) WHERE rnum > 1
-    )
+    duplicates_query = f"""
+    SELECT id FROM (
+        SELECT id,
+               ROW_NUMBER() OVER (
+                   PARTITION BY sitting_id, section_title, section_type
+                   ORDER BY created_at {order}, id ASC
+               ) as rnum
+        FROM sections
+        WHERE sitting_id IN ({placeholders})
+    ) WHERE rnum > 1
     """
-    conn.execute(delete_query, sitting_ids)
+    deleted_ids = [row[0] for row in conn.execute(duplicates_query, sitting_ids)]
+
+    # Rollups of every ministry and bill these sittings touched, including the deleted rows
+    ministry_ids, bill_ids = touched_by_sittings(sitting_ids)
+
+    # Pages that listed the deleted sections, looked up before the rows go
+    pages = conn.execute(
+        """SELECT
+               json_group_array(DISTINCT sec.sitting_id),
+               json_group_array(DISTINCT sec.ministry_id) FILTER (WHERE sec.ministry_id IS NOT NULL),
+               json_group_array(DISTINCT sec.bill_id) FILTER (WHERE sec.bill_id IS NOT NULL),
+               (SELECT json_group_array(DISTINCT member_id) FROM section_speakers
+                WHERE section_id IN (SELECT value FROM json_each(:ids)))
+           FROM sections sec
+           WHERE sec.id IN (SELECT value FROM json_each(:ids))""",
+        {'ids': json.dumps(deleted_ids)}
+    ).fetchone()
+
+    conn.execute('DELETE FROM sections WHERE id IN (SELECT value FROM json_each(?))', (json.dumps(deleted_ids),))
+    record_changes('section', deleted_ids, op='delete')
+    for entity_type, ids in zip(('sitting', 'ministry', 'bill', 'member'), pages):
+        record_changes(entity_type, json.loads(ids))
     conn.commit()
 
     print(f"Deleted {dup_count} duplicate section(s).")
+    metrics.inc('rows_written_total', dup_count, table='sections', op='delete')
+
+    refresh_ministry_activity(ministry_ids)
+    refresh_bill_status(bill_ids)
+    refresh_sitting_documents(sitting_ids)
 
     # 4. Show remaining counts
     remaining = conn.execute("SELECT COUNT(*) FROM sections").fetchone()[0]
     print(f"Total sections remaining: {remaining}")
-
-    close_connection()
+    return dup_count
 
 
 if __name__ == "__main__":
@@ -92,4 +124,5 @@ if __name__ == "__main__":
     end = dates[1] if len(dates) > 1 else start
     keep_newest = "--keep-newest" in args
 
-    cleanup(start, end, keep_newest)
+    with run_ledger.stage('dedupe'):
+        cleanup(start, end, keep_newest)
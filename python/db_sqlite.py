@@ -5,6 +5,7 @@ Synchronous operations using Python's built-in sqlite3.
 import os
 import sqlite3
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -16,6 +17,29 @@ DB_PATH = os.getenv('PARLIAMENT_DB_PATH', str(DEFAULT_DB_PATH))
 _conn = None
 
 
+class _Connection(sqlite3.Connection):
+    """Connection that remembers what the open transaction has logged to change_log.
+
+    Inside transaction() commit() is deferred to the end of the block, so the
+    helpers below, which each commit, can be grouped into one transaction.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.transaction_depth = 0
+        self.logged_changes = {}  # (entity_type, entity_id) -> op, for the open transaction
+
+    def commit(self):
+        if self.transaction_depth:
+            return
+        super().commit()
+        self.logged_changes.clear()
+
+    def rollback(self):
+        super().rollback()
+        self.logged_changes.clear()
+
+
 def get_connection() -> sqlite3.Connection:
     """Get or create a database connection."""
     global _conn
@@ -24,7 +48,7 @@ def get_connection() -> sqlite3.Connection:
         db_path = Path(DB_PATH)
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        _conn = sqlite3.connect(DB_PATH)
+        _conn = sqlite3.connect(DB_PATH, factory=_Connection)
         _conn.row_factory = sqlite3.Row  # Enable dict-like access
         _conn.execute('PRAGMA foreign_keys = ON')
         _conn.execute('PRAGMA journal_mode = WAL')  # Better concurrent access
@@ -52,6 +76,27 @@ def init_db():
     print(f"Database initialized at {DB_PATH}")
 
 
+@contextmanager
+def transaction():
+    """Run the enclosed writes as one transaction.
+
+    Commits made inside are deferred until the block ends; an exception
+    rolls the whole block back. Nested blocks join the outer one.
+    """
+    conn = get_connection()
+    conn.transaction_depth += 1
+    try:
+        yield conn
+    except BaseException:
+        conn.transaction_depth -= 1
+        if not conn.transaction_depth:
+            conn.rollback()
+        raise
+    conn.transaction_depth -= 1
+    if not conn.transaction_depth:
+        conn.commit()
+
+
 def generate_id() -> str:
     """Generate a UUID string for use as primary key."""
     return str(uuid.uuid4())
@@ -69,6 +114,28 @@ def parse_date(date_str: str) -> str:
         return date_str
 
 
+def record_changes(entity_type: str, entity_ids, op: str = 'upsert'):
+    """Append changed entities to the change log.
+
+    Runs in the caller's transaction, so the entries commit (or roll back)
+    with the write they describe. An entity already logged with the same op
+    in the open transaction is not logged again. entity_type is sitting,
+    section, bill, member or ministry; op is upsert or delete.
+    """
+    conn = get_connection()
+    logged = conn.logged_changes
+    new_ids = [
+        entity_id for entity_id in dict.fromkeys(entity_ids)
+        if logged.get((entity_type, entity_id)) != op
+    ]
+    for entity_id in new_ids:
+        logged[(entity_type, entity_id)] = op
+    conn.executemany(
+        'INSERT INTO change_log (entity_type, entity_id, op) VALUES (?, ?, ?)',
+        [(entity_type, entity_id, op) for entity_id in new_ids]
+    )
+
+
 def find_or_create_member(name: str) -> str:
     """Find existing member or create new one. Returns member ID."""
     conn = get_connection()
@@ -88,6 +155,7 @@ def find_or_create_member(name: str) -> str:
         'INSERT INTO members (id, name) VALUES (?, ?)',
         (member_id, name)
     )
+    record_changes('member', [member_id])
     conn.commit()
     return member_id
 
@@ -119,6 +187,7 @@ def create_bill(title: str, ministry_id: str = None,
            VALUES (?, ?, ?, ?, ?)''',
         (bill_id, title, ministry_id, parse_date(first_reading_date), first_reading_sitting_id)
     )
+    record_changes('bill', [bill_id])
     conn.commit()
     return bill_id
 
@@ -145,6 +214,8 @@ def find_bill_for_second_reading(title: str, ministry_id: str = None) -> str:
                 'UPDATE bills SET ministry_id = ? WHERE id = ? AND ministry_id IS NULL',
                 (ministry_id, bill_id)
             )
+            if cursor.rowcount:
+                record_changes('bill', [bill_id])
             conn.commit()
         return bill_id
 
@@ -155,6 +226,7 @@ def find_bill_for_second_reading(title: str, ministry_id: str = None) -> str:
            VALUES (?, ?, ?)''',
         (bill_id, title, ministry_id)
     )
+    record_changes('bill', [bill_id])
     conn.commit()
     return bill_id
 
@@ -175,12 +247,17 @@ def create_or_update_sitting(date_str: str, sitting_no: int = None,
 
     if row:
         sitting_id = row['id']
-        # Update existing
+        # Update existing, logging it only if a value actually changed
         cursor.execute(
             '''UPDATE sittings SET sitting_no = ?, parliament = ?, session_no = ?,
-               volume_no = ?, format = ?, url = ? WHERE id = ?''',
-            (sitting_no, parliament, session_no, volume_no, format_type, url, sitting_id)
+               volume_no = ?, format = ?, url = ?
+               WHERE id = ? AND (sitting_no, parliament, session_no, volume_no, format, url)
+                     IS NOT (?, ?, ?, ?, ?, ?)''',
+            (sitting_no, parliament, session_no, volume_no, format_type, url, sitting_id,
+             sitting_no, parliament, session_no, volume_no, format_type, url)
         )
+        if cursor.rowcount:
+            record_changes('sitting', [sitting_id])
     else:
         # Create new
         sitting_id = generate_id()
@@ -189,6 +266,7 @@ def create_or_update_sitting(date_str: str, sitting_no: int = None,
                VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
             (sitting_id, iso_date, sitting_no, parliament, session_no, volume_no, format_type, url)
         )
+        record_changes('sitting', [sitting_id])
 
     conn.commit()
     return sitting_id
@@ -206,9 +284,15 @@ def add_sitting_attendance(sitting_id: str, member_id: str, present: bool = True
            ON CONFLICT (sitting_id, member_id) DO UPDATE SET
            present = excluded.present,
            constituency = excluded.constituency,
-           designation = excluded.designation''',
+           designation = excluded.designation
+           WHERE (present, constituency, designation)
+                 IS NOT (excluded.present, excluded.constituency, excluded.designation)''',
         (sitting_id, member_id, 1 if present else 0, constituency, designation)
     )
+    if cursor.rowcount:
+        # Attendance shows on both the sitting's and the member's page
+        record_changes('sitting', [sitting_id])
+        record_changes('member', [member_id])
     conn.commit()
 
 
@@ -229,6 +313,7 @@ def create_section(sitting_id: str, category: str, section_type: str,
         (section_id, sitting_id, ministry_id, bill_id, category, section_type,
          title, content_html, content_plain, section_order, source_url)
     )
+    record_changes('section', [section_id])
     conn.commit()
     return section_id
 
@@ -245,6 +330,34 @@ def add_section_speaker(section_id: str, member_id: str,
            ON CONFLICT (section_id, member_id) DO NOTHING''',
         (section_id, member_id, constituency, designation)
     )
+    if cursor.rowcount:
+        record_changes('section', [section_id])
+        record_changes('member', [member_id])
+    conn.commit()
+
+
+def replace_section_utterances(section_id: str, utterances: list):
+    """Replace the speaker-turn rows for a section.
+
+    Each utterance is a dict with kind, speaker_label, member_id,
+    content_html, content_plain, char_start and char_end, in turn order.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('DELETE FROM section_utterances WHERE section_id = ?', (section_id,))
+    cursor.executemany(
+        '''INSERT INTO section_utterances
+           (section_id, turn_index, kind, speaker_label, member_id,
+            content_html, content_plain, char_start, char_end)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+        [
+            (section_id, idx, u['kind'], u['speaker_label'], u.get('member_id'),
+             u['content_html'], u['content_plain'], u['char_start'], u['char_end'])
+            for idx, u in enumerate(utterances)
+        ]
+    )
+    record_changes('section', [section_id])
     conn.commit()
 
 
@@ -0,0 +1,360 @@
+"""
+Export the site's list feeds as date-sharded static JSON.
+
+Each feed (questions, motions, clarifications, sittings, bills) is
+written to OUTPUT_DIR/<feed>/ as one shard per month, YYYY-MM.json, with
+a gzip copy alongside, plus a manifest.json listing every shard's key,
+item count and content hash, newest first. Bills without a first reading
+date go in an "undated" shard at the end. The client reads the manifest
+and fetches only the shards it needs.
+
+A shard file is only rewritten when its content hash changes. With a date
+range, only the months touched by sittings in that range are recomputed
+and merged into the existing manifest. Shards left with no items are
+removed.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+import metrics
+import run_ledger
+from db_sqlite import close_connection, get_connection, init_db
+from pagination import SECTION_FEEDS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'astro', 'public', 'data')
+
+# List cards only show the start of a section
+SNIPPET_CHARS = 150
+UNDATED = 'undated'
+
+FEEDS = [*SECTION_FEEDS, 'sittings', 'bills']
+
+
+def _month_filter(column, months):
+    """SQL condition and params restricting a YYYY-MM-DD column to the given months (None for all)."""
+    if months is None:
+        return '1', ()
+    return f'substr({column}, 1, 7) IN (SELECT value FROM json_each(?))', (json.dumps(sorted(months)),)
+
+
+def _compact(item):
+    """Drop empty optional fields, as JSON.stringify does for undefined."""
+    return {key: value for key, value in item.items() if value is not None}
+
+
+def section_feed_items(condition, months=None):
+    """Section list items matching the feed condition, in list order."""
+    conn = get_connection()
+    month_sql, params = _month_filter('s.date', months)
+    rows = conn.execute(
+        f'''SELECT
+                sec.id,
+                sec.section_title,
+                s.date,
+                sec.section_type,
+                sec.category,
+                m.name AS ministry,
+                substr(sec.content_plain, 1, ?) AS snippet
+            FROM sections sec
+            JOIN sittings s ON sec.sitting_id = s.id
+            LEFT JOIN ministries m ON sec.ministry_id = m.id
+            WHERE {condition} AND {month_sql}
+            ORDER BY s.date DESC, sec.section_order ASC''',
+        (SNIPPET_CHARS, *params)
+    ).fetchall()
+
+    speakers = defaultdict(list)
+    cursor = conn.execute(
+        '''SELECT ss.section_id, mem.name
+           FROM section_speakers ss
+           JOIN members mem ON ss.member_id = mem.id
+           WHERE ss.section_id IN (SELECT value FROM json_each(?))
+           ORDER BY ss.rowid''',
+        (json.dumps([row['id'] for row in rows]),)
+    )
+    for row in cursor:
+        speakers[row['section_id']].append(row['name'])
+
+    return [
+        _compact({
+            'id': row['id'],
+            'title': row['section_title'],
+            'date': row['date'],
+            'type': row['section_type'],
+            'category': row['category'] or None,
+            'ministry': row['ministry'] or None,
+            'speakers': speakers[row['id']],
+            'snippet': row['snippet'],
+        })
+        for row in rows
+    ]
+
+
+def sitting_items(months=None):
+    conn = get_connection()
+    month_sql, params = _month_filter('s.date', months)
+    rows = conn.execute(
+        f'''SELECT s.id, s.date, s.parliament, s.session_no, s.sitting_no, COUNT(sec.id) AS section_count
+            FROM sittings s
+            LEFT JOIN sections sec ON sec.sitting_id = s.id
+            WHERE {month_sql}
+            GROUP BY s.id
+            ORDER BY s.date DESC''',
+        params
+    ).fetchall()
+    return [
+        {
+            'id': row['id'],
+            'date': row['date'],
+            'parliament': row['parliament'],
+            'sessionNo': row['session_no'],
+            'sittingNo': row['sitting_no'],
+            'sectionCount': row['section_count'],
+        }
+        for row in rows
+    ]
+
+
+def bill_items(months=None):
+    conn = get_connection()
+    if months is None:
+        month_sql, params = '1', ()
+    else:
+        # The undated shard is keyed by a null first reading date
+        month_sql = '''(substr(b.first_reading_date, 1, 7) IN (SELECT value FROM json_each(?))
+                        OR (? AND b.first_reading_date IS NULL))'''
+        params = (json.dumps(sorted(months - {UNDATED})), UNDATED in months)
+    rows = conn.execute(
+        f'''SELECT
+                b.id,
+                b.title,
+                b.first_reading_date,
+                m.name AS ministry,
+                EXISTS (
+                    SELECT 1 FROM sections sec
+                    WHERE sec.bill_id = b.id AND sec.section_type = 'BP'
+                ) AS has_second_reading
+            FROM bills b
+            LEFT JOIN ministries m ON b.ministry_id = m.id
+            WHERE {month_sql}
+            ORDER BY b.first_reading_date DESC NULLS LAST''',
+        params
+    ).fetchall()
+    return [
+        _compact({
+            'id': row['id'],
+            'title': row['title'],
+            'date': row['first_reading_date'] or None,
+            'ministry': row['ministry'] or None,
+            'firstReadingDate': row['first_reading_date'] or None,
+            'hasSecondReading': bool(row['has_second_reading']),
+        })
+        for row in rows
+    ]
+
+
+def feed_items(feed, months=None):
+    if feed in SECTION_FEEDS:
+        return section_feed_items(SECTION_FEEDS[feed], months)
+    if feed == 'sittings':
+        return sitting_items(months)
+    return bill_items(months)
+
+
+def touched_months(feed, start_date, end_date):
+    """Shard keys whose contents can change when sittings in the date range are re-ingested."""
+    if feed != 'bills':
+        # Every month in the range, including any that lost all their sittings to duplicate cleanup
+        months = set()
+        month = start_date[:7]
+        while month <= end_date[:7]:
+            months.add(month)
+            year, mon = int(month[:4]), int(month[5:])
+            month = f'{year + mon // 12:04d}-{mon % 12 + 1:02d}'
+        return months
+
+    # Bills are sharded by first reading, which may predate the sittings that mention them
+    conn = get_connection()
+    rows = conn.execute(
+        '''SELECT DISTINCT COALESCE(substr(b.first_reading_date, 1, 7), ?) AS month
+           FROM bills b
+           JOIN sections sec ON sec.bill_id = b.id
+           JOIN sittings s ON sec.sitting_id = s.id
+           WHERE s.date >= ? AND s.date <= ?''',
+        (UNDATED, start_date, end_date)
+    ).fetchall()
+    return {row['month'] for row in rows}
+
+
+def months_for_sittings(feed, sitting_ids, bill_ids=()):
+    """
+    Shard keys whose contents can change when the sections of the given
+    sittings are rewritten in place, plus, for bills, the shards of bill_ids.
+    """
+    conn = get_connection()
+    sitting_json = json.dumps(sorted(sitting_ids))
+    if feed != 'bills':
+        rows = conn.execute(
+            'SELECT DISTINCT substr(date, 1, 7) AS month FROM sittings WHERE id IN (SELECT value FROM json_each(?))',
+            (sitting_json,)
+        ).fetchall()
+        return {row['month'] for row in rows}
+
+    rows = conn.execute(
+        '''SELECT DISTINCT COALESCE(substr(b.first_reading_date, 1, 7), ?) AS month
+           FROM bills b
+           WHERE b.id IN (SELECT value FROM json_each(?))
+              OR b.id IN (SELECT bill_id FROM sections WHERE sitting_id IN (SELECT value FROM json_each(?)))''',
+        (UNDATED, json.dumps(sorted(bill_ids)), sitting_json)
+    ).fetchall()
+    return {row['month'] for row in rows}
+
+
+def shard_key(item):
+    return item['date'][:7] if item.get('date') else UNDATED
+
+
+def _write_if_changed(path, data):
+    """Write bytes to path unless the file already holds them. Returns True if written."""
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _remove_shard(feed_dir, key):
+    for name in (f'{key}.json', f'{key}.json.gz'):
+        path = os.path.join(feed_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def load_manifest(feed_dir):
+    path = os.path.join(feed_dir, 'manifest.json')
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def export_feed(feed, output_dir, months=None):
+    """
+    Regenerate a feed's shards for the given months (every shard if None).
+    Returns the number of shard files rewritten.
+    """
+    feed_dir = os.path.join(output_dir, feed)
+    os.makedirs(feed_dir, exist_ok=True)
+
+    manifest = load_manifest(feed_dir)
+    if manifest is None and months is not None:
+        # No previous export to merge into
+        months = None
+    shards = {} if months is None else {
+        shard['key']: shard for shard in manifest['shards'] if shard['key'] not in months
+    }
+
+    grouped = defaultdict(list)
+    for item in feed_items(feed, months):
+        grouped[shard_key(item)].append(item)
+
+    written = 0
+    for key, items in grouped.items():
+        payload = json.dumps({'items': items}, ensure_ascii=False, separators=(',', ':')).encode()
+        content_hash = hashlib.sha256(payload).hexdigest()
+        json_path = os.path.join(feed_dir, f'{key}.json')
+        if _write_if_changed(json_path, payload) or not os.path.exists(f'{json_path}.gz'):
+            # mtime=0 keeps the gzip bytes stable for identical content
+            _write_if_changed(f'{json_path}.gz', gzip.compress(payload, compresslevel=9, mtime=0))
+            written += 1
+            metrics.inc('cache_requests_total', cache='list_shards', result='miss')
+        else:
+            metrics.inc('cache_requests_total', cache='list_shards', result='hit')
+        shards[key] = {
+            'key': key,
+            'count': len(items),
+            'hash': content_hash,
+            'path': f'{key}.json',
+            'gzipPath': f'{key}.json.gz',
+        }
+
+    previous = {shard['key'] for shard in manifest['shards']} if manifest else set()
+    for key in previous - set(shards):
+        _remove_shard(feed_dir, key)
+
+    # Newest month first, matching the list order, with undated items last
+    ordered = sorted((s for s in shards.values() if s['key'] != UNDATED), key=lambda s: s['key'], reverse=True)
+    if UNDATED in shards:
+        ordered.append(shards[UNDATED])
+
+    manifest = {'feed': feed, 'total': sum(s['count'] for s in ordered), 'shards': ordered}
+    _write_if_changed(
+        os.path.join(feed_dir, 'manifest.json'),
+        json.dumps(manifest, separators=(',', ':')).encode()
+    )
+    metrics.inc('rows_written_total', written, table='list_shards')
+    logger.info(f"{feed}: {manifest['total']} items in {len(ordered)} shards, {written} rewritten")
+    return written
+
+
+def export_lists(start_date_str=None, end_date_str=None, output_dir=DEFAULT_OUTPUT_DIR):
+    """Export every list feed, limited to the months touched by the date range if one is given."""
+    init_db()
+    output_dir = os.path.abspath(output_dir)
+
+    if start_date_str:
+        start_date = datetime.strptime(start_date_str, '%d-%m-%Y').strftime('%Y-%m-%d')
+        end_date = datetime.strptime(end_date_str, '%d-%m-%Y').strftime('%Y-%m-%d')
+
+    for feed in FEEDS:
+        months = touched_months(feed, start_date, end_date) if start_date_str else None
+        export_feed(feed, output_dir, months)
+
+    logger.info(f"Exported list feeds to {output_dir}")
+    close_connection()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: uv run export_lists_sqlite.py START_DATE [END_DATE] [--output DIR]")
+        print("       uv run export_lists_sqlite.py --all [--output DIR]")
+        print("Example: uv run export_lists_sqlite.py 14-01-2026")
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    output_dir = DEFAULT_OUTPUT_DIR
+    if "--output" in args:
+        idx = args.index("--output")
+        output_dir = args[idx + 1]
+        del args[idx:idx + 2]
+
+    if args and args[0] == "--all":
+        with run_ledger.stage('export_lists'):
+            export_lists(output_dir=output_dir)
+        sys.exit(0)
+
+    dates = [arg for arg in args if not arg.startswith("--")]
+
+    start = dates[0]
+    end = dates[1] if len(dates) > 1 else start
+
+    with run_ledger.stage('export_lists'):
+        export_lists(start, end, output_dir)
@@ -0,0 +1,256 @@
+"""
+Export the parliament database to Parquet for analytics.
+
+sittings, sections, section_speakers and sitting_attendance are streamed
+from SQLite in chunks and written as Hive-partitioned Parquet datasets,
+OUTPUT_DIR/<table>/parliament=<N>/part-<i>.parquet, that pyarrow.dataset,
+DuckDB or Polars can scan directly without touching the serving
+database. Speaker and attendance rows carry their sitting date and
+section attributes so common aggregations need no joins. Low-cardinality
+text columns (section type, category, ministry, member names,
+constituencies, designations) are dictionary-encoded.
+
+A full export rebuilds each table in a temporary directory and swaps it
+in. --append only adds the sittings dated after the previous export,
+as new part files, and falls back to a full export if there is none.
+Re-ingested older sittings are picked up by the next full export.
+"""
+
+import itertools
+import json
+import logging
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from db_sqlite import DB_PATH, close_connection, get_connection, init_db
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = Path(DB_PATH).parent / 'parquet'  # Beside the database, wherever PARLIAMENT_DB_PATH puts it
+STATE_FILE = '_export_state.json'
+CHUNK_ROWS = 50_000
+# Partition directory for rows whose sitting has no parliament number
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+# Each query selects the partition key (parliament) first, then the
+# columns in order, for sittings matching {where}, ordered by parliament
+TABLES = {
+    'sittings': {
+        'query': '''SELECT sit.parliament, sit.id, sit.date, sit.session_no, sit.sitting_no,
+                           sit.volume_no, sit.format
+                    FROM sittings sit
+                    WHERE {where}
+                    ORDER BY sit.parliament, sit.date''',
+        'columns': [
+            ('id', pa.string()),
+            ('date', pa.date32()),
+            ('session_no', pa.int32()),
+            ('sitting_no', pa.int32()),
+            ('volume_no', pa.int32()),
+            ('format', CATEGORY),
+        ],
+    },
+    'sections': {
+        'query': '''SELECT sit.parliament, sec.id, sec.sitting_id, sit.date, sec.section_order,
+                           sec.section_type, sec.category, m.acronym, sec.bill_id,
+                           sec.section_title, sec.content_plain, sec.summary
+                    FROM sections sec
+                    JOIN sittings sit ON sec.sitting_id = sit.id
+                    LEFT JOIN ministries m ON sec.ministry_id = m.id
+                    WHERE {where}
+                    ORDER BY sit.parliament, sit.date, sec.section_order''',
+        'columns': [
+            ('id', pa.string()),
+            ('sitting_id', pa.string()),
+            ('sitting_date', pa.date32()),
+            ('section_order', pa.int32()),
+            ('section_type', CATEGORY),
+            ('category', CATEGORY),
+            ('ministry', CATEGORY),
+            ('bill_id', pa.string()),
+            ('section_title', pa.string()),
+            ('content_plain', pa.string()),
+            ('summary', pa.string()),
+        ],
+    },
+    'section_speakers': {
+        'query': '''SELECT sit.parliament, ss.section_id, ss.member_id, mem.name,
+                           ss.constituency, ss.designation, sec.sitting_id, sit.date,
+                           sec.section_type, sec.category, m.acronym
+                    FROM section_speakers ss
+                    JOIN sections sec ON ss.section_id = sec.id
+                    JOIN sittings sit ON sec.sitting_id = sit.id
+                    JOIN members mem ON ss.member_id = mem.id
+                    LEFT JOIN ministries m ON sec.ministry_id = m.id
+                    WHERE {where}
+                    ORDER BY sit.parliament, sit.date, sec.section_order''',
+        'columns': [
+            ('section_id', pa.string()),
+            ('member_id', pa.string()),
+            ('member', CATEGORY),
+            ('constituency', CATEGORY),
+            ('designation', CATEGORY),
+            ('sitting_id', pa.string()),
+            ('sitting_date', pa.date32()),
+            ('section_type', CATEGORY),
+            ('category', CATEGORY),
+            ('ministry', CATEGORY),
+        ],
+    },
+    'sitting_attendance': {
+        'query': '''SELECT sit.parliament, sa.sitting_id, sit.date, sa.member_id, mem.name,
+                           sa.present, sa.constituency, sa.designation
+                    FROM sitting_attendance sa
+                    JOIN sittings sit ON sa.sitting_id = sit.id
+                    JOIN members mem ON sa.member_id = mem.id
+                    WHERE {where}
+                    ORDER BY sit.parliament, sit.date''',
+        'columns': [
+            ('sitting_id', pa.string()),
+            ('sitting_date', pa.date32()),
+            ('member_id', pa.string()),
+            ('member', CATEGORY),
+            ('present', pa.bool_()),
+            ('constituency', CATEGORY),
+            ('designation', CATEGORY),
+        ],
+    },
+}
+
+
+def to_array(values, field_type):
+    """Build an Arrow array from SQLite values for a column type."""
+    if pa.types.is_dictionary(field_type):
+        return pa.array(values, pa.string()).dictionary_encode()
+    if pa.types.is_date32(field_type):
+        # Dates are stored as ISO YYYY-MM-DD text
+        return pa.array(values, pa.string()).cast(pa.date32())
+    if pa.types.is_boolean(field_type):
+        return pa.array([None if v is None else bool(v) for v in values], pa.bool_())
+    return pa.array(values, field_type)
+
+
+def to_batch(rows, schema):
+    """Convert (parliament, *columns) tuples to a record batch, dropping the partition key."""
+    columns = list(zip(*rows))[1:]
+    return pa.RecordBatch.from_arrays(
+        [to_array(values, field.type) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def partition_dir(table_dir, parliament):
+    return Path(table_dir) / f"parliament={NULL_PARTITION if parliament is None else parliament}"
+
+
+def next_part_path(directory):
+    """First unused part-<i>.parquet in a partition directory."""
+    directory.mkdir(parents=True, exist_ok=True)
+    existing = [int(p.stem.split('-')[1]) for p in directory.glob('part-*.parquet')]
+    return directory / f"part-{max(existing, default=-1) + 1}.parquet"
+
+
+def export_table(name, table_dir, where='1', params=(), chunk_rows=CHUNK_ROWS):
+    """
+    Stream a table's rows into one new part file per parliament under
+    table_dir, one row group per chunk. Returns the number of rows written.
+    """
+    spec = TABLES[name]
+    schema = pa.schema([pa.field(column, field_type) for column, field_type in spec['columns']])
+
+    cursor = get_connection().cursor()
+    # Plain tuples are cheaper than sqlite3.Row and are transposed straight into columns
+    cursor.row_factory = None
+    cursor.execute(spec['query'].format(where=where), params)
+
+    writer, current, written = None, object(), 0
+    try:
+        while rows := cursor.fetchmany(chunk_rows):
+            # Rows arrive ordered by parliament; split each chunk at partition boundaries
+            for parliament, group in itertools.groupby(rows, key=lambda row: row[0]):
+                if parliament != current:
+                    if writer:
+                        writer.close()
+                    path = next_part_path(partition_dir(table_dir, parliament))
+                    writer = pq.ParquetWriter(path, schema, compression='zstd')
+                    current = parliament
+                batch = to_batch(list(group), schema)
+                writer.write_batch(batch)
+                written += batch.num_rows
+    finally:
+        if writer:
+            writer.close()
+    return written
+
+
+def load_state(output_dir):
+    path = Path(output_dir) / STATE_FILE
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def export_parquet(output_dir=DEFAULT_OUTPUT_DIR, append=False, chunk_rows=CHUNK_ROWS):
+    """Export every table; with append, only sittings newer than the last export."""
+    init_db()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    through = get_connection().execute('SELECT MAX(date) FROM sittings').fetchone()[0]
+    if through is None:
+        logger.info("No sittings to export.")
+        close_connection()
+        return
+
+    state = load_state(output_dir) if append else None
+    if append and state is None:
+        logger.info("No previous export found; running a full export.")
+
+    for name in TABLES:
+        if state:
+            written = export_table(
+                name, output_dir / name, 'sit.date > ? AND sit.date <= ?',
+                (state['exported_through'], through), chunk_rows
+            )
+        else:
+            # Build the table beside the old one so readers never see a partial dataset
+            tmp_dir = output_dir / f".{name}.tmp"
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir()
+            written = export_table(name, tmp_dir, 'sit.date <= ?', (through,), chunk_rows)
+            shutil.rmtree(output_dir / name, ignore_errors=True)
+            os.replace(tmp_dir, output_dir / name)
+        logger.info(f"{name}: {'appended' if state else 'exported'} {written} rows")
+
+    (output_dir / STATE_FILE).write_text(json.dumps({'exported_through': through}, indent=2))
+    logger.info(f"Exported sittings through {through} to {output_dir}")
+    close_connection()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "-h" in args or "--help" in args:
+        print("Usage: uv run export_parquet_sqlite.py [--append] [--output DIR] [--chunk-rows N]")
+        print("Example: uv run export_parquet_sqlite.py --append")
+        sys.exit(0)
+
+    output_dir = DEFAULT_OUTPUT_DIR
+    chunk_rows = CHUNK_ROWS
+    if "--output" in args:
+        output_dir = args[args.index("--output") + 1]
+    if "--chunk-rows" in args:
+        chunk_rows = int(args[args.index("--chunk-rows") + 1])
+
+    export_parquet(output_dir, append="--append" in args, chunk_rows=chunk_rows)
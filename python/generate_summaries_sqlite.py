@@ -1,15 +1,34 @@
 import asyncio
+import json
 import logging
 import os
 import re
 import sys
+import time
 
-from google import genai
 from datetime import datetime, timedelta
+from itertools import groupby
 from dotenv import load_dotenv
 
 import db_sqlite as db
-from prompts import PQ_PROMPT, SECTION_PROMPT, BILL_PROMPT, MEMBER_PROMPT
+import memory_profile
+import metrics
+import run_ledger
+import summary_jobs
+from summary_planner import SummaryPlan, format_report
+from sitting_documents import refresh_sitting_documents
+from llm_providers import get_provider
+from prompt_builder import (
+    build_bill_prompt,
+    build_bill_prompts,
+    build_multi_section_prompt,
+    build_section_prompt,
+    clean_for_prompt,
+    count_tokens,
+    pack_sections,
+    parse_multi_section_response,
+)
+from prompts import MEMBER_PROMPT
 
 load_dotenv()
 
@@ -20,34 +39,73 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-client = genai.Client()
-
-AI_SEMAPHORE = asyncio.Semaphore(20)  # Can do more parallel with Gemini but keeping safe limit
+AI_CONCURRENCY = 20                   # Can do more parallel with Gemini but keeping safe limit
+AI_SEMAPHORE = asyncio.Semaphore(AI_CONCURRENCY)
 AI_COOLDOWN = 0.5                    # Adjust to Gemini rate limitations (15 RPM free, higher paid)
 
-async def generate_summary(prompt_template: str, model='gemini-3-flash-preview') -> str:
+async def request_summary(prompt_template: str, model=None) -> str:
+    """Call the model and normalise its response. Raises if the request fails."""
+    provider = get_provider()
     async with AI_SEMAPHORE:
         try:
-            response = await client.aio.models.generate_content(
-                model=model,
-                contents=prompt_template,
-            )
-            
-            await asyncio.sleep(AI_COOLDOWN)
-            
-            if response.text:
-                content = response.text.strip()
-                # Normalize whitespace: replace multiple spaces/tabs/non-breaking spaces 
-                # with single space but preserve newlines
-                content = re.sub(r'[ \t\xa0]+', ' ', content)
-                return content
-            return None
-        except Exception as e:
-            logger.error(f"Error generating summary: {e}")
+            with metrics.span('llm_request', provider=provider.name):
+                text = await provider.generate(prompt_template, model=model)
+        except Exception:
+            metrics.inc('llm_requests_total', provider=provider.name, outcome='error')
+            raise
+        finally:
             await asyncio.sleep(AI_COOLDOWN)
-            return None
+    
+    metrics.inc('llm_requests_total', provider=provider.name, outcome='ok' if text else 'empty')
+    if metrics.enabled():
+        # Estimated with the prompt builder's tokenizer; only counted when metrics are on
+        metrics.inc('llm_prompt_tokens_total', count_tokens(prompt_template), provider=provider.name)
+        metrics.inc('llm_output_tokens_total', count_tokens(text or ''), provider=provider.name)
+    if not text:
+        return None
+    content = text.strip()
+    # Normalize whitespace: replace multiple spaces/tabs/non-breaking spaces 
+    # with single space but preserve newlines
+    content = re.sub(r'[ \t\xa0]+', ' ', content)
+    return content
 
-async def generate_section_summaries_for_sitting(sitting_id, only_blanks):
+async def generate_summary(prompt_template: str, model=None) -> str:
+    try:
+        return await request_summary(prompt_template, model=model)
+    except Exception as e:
+        logger.error(f"Error generating summary: {e}")
+        return None
+
+async def run_job(job_type, target_ids, produce, save):
+    """
+    Run one model request under the job ledger. produce() returns the model
+    output; save(output) writes it without committing and returns the target
+    IDs it completed, which are marked done in the same transaction.
+    Returns the completed IDs (empty on failure).
+    """
+    summary_jobs.start_jobs(job_type, target_ids)
+    start = time.perf_counter()
+    try:
+        output = await produce()
+        if not output:
+            raise ValueError("Empty response from model")
+    except Exception as e:
+        latency_ms = int((time.perf_counter() - start) * 1000)
+        logger.error(f"Error generating {job_type} summary: {e}")
+        summary_jobs.fail_jobs(job_type, target_ids, str(e), latency_ms)
+        metrics.inc('summary_jobs_total', len(target_ids), job_type=job_type, outcome='failed')
+        return []
+    
+    latency_ms = int((time.perf_counter() - start) * 1000)
+    with metrics.span('db_write', table=f'{job_type}_summaries'):
+        done_ids = save(output)
+        summary_jobs.complete_jobs(job_type, done_ids, latency_ms)
+    metrics.inc('summary_jobs_total', len(done_ids), job_type=job_type, outcome='done')
+    metrics.inc('rows_written_total', len(done_ids), table=f'{job_type}_summaries')
+    metrics.observe('summary_job_seconds', latency_ms / 1000, job_type=job_type)
+    return done_ids
+
+def select_sections_for_sitting(sitting_id, only_blanks):
     conn = db.get_connection()
     cursor = conn.cursor()
     query = '''
@@ -62,16 +120,24 @@ async def generate_section_summaries_for_sitting(sitting_id, only_blanks):
         query += ' AND summary IS NULL'
         
     cursor.execute(query, (sitting_id,))
-    sections = [dict(row) for row in cursor.fetchall()]
+    return [dict(row) for row in cursor.fetchall()]
+
+async def generate_section_summaries_for_sitting(sitting_id, only_blanks):
+    sections = select_sections_for_sitting(sitting_id, only_blanks)
     
     if not sections:
         return
-        
-    logger.info(f"Generating summaries for {len(sections)} sections in sitting {sitting_id}")
+    
+    summary_jobs.enqueue_jobs('section', [(s['id'], sitting_id) for s in sections])
+    await summarise_sections(sections, f"sitting {sitting_id}")
+
+async def summarise_sections(sections, label):
+    batches = pack_sections(sections)
+    logger.info(f"Generating summaries for {len(sections)} sections in {label} ({len(batches)} requests)")
     
     tasks = []
-    for s in sections:
-        tasks.append(generate_section_summary(s))
+    for batch in batches:
+        tasks.append(generate_section_batch_summaries(batch))
         
         if len(tasks) >= 20:
             await asyncio.gather(*tasks)
@@ -80,19 +146,52 @@ async def generate_section_summaries_for_sitting(sitting_id, only_blanks):
     if tasks:
         await asyncio.gather(*tasks)
 
+def save_section_summaries(summaries):
+    conn = db.get_connection()
+    conn.executemany(
+        'UPDATE sections SET summary = ? WHERE id = ?',
+        [(summary, section_id) for section_id, summary in summaries.items()]
+    )
+    db.record_changes('section', summaries)
+    return list(summaries)
+
 async def generate_section_summary(section):
-    prompt = PQ_PROMPT if section['category'] == 'question' else SECTION_PROMPT
-    prompt = prompt.format(title=section['section_title'], text=section['content_plain'][:20000])
+    await run_job(
+        'section', [section['id']],
+        lambda: request_summary(build_section_prompt(section)),
+        lambda summary: save_section_summaries({section['id']: summary}),
+    )
+
+async def generate_section_batch_summaries(batch):
+    """Summarise a packed batch in one request, falling back to single requests for any item the response missed."""
+    if len(batch) == 1:
+        await generate_section_summary(batch[0])
+        return
     
-    summary = await generate_summary(prompt)
+    done_ids = await run_job(
+        'section', [s['id'] for s in batch],
+        lambda: request_summary(build_multi_section_prompt(batch)),
+        lambda response: save_section_summaries(parse_multi_section_response(response, batch)),
+    )
     
-    if summary:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('UPDATE sections SET summary = ? WHERE id = ?', (summary, section['id']))
-        conn.commit()
+    missing = [s for s in batch if s['id'] not in done_ids]
+    if missing:
+        logger.warning(f"Packed response missing {len(missing)}/{len(batch)} items, retrying individually")
+        await asyncio.gather(*(generate_section_summary(s) for s in missing))
 
-async def generate_bill_summaries_for_sitting(sitting_id, only_blanks):
+def load_bill_text(bill_id):
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        '''SELECT content_plain FROM sections 
+           WHERE bill_id = ? 
+           ORDER BY section_order''',
+        (bill_id,)
+    )
+    return "\n\n".join(row['content_plain'] for row in cursor.fetchall() if row['content_plain'])
+
+def select_bills_for_sitting(sitting_id, only_blanks):
+    """Bills with a second reading in this sitting and enough debate text to summarise."""
     conn = db.get_connection()
     cursor = conn.cursor()
     query = '''
@@ -108,36 +207,67 @@ async def generate_bill_summaries_for_sitting(sitting_id, only_blanks):
     cursor.execute(query, (sitting_id,))
     bills = [dict(row) for row in cursor.fetchall()]
     
+    eligible = []
+    for bill in bills:
+        bill['text'] = load_bill_text(bill['id'])
+        if len(bill['text']) >= 1500:
+            eligible.append(bill)
+    return eligible
+
+async def generate_bill_summaries_for_sitting(sitting_id, only_blanks):
+    bills = select_bills_for_sitting(sitting_id, only_blanks)
+    
     if not bills:
         return
         
     logger.info(f"Generating summaries for {len(bills)} bills in sitting {sitting_id}")
     
+    summary_jobs.enqueue_jobs('bill', [(b['id'], sitting_id) for b in bills])
     for bill in bills:
-        cursor.execute(
-            '''SELECT content_plain FROM sections 
-               WHERE bill_id = ? 
-               ORDER BY section_order''',
-            (bill['id'],)
+        await generate_bill_job(bill)
+
+def save_bill_summary(bill_id, summary):
+    conn = db.get_connection()
+    conn.execute('UPDATE bills SET summary = ? WHERE id = ?', (summary, bill_id))
+    db.record_changes('bill', [bill_id])
+    return [bill_id]
+
+async def generate_bill_job(bill):
+    done_ids = await run_job(
+        'bill', [bill['id']],
+        lambda: generate_bill_summary(bill['title'], clean_for_prompt(bill['text'])),
+        lambda summary: save_bill_summary(bill['id'], summary),
+    )
+    if done_ids:
+        logger.info(f"Generated summary for bill {bill['title']}")
+
+async def generate_bill_summary(title, text):
+    """Summarise a bill debate, map-reducing over chunks when it is too long for one prompt."""
+    chunk_prompts = build_bill_prompts(title, text)
+    if chunk_prompts is None:
+        return await request_summary(build_bill_prompt(title, text))
+    
+    logger.info(f"Bill {title} split into {len(chunk_prompts)} chunks")
+    notes = await asyncio.gather(*(request_summary(p) for p in chunk_prompts), return_exceptions=True)
+    # A summary of part of the debate must not be saved as done; fail the job so it is retried
+    failed = [n for n in notes if not isinstance(n, str) or not n]
+    if failed:
+        errors = [n for n in failed if isinstance(n, BaseException)]
+        raise ValueError(
+            f"{len(failed)} of {len(chunk_prompts)} chunk requests failed"
+            + (f": {errors[0]}" if errors else "")
         )
-        sections = [row['content_plain'] for row in cursor.fetchall()]
-        
-        if not sections:
-            continue
-            
-        full_text = "\n\n".join(sections)
-        
-        if len(full_text) < 1500:
-            continue
-        
-        prompt = BILL_PROMPT.format(title=bill['title'], text=full_text[:20000])
-        
-        summary = await generate_summary(prompt)
-        
-        if summary:
-            cursor.execute('UPDATE bills SET summary = ? WHERE id = ?', (summary, bill['id']))
-            conn.commit()
-            logger.info(f"Generated summary for bill {bill['title']}")
+    
+    return await request_summary(build_bill_prompt(title, "\n\n".join(notes)))
+
+def select_sitting_ids(start_date, end_date):
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        'SELECT id FROM sittings WHERE date >= ? AND date <= ?',
+        (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+    )
+    return [row['id'] for row in cursor.fetchall()]
 
 async def generate_sitting_summaries(start_date_str, end_date_str, only_blanks=False):
     start_date = datetime.strptime(start_date_str, '%d-%m-%Y')
@@ -151,30 +281,109 @@ async def generate_sitting_summaries(start_date_str, end_date_str, only_blanks=F
         
     logger.info(f"Summarizing date range: {start_date_str} to {end_date_str} ({len(dates)} days)")
     
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    
-    iso_start = start_date.strftime('%Y-%m-%d')
-    iso_end = end_date.strftime('%Y-%m-%d')
+    sitting_ids_to_process = select_sitting_ids(start_date, end_date)
+    await summarise_sittings(sitting_ids_to_process, only_blanks)
+
+    logger.info("Batch processing complete!")
+    db.close_connection()
+
+async def summarise_sittings(sitting_ids, only_blanks=False):
+    """Generate section and bill summaries for the given sittings."""
+    logger.info(f"Generating summaries for {len(sitting_ids)} sittings...")
     
-    cursor.execute(
-        'SELECT id FROM sittings WHERE date >= ? AND date <= ?',
-        (iso_start, iso_end)
+    for sid in sitting_ids:
+        with memory_profile.sitting(sid):
+            await generate_section_summaries_for_sitting(sid, only_blanks)
+            await generate_bill_summaries_for_sitting(sid, only_blanks)
+            refresh_sitting_documents([sid])
+
+MEMBER_ACTIVITY_LIMIT = 20
+
+def iter_member_activity(member_ids, limit=MEMBER_ACTIVITY_LIMIT):
+    """Yield (member_id, activity rows) for each member's latest involvements.
+
+    All members are loaded in a single windowed query instead of one
+    query per member; rows arrive grouped by member, most recent first.
+    """
+    if not member_ids:
+        return
+    conn = db.get_connection()
+    cursor = conn.execute(
+        '''SELECT member_id, section_title, section_type, ministry, designation, date
+           FROM (
+               SELECT ss.member_id, s.section_title, s.section_type,
+                      min.acronym as ministry, ss.designation, sess.date,
+                      ROW_NUMBER() OVER (
+                          PARTITION BY ss.member_id
+                          ORDER BY sess.date DESC, s.section_order DESC
+                      ) as rnum
+               FROM section_speakers ss
+               JOIN sections s ON ss.section_id = s.id
+               JOIN sittings sess ON s.sitting_id = sess.id
+               LEFT JOIN ministries min ON s.ministry_id = min.id
+               WHERE ss.member_id IN (SELECT value FROM json_each(?))
+           )
+           WHERE rnum <= ?
+           ORDER BY member_id, rnum''',
+        (json.dumps(list(member_ids)), limit)
     )
-    sitting_ids_to_process = [row['id'] for row in cursor.fetchall()]
-            
-    logger.info(f"Generating summaries for {len(sitting_ids_to_process)} sittings...")
+    for member_id, rows in groupby(cursor, key=lambda row: row['member_id']):
+        yield member_id, [dict(row) for row in rows]
+
+def build_member_prompt(member, activity):
+    recent_designation = activity[0]['designation'] or "MP"
+    activity_lines = []
+    for a in activity:
+        ministry = f"[{a['ministry']}] " if a['ministry'] else ""
+        activity_lines.append(f"- {a['date']}: {ministry}{a['section_title']}")
     
-    for sid in sitting_ids_to_process:
-        await generate_section_summaries_for_sitting(sid, only_blanks)
-        await generate_bill_summaries_for_sitting(sid, only_blanks)
+    context = "\n".join(activity_lines)
+    return MEMBER_PROMPT.format(name=member['name'], recent_designation=recent_designation, text=context)
 
-    logger.info("Batch processing complete!")
-    db.close_connection()
+def iter_member_prompts(members):
+    """Yield (member, prompt) for every member with recorded activity."""
+    by_id = {m['id']: m for m in members}
+    for member_id, activity in iter_member_activity(by_id):
+        yield by_id[member_id], build_member_prompt(by_id[member_id], activity)
 
-async def generate_member_summaries(only_blanks):
-    logger.info("Generating member summaries...")
+def save_member_summary(member_id, summary):
+    conn = db.get_connection()
+    conn.execute(
+        '''INSERT INTO member_summaries (member_id, summary, last_updated)
+           VALUES (?, ?, CURRENT_TIMESTAMP)
+           ON CONFLICT(member_id) DO UPDATE SET 
+           summary = excluded.summary, 
+           last_updated = CURRENT_TIMESTAMP''',
+        (member_id, summary)
+    )
+    db.record_changes('member', [member_id])
+    return [member_id]
+
+async def generate_member_summary(member, prompt):
+    await run_job(
+        'member', [member['id']],
+        lambda: request_summary(prompt),
+        lambda summary: save_member_summary(member['id'], summary),
+    )
+
+async def summarise_members(members):
+    """Stream member prompts into the scheduler. Members with no recorded activity are marked skipped."""
+    prompted = set()
+    tasks = []
+    for member, prompt in iter_member_prompts(members):
+        prompted.add(member['id'])
+        tasks.append(generate_member_summary(member, prompt))
+        
+        if len(tasks) >= 20:
+            await asyncio.gather(*tasks)
+            tasks = []
+            
+    if tasks:
+        await asyncio.gather(*tasks)
     
+    summary_jobs.skip_jobs('member', [m['id'] for m in members if m['id'] not in prompted])
+
+def select_members(only_blanks):
     conn = db.get_connection()
     cursor = conn.cursor()
     # Only summarise members from the current (latest) parliament
@@ -198,70 +407,92 @@ async def generate_member_summaries(only_blanks):
             SELECT id, name FROM members m
             WHERE 1=1 {current_parl_filter}
         ''')
-    members = [dict(row) for row in cursor.fetchall()]
+    return [dict(row) for row in cursor.fetchall()]
+
+async def generate_member_summaries(only_blanks):
+    logger.info("Generating member summaries...")
     
-    tasks = []
+    members = select_members(only_blanks)
+    summary_jobs.enqueue_jobs('member', [(m['id'], None) for m in members])
+    await summarise_members(members)
     
-    async def process_member(member):
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            '''SELECT s.section_title, s.section_type, min.acronym as ministry,
-                      ss.designation, sess.date
-               FROM section_speakers ss
-               JOIN sections s ON ss.section_id = s.id
-               JOIN sittings sess ON s.sitting_id = sess.id
-               LEFT JOIN ministries min ON s.ministry_id = min.id
-               WHERE ss.member_id = ?
-               ORDER BY sess.date DESC
-               LIMIT 20''',
-            (member['id'],)
-        )
-        activity = [dict(row) for row in cursor.fetchall()]
-            
-        if not activity:
-            return
-            
-        activity_lines = []
-        recent_designation = activity[0]['designation'] or "MP"
-        
-        for a in activity:
-            ministry = f"[{a['ministry']}] " if a['ministry'] else ""
-            activity_lines.append(f"- {a['date']}: {ministry}{a['section_title']}")
-        
-        context = "\n".join(activity_lines)
-        prompt = MEMBER_PROMPT.format(name=member['name'], recent_designation=recent_designation, text=context)
+    logger.info("Member summaries complete")
+    db.close_connection()
 
-        summary = await generate_summary(prompt)
-        
-        if summary:
-            cursor.execute(
-                '''INSERT INTO member_summaries (member_id, summary, last_updated)
-                   VALUES (?, ?, CURRENT_TIMESTAMP)
-                   ON CONFLICT(member_id) DO UPDATE SET 
-                   summary = excluded.summary, 
-                   last_updated = CURRENT_TIMESTAMP''',
-                (member['id'], summary)
-            )
-            conn.commit()
-    
-    for m in members:
-        tasks.append(process_member(m))
-        
-        if len(tasks) >= 20:
-            await asyncio.gather(*tasks)
-            tasks = []
-            
-    if tasks:
-        await asyncio.gather(*tasks)
+def plan_sitting_summaries(start_date_str, end_date_str, only_blanks=False):
+    """Estimate the cost of a --sittings run without calling the model."""
+    start_date = datetime.strptime(start_date_str, '%d-%m-%Y')
+    end_date = datetime.strptime(end_date_str, '%d-%m-%Y')
     
-    logger.info("Member summaries complete")
+    plan = SummaryPlan(AI_CONCURRENCY, AI_COOLDOWN)
+    sitting_ids = select_sitting_ids(start_date, end_date)
+    for sid in sitting_ids:
+        plan.add_sections(select_sections_for_sitting(sid, only_blanks))
+        plan.add_bills(select_bills_for_sitting(sid, only_blanks))
+    
+    print(f"Plan for {len(sitting_ids)} sittings from {start_date_str} to {end_date_str}"
+          f" at concurrency {AI_CONCURRENCY}:\n")
+    print(format_report(plan.report()))
+    db.close_connection()
+
+def plan_member_summaries(only_blanks):
+    """Estimate the cost of a --members run without calling the model."""
+    members = select_members(only_blanks)
+    plan = SummaryPlan(AI_CONCURRENCY, AI_COOLDOWN)
+    plan.add_members(members, [prompt for _, prompt in iter_member_prompts(members)])
+    
+    print(f"Plan for {len(members)} members at concurrency {AI_CONCURRENCY}:\n")
+    print(format_report(plan.report()))
+    db.close_connection()
+
+def load_rows(query, ids):
+    """Fetch rows for a list of IDs bound as a single JSON array parameter."""
+    conn = db.get_connection()
+    cursor = conn.execute(query, (json.dumps(ids),))
+    return [dict(row) for row in cursor.fetchall()]
+
+async def resume_summaries():
+    """Re-run only the jobs an earlier run left pending, in flight or failed."""
+    logger.info(f"Job ledger before resume: {summary_jobs.get_job_counts()}")
+    
+    section_ids = summary_jobs.get_resumable_jobs('section')
+    sections = load_rows(
+        '''SELECT id, sitting_id, section_title, content_plain, category, section_type
+           FROM sections WHERE id IN (SELECT value FROM json_each(?))''',
+        section_ids
+    )
+    found = {s['id'] for s in sections}
+    summary_jobs.skip_jobs('section', [i for i in section_ids if i not in found])
+    if sections:
+        await summarise_sections(sections, "resumed jobs")
+        refresh_sitting_documents(sorted({s['sitting_id'] for s in sections}))
+    
+    bill_ids = summary_jobs.get_resumable_jobs('bill')
+    bills = load_rows('SELECT id, title FROM bills WHERE id IN (SELECT value FROM json_each(?))', bill_ids)
+    found = {b['id'] for b in bills}
+    summary_jobs.skip_jobs('bill', [i for i in bill_ids if i not in found])
+    if bills:
+        logger.info(f"Generating summaries for {len(bills)} resumed bills")
+    for bill in bills:
+        bill['text'] = load_bill_text(bill['id'])
+        await generate_bill_job(bill)
+    
+    member_ids = summary_jobs.get_resumable_jobs('member')
+    members = load_rows('SELECT id, name FROM members WHERE id IN (SELECT value FROM json_each(?))', member_ids)
+    found = {m['id'] for m in members}
+    summary_jobs.skip_jobs('member', [i for i in member_ids if i not in found])
+    if members:
+        logger.info(f"Generating summaries for {len(members)} resumed members")
+        await summarise_members(members)
+    
+    logger.info(f"Job ledger after resume: {summary_jobs.get_job_counts()}")
     db.close_connection()
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: uv run generate_summaries_sqlite.py [--sittings] [START_DATE [END_DATE]] [--members] [--only-blank]")
+        print("Usage: uv run generate_summaries_sqlite.py [--sittings] [START_DATE [END_DATE]] [--members] [--resume] [--only-blank] [--plan] [--profile-memory]")
         print("Example: uv run generate_summaries_sqlite.py --sittings 01-10-2024")
+        print("         uv run generate_summaries_sqlite.py --resume")
         sys.exit(1)
         
     args = sys.argv[1:]
@@ -269,14 +500,32 @@ if __name__ == "__main__":
     
     summarize_sittings = '--sittings' in flags
     summarize_members = '--members' in flags
+    resume = '--resume' in flags
     only_blank = '--only-blank' in flags
+    plan = '--plan' in flags
     
-    if ((not summarize_sittings) or summarize_members) and (summarize_sittings or (not summarize_members)):
-        print("Error: Exactly one of --sittings and --members can be specified")
+    if [summarize_sittings, summarize_members, resume].count(True) != 1:
+        print("Error: Exactly one of --sittings, --members and --resume can be specified")
         sys.exit(1)
     
-    if summarize_members:
-        asyncio.run(generate_member_summaries(only_blank))
+    if plan and resume:
+        print("Error: --plan cannot be combined with --resume")
+        sys.exit(1)
+    
+    if '--profile-memory' in flags:
+        memory_profile.enable()
+
+    # Ensure the job ledger table exists on databases created before it
+    db.init_db()
+    
+    if resume:
+        with run_ledger.stage('summarise_resume'):
+            asyncio.run(resume_summaries())
+    elif summarize_members and plan:
+        plan_member_summaries(only_blank)
+    elif summarize_members:
+        with run_ledger.stage('summarise_members'):
+            asyncio.run(generate_member_summaries(only_blank))
     else:
         dates = [arg for arg in args if not arg.startswith('--')]
         if len(dates) < 1:
@@ -286,4 +535,8 @@ if __name__ == "__main__":
         start = dates[0]
         end = dates[1] if len(dates) > 1 else start
 
-        asyncio.run(generate_sitting_summaries(start, end, only_blank))
+        if plan:
+            plan_sitting_summaries(start, end, only_blank)
+        else:
+            with run_ledger.stage('summarise'):
+                asyncio.run(generate_sitting_summaries(start, end, only_blank))
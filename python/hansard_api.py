@@ -1,40 +1,208 @@
-import requests
-from typing import Dict, Optional
-from bs4 import BeautifulSoup
-from parliament_sitting import ParliamentSitting
+import codecs
+import json
+import re
+import tempfile
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+import metrics
+from parliament_sitting import ParliamentSitting, section_key
+
+# Upper bounds in bytes for the size of a sitting's report
+PAYLOAD_BUCKETS = (64e3, 256e3, 1e6, 2e6, 4e6, 8e6, 16e6)
+
+# Bytes read at a time from the response and from the spooled report
+CHUNK_SIZE = 64 * 1024
+
+SECTIONS_KEY = 'takesSectionVOList'
+
+
+class _JSONReader:
+    """Decodes one JSON value at a time from a binary file, reading only as much as it needs."""
+
+    WHITESPACE = re.compile(r'\s*')
+
+    def __init__(self, file: BinaryIO, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.text = codecs.getincrementaldecoder('utf-8')()
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> bool:
+        """Append up to size more bytes to the buffer, dropping what has been consumed."""
+        if self.eof:
+            return False
+        data = self.file.read(size)
+        self.eof = not data
+        self.buffer = self.buffer[self.pos:] + self.text.decode(data, final=self.eof)
+        self.pos = 0
+        return not self.eof
+
+    def peek(self) -> str:
+        """The next non-whitespace character, without consuming it."""
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.chunk_size):
+                raise json.JSONDecodeError("Report ended unexpectedly", self.buffer, self.pos)
+
+    def take(self, chars: str) -> str:
+        """Consume the next non-whitespace character, which must be one of chars."""
+        char = self.peek()
+        if char not in chars:
+            raise json.JSONDecodeError(f"Expected one of {chars!r}", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self):
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Most likely the value continues past the buffer; read more, in growing steps
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            # A number running to the end of the buffer may be cut short
+            if end == len(self.buffer) and self._fill(size):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_report(file: BinaryIO, array_key: str = SECTIONS_KEY) -> Iterator[Tuple[str, object]]:
+    """
+    Incrementally parse a getHansardReport JSON object, yielding (key, value)
+    for each top-level member in the order they appear. The array_key array
+    is yielded one (array_key, element) pair per element, so only one
+    section is ever decoded at a time.
+    """
+    reader = _JSONReader(file)
+    reader.take('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.value()
+        reader.take(':')
+        if key == array_key and reader.peek() == '[':
+            reader.take('[')
+            if reader.peek() == ']':
+                reader.take(']')
+            else:
+                while True:
+                    yield key, reader.value()
+                    if reader.take(',]') == ']':
+                        break
+        else:
+            yield key, reader.value()
+        if reader.take(',}') == '}':
+            return
 
 class HansardAPI:
     BASE_URL = "https://sprs.parl.gov.sg/search/getHansardReport/"
     
     def __init__(self):
-        self.session = requests.Session()
+        self._session = None
+
+    @property
+    def session(self):
+        # requests takes ~100ms to import, so it is only loaded once a sitting is fetched
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
     
     def fetch_by_date(self, date_str: str) -> Optional[ParliamentSitting]:
+        from requests.exceptions import RequestException
+
         # date_str format: 'DD-MM-YYYY' (e.g., '14-01-2026')
         url = f"{self.BASE_URL}?sittingDate={date_str}"
         
         try:
-            response = self.session.post(url)
-            response.raise_for_status()
-            data = response.json()
-            if not (data.get('takesSectionVOList') or data.get('htmlFullContent')):
-                return None
-            
-            parliament_sitting = ParliamentSitting(date_str)
-            parliament_sitting.set_metadata(self.get_sitting_metadata(data))
-            
-            # Check format type
-            if data.get('takesSectionVOList'):
-                # New format
-                parliament_sitting.set_attendance(data['attendanceList'])
-                parliament_sitting.set_sections(data['takesSectionVOList'])
-            
-            
-            return parliament_sitting
-        except requests.exceptions.RequestException as e:
+            with metrics.span('hansard_fetch', attrs={'date': date_str}):
+                response = self.session.post(url, stream=True)
+                metrics.inc('hansard_requests_total', status=response.status_code)
+                response.raise_for_status()
+                # Spooled to disk rather than held in memory, as the sections are read from it twice
+                report = tempfile.TemporaryFile()
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    report.write(chunk)
+            metrics.observe('hansard_payload_bytes', report.tell(), buckets=PAYLOAD_BUCKETS)
+            report.seek(0)
+            return self.parse_report_file(date_str, report)
+        except (RequestException, json.JSONDecodeError) as e:
+            metrics.inc('hansard_request_errors_total')
             print(f"Error fetching {date_str}: {e}")
             return None
+
+    def parse_report(self, date_str: str, data: Dict) -> Optional[ParliamentSitting]:
+        """Build a sitting from a getHansardReport payload, None if it has no content."""
+        if not (data.get('takesSectionVOList') or data.get('htmlFullContent')):
+            return None
+        
+        parliament_sitting = ParliamentSitting(date_str)
+        parliament_sitting.set_metadata(self.get_sitting_metadata(data))
+        
+        # Check format type
+        if data.get('takesSectionVOList'):
+            # New format
+            with metrics.span('parse_attendance'):
+                parliament_sitting.set_attendance(data['attendanceList'])
+            with metrics.span('parse_sections'):
+                parliament_sitting.set_sections(data['takesSectionVOList'])
+        
+        return parliament_sitting
     
+    def parse_report_file(self, date_str: str, report: BinaryIO) -> Optional[ParliamentSitting]:
+        """
+        Build a sitting from a getHansardReport payload in a seekable binary
+        file, without reading the whole payload into memory. A first pass
+        keeps the metadata and attendance and notes where each section merge
+        group ends; the sections themselves are parsed on a second pass, as
+        the sitting's stream_sections() is consumed. The file is closed once
+        that pass is done, or here if the report has no content.
+        """
+        head = {}
+        merge_plan = {}
+        section_count = 0
+        for key, value in iter_report(report):
+            if key != SECTIONS_KEY:
+                # htmlFullContent (old format) can be the whole transcript; only its presence matters
+                head[key] = bool(value) if key == 'htmlFullContent' else value
+            elif isinstance(value, dict):
+                merge_plan[section_key(value)] = section_count
+                section_count += 1
+
+        if not (section_count or head.get('htmlFullContent')):
+            report.close()
+            return None
+
+        parliament_sitting = ParliamentSitting(date_str)
+        parliament_sitting.set_metadata(self.get_sitting_metadata({**head, SECTIONS_KEY: section_count}))
+
+        if section_count:
+            with metrics.span('parse_attendance'):
+                parliament_sitting.set_attendance(head['attendanceList'])
+
+            def open_sections():
+                with report:
+                    report.seek(0)
+                    for key, value in iter_report(report):
+                        if key == SECTIONS_KEY and isinstance(value, dict):
+                            yield value
+
+            parliament_sitting.set_section_source(open_sections, merge_plan)
+        else:
+            report.close()
+
+        return parliament_sitting
+
     def get_sitting_metadata(self, raw_data: Dict) -> Dict:
         if 'takesSectionVOList' in raw_data and raw_data['takesSectionVOList']:
             metadata = raw_data.get('metadata', {})
@@ -0,0 +1,168 @@
+"""
+LLM provider layer for summary generation.
+
+The provider is chosen with the LLM_PROVIDER environment variable:
+- gemini (default): Google Gemini via google-genai
+- openai: any OpenAI-compatible endpoint (LLM_BASE_URL / LLM_API_KEY)
+- groq: Groq's OpenAI-compatible API
+- mock: deterministic local backend, no network or API keys required
+
+LLM_MODEL overrides the provider's default model.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+from typing import Optional
+
+
+class LLMError(Exception):
+    """Raised when a provider fails to produce a completion."""
+
+
+class LLMProvider:
+    name = 'base'
+    default_model: Optional[str] = None
+
+    def __init__(self, model: str = None):
+        self.model = model or self.default_model
+
+    async def generate(self, prompt: str, model: str = None) -> Optional[str]:
+        """Return the completion text for a prompt, or None if it was empty."""
+        raise NotImplementedError
+
+
+class GeminiProvider(LLMProvider):
+    name = 'gemini'
+    default_model = 'gemini-3-flash-preview'
+
+    def __init__(self, model: str = None):
+        super().__init__(model)
+        from google import genai
+        self.client = genai.Client()
+
+    async def generate(self, prompt: str, model: str = None) -> Optional[str]:
+        response = await self.client.aio.models.generate_content(
+            model=model or self.model,
+            contents=prompt,
+        )
+        return response.text
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    name = 'openai'
+    default_model = 'gpt-4o-mini'
+
+    def __init__(self, model: str = None, base_url: str = None, api_key: str = None):
+        super().__init__(model)
+        from openai import AsyncOpenAI
+        self.client = AsyncOpenAI(
+            base_url=base_url or os.getenv('LLM_BASE_URL'),
+            api_key=api_key or os.getenv('LLM_API_KEY') or os.getenv('OPENAI_API_KEY'),
+        )
+
+    async def generate(self, prompt: str, model: str = None) -> Optional[str]:
+        response = await self.client.chat.completions.create(
+            model=model or self.model,
+            messages=[{'role': 'user', 'content': prompt}],
+        )
+        if not response.choices:
+            return None
+        return response.choices[0].message.content
+
+
+class GroqProvider(OpenAICompatibleProvider):
+    name = 'groq'
+    default_model = 'llama-3.3-70b-versatile'
+
+    def __init__(self, model: str = None):
+        LLMProvider.__init__(self, model)
+        from groq import AsyncGroq
+        self.client = AsyncGroq()
+
+
+class MockProvider(LLMProvider):
+    """
+    Deterministic stand-in for a real model endpoint.
+
+    Responses, latency jitter and injected failures are all derived from a
+    hash of (seed, prompt, attempt), so a given workload behaves the same
+    way on every run regardless of task scheduling order.
+    """
+    name = 'mock'
+    default_model = 'mock-1'
+
+    def __init__(self, model: str = None, latency: float = None,
+                 jitter: float = None, error_rate: float = None, seed: int = None):
+        super().__init__(model)
+        self.latency = latency if latency is not None else float(os.getenv('MOCK_LLM_LATENCY', '0.2'))
+        self.jitter = jitter if jitter is not None else float(os.getenv('MOCK_LLM_JITTER', '0.1'))
+        self.error_rate = error_rate if error_rate is not None else float(os.getenv('MOCK_LLM_ERROR_RATE', '0'))
+        self.seed = seed if seed is not None else int(os.getenv('MOCK_LLM_SEED', '0'))
+        self.calls = 0
+        self.errors = 0
+        self._attempts = defaultdict(int)
+
+    def _fraction(self, *parts) -> float:
+        """Map the given parts to a stable float in [0, 1)."""
+        key = ':'.join(str(p) for p in (self.seed, *parts))
+        digest = hashlib.sha256(key.encode()).digest()
+        return int.from_bytes(digest[:8], 'big') / 2**64
+
+    async def generate(self, prompt: str, model: str = None) -> Optional[str]:
+        prompt_digest = hashlib.sha256(prompt.encode()).hexdigest()
+        attempt = self._attempts[prompt_digest]
+        self._attempts[prompt_digest] += 1
+        self.calls += 1
+
+        delay = self.latency + self.jitter * self._fraction(prompt_digest, attempt, 'latency')
+        await asyncio.sleep(delay)
+
+        if self._fraction(prompt_digest, attempt, 'error') < self.error_rate:
+            self.errors += 1
+            raise LLMError(f"Mock failure for prompt {prompt_digest[:8]} (attempt {attempt + 1})")
+
+        summary = (
+            f"This is a mock summary {prompt_digest[:12]} "
+            f"generated by {model or self.model} for a {len(prompt)}-character prompt."
+        )
+        # Multi-item prompts expect a JSON object keyed by item number
+        items = re.findall(r'^\s*### Item (\d+)', prompt, re.MULTILINE)
+        if items:
+            return json.dumps({n: f"{summary} Item {n}." for n in items})
+        return summary
+
+
+PROVIDERS = {
+    'gemini': GeminiProvider,
+    'openai': OpenAICompatibleProvider,
+    'groq': GroqProvider,
+    'mock': MockProvider,
+}
+
+_provider = None
+
+
+def create_provider(name: str = None, **kwargs) -> LLMProvider:
+    """Create a provider by name (defaults to LLM_PROVIDER, then gemini)."""
+    name = (name or os.getenv('LLM_PROVIDER') or 'gemini').lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown LLM provider '{name}'. Expected one of: {', '.join(PROVIDERS)}")
+    kwargs.setdefault('model', os.getenv('LLM_MODEL'))
+    return PROVIDERS[name](**kwargs)
+
+
+def get_provider() -> LLMProvider:
+    """Get or create the process-wide provider."""
+    global _provider
+    if _provider is None:
+        _provider = create_provider()
+    return _provider
+
+
+def set_provider(provider: LLMProvider):
+    """Replace the process-wide provider (used by benchmarks and tests)."""
+    global _provider
+    _provider = provider
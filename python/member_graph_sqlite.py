@@ -0,0 +1,230 @@
+"""
+Build the member co-participation graph from section_speakers.
+
+Speakers are loaded once into a sparse member x section incidence
+matrix; multiplying it by its transpose gives, for every pair of
+members, the number of sections they both spoke in. This is done per
+parliament and per ministry, and each member's strongest edges in each
+scope are stored in member_edges.
+"""
+
+import json
+import logging
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+from scipy import sparse
+
+import metrics
+import run_ledger
+from db_sqlite import close_connection, get_connection, init_db, record_changes
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+# Edges kept per member in each scope
+TOP_EDGES = 20
+
+
+def load_incidence():
+    """
+    Load every (member, section) pair with the section's parliament and
+    ministry. Returns (member_ids, rows, cols, parliaments, ministries),
+    where rows/cols index into member_ids and the section list.
+    """
+    conn = get_connection()
+    pairs = conn.execute(
+        '''SELECT ss.member_id, ss.section_id, sit.parliament, s.ministry_id
+           FROM section_speakers ss
+           JOIN sections s ON s.id = ss.section_id
+           JOIN sittings sit ON sit.id = s.sitting_id'''
+    ).fetchall()
+
+    member_ids, rows = np.unique([p['member_id'] for p in pairs], return_inverse=True)
+    _, cols = np.unique([p['section_id'] for p in pairs], return_inverse=True)
+    parliaments = np.array([str(p['parliament']) if p['parliament'] is not None else '' for p in pairs])
+    ministries = np.array([p['ministry_id'] or '' for p in pairs])
+    return member_ids, rows, cols, parliaments, ministries
+
+
+def top_edges(rows, cols, n_members, top_k=TOP_EDGES):
+    """
+    Co-participation counts for the given incidence pairs.
+    Yields (member_index, other_index, shared_sections, rank) for each
+    member's top_k partners.
+    """
+    n_sections = int(cols.max()) + 1 if len(cols) else 0
+    incidence = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+        shape=(n_members, n_sections),
+    )
+    co = (incidence @ incidence.T).tocsr()
+    co.setdiag(0)
+    co.eliminate_zeros()
+
+    for member in range(n_members):
+        start, end = co.indptr[member], co.indptr[member + 1]
+        if start == end:
+            continue
+        others = co.indices[start:end]
+        counts = co.data[start:end]
+        # Highest count first, ties broken by member index for stable output
+        order = np.lexsort((others, -counts))[:top_k]
+        for rank, i in enumerate(order):
+            yield member, int(others[i]), int(counts[i]), rank
+
+
+def touched_scopes(start_date, end_date):
+    """Parliaments and ministries with sections in sittings within the date range."""
+    conn = get_connection()
+    rows = conn.execute(
+        '''SELECT DISTINCT sit.parliament, s.ministry_id
+           FROM sittings sit
+           JOIN sections s ON s.sitting_id = sit.id
+           WHERE sit.date >= ? AND sit.date <= ?''',
+        (start_date, end_date)
+    ).fetchall()
+    return _scopes(rows)
+
+
+def sitting_scopes(sitting_ids):
+    """Parliaments and ministries with sections in the given sittings."""
+    conn = get_connection()
+    rows = conn.execute(
+        '''SELECT DISTINCT sit.parliament, s.ministry_id
+           FROM sittings sit
+           JOIN sections s ON s.sitting_id = sit.id
+           WHERE sit.id IN (SELECT value FROM json_each(?))''',
+        (json.dumps(list(sitting_ids)),)
+    ).fetchall()
+    return _scopes(rows)
+
+
+def _scopes(rows):
+    parliaments = {str(r['parliament']) for r in rows if r['parliament'] is not None}
+    ministries = {r['ministry_id'] for r in rows if r['ministry_id']}
+    return {'parliament': parliaments, 'ministry': ministries}
+
+
+def stored_edges(scopes=None):
+    """
+    Stored edges by member, as {member_id: {(scope_type, scope_id,
+    other_member_id, shared_sections, rank)}}, for the given
+    {scope_type: scope_ids} or every scope.
+    """
+    conn = get_connection()
+    query = 'SELECT scope_type, scope_id, member_id, other_member_id, shared_sections, rank FROM member_edges'
+    if scopes is None:
+        cursors = [conn.execute(query)]
+    else:
+        cursors = [
+            conn.execute(
+                query + ' WHERE scope_type = ? AND scope_id IN (SELECT value FROM json_each(?))',
+                (scope_type, json.dumps(sorted(scope_ids)))
+            )
+            for scope_type, scope_ids in scopes.items() if scope_ids
+        ]
+    edges = defaultdict(set)
+    for cursor in cursors:
+        for row in cursor:
+            edges[row['member_id']].add(
+                (row['scope_type'], row['scope_id'], row['other_member_id'], row['shared_sections'], row['rank'])
+            )
+    return edges
+
+
+def update_member_graph(scopes=None):
+    """
+    Recompute member_edges for the given {scope_type: scope_ids}, or
+    rebuild every scope if none are given. Uses the open connection.
+    """
+    conn = get_connection()
+
+    member_ids, rows, cols, parliaments, ministries = load_incidence()
+    if not len(member_ids):
+        logger.info("No section speakers to build a graph from.")
+        return
+
+    scope_keys = {'parliament': parliaments, 'ministry': ministries}
+    if scopes is not None:
+        before = stored_edges(scopes)
+    else:
+        scopes = {scope_type: set(keys) - {''} for scope_type, keys in scope_keys.items()}
+        before = stored_edges()
+        conn.execute('DELETE FROM member_edges')
+
+    total_edges = 0
+    after = defaultdict(set)
+    for scope_type, scope_ids in scopes.items():
+        if not scope_ids:
+            continue
+        conn.execute(
+            '''DELETE FROM member_edges
+               WHERE scope_type = ? AND scope_id IN (SELECT value FROM json_each(?))''',
+            (scope_type, json.dumps(sorted(scope_ids)))
+        )
+        for scope_id in sorted(scope_ids):
+            mask = scope_keys[scope_type] == scope_id
+            edges = [
+                (scope_type, scope_id, member_ids[m], member_ids[o], shared, rank)
+                for m, o, shared, rank in top_edges(rows[mask], cols[mask], len(member_ids))
+            ]
+            conn.executemany(
+                '''INSERT INTO member_edges
+                   (scope_type, scope_id, member_id, other_member_id, shared_sections, rank)
+                   VALUES (?, ?, ?, ?, ?, ?)''',
+                edges
+            )
+            total_edges += len(edges)
+            for edge in edges:
+                after[edge[2]].add((edge[0], edge[1], edge[3], edge[4], edge[5]))
+        logger.info(f"Rebuilt {len(scope_ids)} {scope_type} scope(s)")
+
+    # Edges show on member pages; log the members whose edges changed
+    record_changes('member', [m for m in before.keys() | after.keys() if before.get(m) != after.get(m)])
+    conn.commit()
+    metrics.inc('rows_written_total', total_edges, table='member_edges')
+    logger.info(f"Stored {total_edges} edges for {len(member_ids)} members")
+
+
+def build_member_graph(start_date_str=None, end_date_str=None):
+    """
+    Rebuild member_edges. With a date range, only the parliaments and
+    ministries that have sections in those sittings are recomputed.
+    """
+    init_db()
+    scopes = None
+    if start_date_str:
+        start_date = datetime.strptime(start_date_str, '%d-%m-%Y').strftime('%Y-%m-%d')
+        end_date = datetime.strptime(end_date_str, '%d-%m-%Y').strftime('%Y-%m-%d')
+        scopes = touched_scopes(start_date, end_date)
+    update_member_graph(scopes)
+    close_connection()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: uv run member_graph_sqlite.py START_DATE [END_DATE]")
+        print("       uv run member_graph_sqlite.py --all")
+        print("Example: uv run member_graph_sqlite.py 14-01-2026")
+        sys.exit(1)
+
+    if sys.argv[1] == "--all":
+        with run_ledger.stage('member_graph'):
+            build_member_graph()
+        sys.exit(0)
+
+    args = sys.argv[1:]
+    dates = [arg for arg in args if not arg.startswith("--")]
+
+    start = dates[0]
+    end = dates[1] if len(dates) > 1 else start
+
+    with run_ledger.stage('member_graph'):
+        build_member_graph(start, end)
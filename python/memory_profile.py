@@ -0,0 +1,224 @@
+"""
+Memory profiling for ingest and summary runs (--profile-memory).
+
+Once enable() has started tracemalloc, every run_ledger.stage() and every
+sitting() within it is measured:
+- per sitting: its peak while it was processed and the memory it left
+  behind once garbage is collected, both relative to where it started;
+- per stage: its peak, what it retained, the sittings with the highest
+  peaks, and the source lines holding most of the retained memory (a
+  snapshot diff against the start of the stage);
+- across sittings: if memory retained after each sitting grew by more
+  than GROWTH_WARNING_BYTES from the first sitting to the last, a warning
+  listing the lines that grew most between the first sitting and the
+  highest retention seen, which is how a leak or an unbounded cache
+  shows up.
+
+The report is logged when each stage ends. tracemalloc makes allocation
+several times slower, so this is for diagnosing runs, not for every run.
+Only allocations made through Python are traced; SQLite's page cache and
+other C libraries add to RSS without appearing here.
+"""
+import gc
+import logging
+import statistics
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+
+TOP_SITES = 10
+TOP_SITTINGS = 5
+GROWTH_WARNING_BYTES = 2 * 1024 * 1024
+MIN_SITTINGS_FOR_GROWTH = 3
+
+# Allocations made by the profiling itself, and by imports, are left out of the diffs
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+_enabled = False
+_frames = []  # Open measurements, innermost last
+_stages = []  # Open stage records, innermost last
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    """Start tracing allocations. Stages and sittings are profiled from then on."""
+    global _enabled
+    if _enabled:
+        return
+    tracemalloc.start()
+    _enabled = True
+
+
+class _Frame:
+    def __init__(self, start):
+        self.start = start
+        self.peak = start
+        self.end = start
+
+
+class _StageRecord:
+    def __init__(self, name, snapshot):
+        self.name = name
+        self.snapshot = snapshot
+        self.frame = None
+        self.sittings = []  # (label, peak, retained) in bytes, relative to each sitting's start
+        self.retained_after = []  # Memory retained by the stage after each sitting
+        self.first_sitting_snapshot = None
+        self.highest_sitting_snapshot = None
+
+
+class _Sitting:
+    """Yielded by sitting(); call skip() when the date turned out to have no sitting."""
+
+    def __init__(self):
+        self.skipped = False
+
+    def skip(self):
+        self.skipped = True
+
+
+def _snapshot():
+    # Unfiltered: filtering runs in Python over every trace, so it is left to the report
+    return tracemalloc.take_snapshot()
+
+
+def _fold_peak():
+    """Carry the peak so far into every open measurement, before it is reset for a nested one."""
+    _, peak = tracemalloc.get_traced_memory()
+    for frame in _frames:
+        frame.peak = max(frame.peak, peak)
+
+
+@contextmanager
+def _measure():
+    _fold_peak()
+    tracemalloc.reset_peak()
+    frame = _Frame(tracemalloc.get_traced_memory()[0])
+    _frames.append(frame)
+    try:
+        yield frame
+    finally:
+        _fold_peak()
+        _frames.pop()
+        # Parsed HTML trees are reference cycles; collect them so they don't count as retained
+        gc.collect()
+        frame.end = tracemalloc.get_traced_memory()[0]
+
+
+def stage(name):
+    """Profile a stage and log its report when it ends. A no-op unless enabled."""
+    return _stage(name) if _enabled else nullcontext()
+
+
+def sitting(label):
+    """Profile one sitting within the current stage. A no-op unless enabled."""
+    return _sitting(label) if _enabled else nullcontext(_Sitting())
+
+
+@contextmanager
+def _stage(name):
+    record = _StageRecord(name, _snapshot())
+    _stages.append(record)
+    try:
+        with _measure() as record.frame:
+            yield
+    finally:
+        _stages.pop()
+        logger.info(format_report(record, _snapshot()))
+        warning = growth_warning(record)
+        if warning:
+            logger.warning(warning)
+
+
+@contextmanager
+def _sitting(label):
+    current = _Sitting()
+    with _measure() as frame:
+        yield current
+    if current.skipped or not _stages:
+        return
+
+    record = _stages[-1]
+    retained = frame.end - record.frame.start
+    record.sittings.append((label, frame.peak - frame.start, frame.end - frame.start))
+    # Snapshots take a while, so after the first sitting one is only taken at a new high
+    if record.first_sitting_snapshot is None:
+        record.first_sitting_snapshot = _snapshot()
+    elif retained > max(record.retained_after):
+        record.highest_sitting_snapshot = _snapshot()
+    record.retained_after.append(retained)
+
+
+def _size(n: float) -> str:
+    if abs(n) >= 1e6:
+        return f"{n / 1e6:.1f} MB"
+    return f"{n / 1e3:.0f} KB"
+
+
+def _site(stat) -> str:
+    frame = stat.traceback[0]
+    filename = frame.filename.replace('\\', '/')
+    if 'site-packages/' in filename:
+        filename = filename.split('site-packages/', 1)[1]
+    else:
+        filename = filename.rsplit('/', 1)[-1]
+    return f"{filename}:{frame.lineno}"
+
+
+def _top_growth(snapshot, baseline, limit=TOP_SITES) -> list:
+    snapshot, baseline = snapshot.filter_traces(_FILTERS), baseline.filter_traces(_FILTERS)
+    diffs = [diff for diff in snapshot.compare_to(baseline, 'lineno') if diff.size_diff > 0]
+    return [
+        f"    {'+' + _size(diff.size_diff):>10}  {_site(diff)} ({diff.count_diff:+,} blocks)"
+        for diff in diffs[:limit]
+    ]
+
+
+def format_report(record: _StageRecord, snapshot) -> str:
+    frame = record.frame
+    lines = [
+        f"Memory for {record.name}: peak {_size(frame.peak - frame.start)} above its start, "
+        f"retained {_size(frame.end - frame.start)}"
+    ]
+    if record.sittings:
+        peaks = [peak for _, peak, _ in record.sittings]
+        lines.append(
+            f"  {len(record.sittings)} sitting(s): peak median {_size(statistics.median(peaks))}, "
+            f"max {_size(max(peaks))}"
+        )
+        lines.append("  Highest sitting peaks:")
+        for label, peak, retained in sorted(record.sittings, key=lambda s: s[1], reverse=True)[:TOP_SITTINGS]:
+            lines.append(f"    {label:<12}  peak {_size(peak):>9}  retained {_size(retained):>9}")
+
+    sites = _top_growth(snapshot, record.snapshot)
+    if sites:
+        lines.append("  Top allocation sites of the retained memory:")
+        lines.extend(sites)
+    return "\n".join(lines)
+
+
+def growth_warning(record: _StageRecord):
+    """A warning if memory retained across sittings kept growing, else None."""
+    retained = record.retained_after
+    if len(retained) < MIN_SITTINGS_FOR_GROWTH or record.highest_sitting_snapshot is None:
+        return None
+    growth = retained[-1] - retained[0]
+    if growth <= GROWTH_WARNING_BYTES:
+        return None
+
+    lines = [
+        f"Memory retained by {record.name} grew {_size(growth)} over {len(retained)} sittings "
+        f"({_size(growth / (len(retained) - 1))} per sitting). Lines that grew most since the first sitting:"
+    ]
+    lines.extend(_top_growth(record.highest_sitting_snapshot, record.first_sitting_snapshot))
+    return "\n".join(lines)
@@ -0,0 +1,219 @@
+"""
+Lightweight spans, counters and histograms for ingest and summarisation.
+
+Instrumentation is off unless PARLIAMENT_METRICS_DIR is set (or enable()
+is called), in which case:
+- every finished span is appended to <dir>/metrics.jsonl as a JSON line
+  with its name, labels, duration and parent span, so a sitting's time can
+  be broken down into HTTP, parsing, speaker matching, DB writes and LLM
+  calls;
+- at exit, a snapshot of every counter and histogram is appended to the
+  same file and written to <dir>/parliament.prom in the Prometheus text
+  format, for node_exporter's textfile collector.
+
+When disabled, span() returns a shared no-op context manager and inc() and
+observe() return immediately, so instrumented code pays one flag check.
+Span durations are also recorded in the parliament_span_seconds histogram.
+run_ledger.py enables collection in memory only, without either file, to
+total each stage's counters.
+"""
+import atexit
+import contextvars
+import itertools
+import json
+import os
+import time
+import uuid
+from collections import defaultdict
+from contextlib import nullcontext
+from pathlib import Path
+
+PREFIX = 'parliament'
+JSONL_FILE = 'metrics.jsonl'
+PROM_FILE = f'{PREFIX}.prom'
+
+# Upper bounds in seconds, suited to everything from a DB write to an LLM call
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_NOOP = nullcontext()
+_enabled = False
+_output_dir = None
+_jsonl = None
+_run_id = None
+_span_ids = itertools.count(1)
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+# {(name, labels): value} and {(name, labels): [bucket counts..., sum, count]}
+_counters = defaultdict(float)
+_histograms = {}
+_buckets = {}
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(output_dir=None):
+    """
+    Start recording, writing to output_dir, or only in memory if it is None.
+    Called automatically if PARLIAMENT_METRICS_DIR is set.
+    """
+    global _enabled, _output_dir, _jsonl, _run_id
+    if _enabled:
+        return
+    _run_id = str(uuid.uuid4())
+    _enabled = True
+    if output_dir is None:
+        return
+    _output_dir = Path(output_dir)
+    _output_dir.mkdir(parents=True, exist_ok=True)
+    _jsonl = open(_output_dir / JSONL_FILE, 'a')
+    atexit.register(flush)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels):
+    """Add to a counter."""
+    if not _enabled:
+        return
+    _counters[_key(name, labels)] += value
+
+
+def observe(name: str, value: float, buckets=DEFAULT_BUCKETS, **labels):
+    """Record a value in a histogram. A histogram's buckets are fixed by its first observation."""
+    if not _enabled:
+        return
+    bounds = _buckets.setdefault(name, tuple(buckets))
+    key = _key(name, labels)
+    counts = _histograms.get(key)
+    if counts is None:
+        counts = _histograms[key] = [0] * (len(bounds) + 2)
+    for i, bound in enumerate(bounds):
+        if value <= bound:
+            counts[i] += 1
+    counts[-2] += value
+    counts[-1] += 1
+
+
+class _Span:
+    __slots__ = ('name', 'labels', 'attrs', 'id', 'parent', 'start', 'token')
+
+    def __init__(self, name, labels, attrs):
+        self.name = name
+        self.labels = labels
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.id = next(_span_ids)
+        self.parent = _current_span.get()
+        self.token = _current_span.set(self.id)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        _current_span.reset(self.token)
+        observe('span_seconds', duration, span=self.name, **self.labels)
+        if _jsonl is None:
+            return False
+        _jsonl.write(json.dumps({
+            'type': 'span',
+            'run': _run_id,
+            'id': self.id,
+            'parent': self.parent,
+            'name': self.name,
+            'labels': self.labels,
+            'attrs': self.attrs,
+            'ts': time.time() - duration,
+            'duration_ms': round(duration * 1000, 3),
+            'error': exc_type.__name__ if exc_type else None,
+        }) + '\n')
+        return False
+
+
+def span(name: str, attrs: dict = None, **labels):
+    """
+    Context manager timing a block. Spans opened inside it (including in
+    awaited coroutines) are its children. labels become histogram labels,
+    so keep them low-cardinality; per-item details such as a sitting date
+    go in attrs, which are only written to the JSONL trace.
+    """
+    if not _enabled:
+        return _NOOP
+    return _Span(name, labels, attrs)
+
+
+def counter_total(name: str, **match) -> float:
+    """Sum of a counter across every label set that includes the given labels."""
+    wanted = set(match.items())
+    return sum(value for (metric, labels), value in _counters.items()
+               if metric == name and wanted <= set(labels))
+
+
+def snapshot() -> dict:
+    """Current counters and histograms as plain data."""
+    def labelled(key):
+        name, labels = key
+        return {'name': name, 'labels': dict(labels)}
+
+    return {
+        'counters': [{**labelled(key), 'value': value} for key, value in sorted(_counters.items())],
+        'histograms': [
+            {
+                **labelled(key),
+                'buckets': dict(zip(map(str, _buckets[key[0]]), counts[:-2])),
+                'sum': counts[-2],
+                'count': counts[-1],
+            }
+            for key, counts in sorted(_histograms.items())
+        ],
+    }
+
+
+def _format_labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def prometheus_text() -> str:
+    """Counters and histograms in the Prometheus text exposition format."""
+    lines = []
+    for name in sorted({name for name, _ in _counters}):
+        lines.append(f'# TYPE {PREFIX}_{name} counter')
+        for (metric, labels), value in sorted(_counters.items()):
+            if metric == name:
+                lines.append(f'{PREFIX}_{name}{_format_labels(labels)} {value:g}')
+    for name in sorted({name for name, _ in _histograms}):
+        lines.append(f'# TYPE {PREFIX}_{name} histogram')
+        for (metric, labels), counts in sorted(_histograms.items()):
+            if metric != name:
+                continue
+            for bound, count in zip(_buckets[name], counts):
+                lines.append(f'{PREFIX}_{name}_bucket{_format_labels(labels, le=f"{bound:g}")} {count}')
+            lines.append(f'{PREFIX}_{name}_bucket{_format_labels(labels, le="+Inf")} {counts[-1]}')
+            lines.append(f'{PREFIX}_{name}_sum{_format_labels(labels)} {counts[-2]:g}')
+            lines.append(f'{PREFIX}_{name}_count{_format_labels(labels)} {counts[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+def flush():
+    """Append a snapshot to the JSONL file and rewrite the Prometheus textfile."""
+    if _jsonl is None:
+        return
+    _jsonl.write(json.dumps({'type': 'snapshot', 'run': _run_id, 'ts': time.time(), **snapshot()}) + '\n')
+    _jsonl.flush()
+    # Written beside the target and renamed so the collector never reads a partial file
+    prom_path = _output_dir / PROM_FILE
+    tmp_path = prom_path.with_suffix('.prom.tmp')
+    tmp_path.write_text(prometheus_text())
+    os.replace(tmp_path, prom_path)
+
+
+if os.getenv('PARLIAMENT_METRICS_DIR'):
+    enable(os.environ['PARLIAMENT_METRICS_DIR'])
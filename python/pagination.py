@@ -0,0 +1,190 @@
+"""
+Keyset pagination for the list feeds.
+
+section_list_keys holds one row per section per list feed (questions,
+motions, clarifications) with the feed's sort key: sitting date
+(newest first), section order, then section ID. Its primary key is that
+sort order, so a page is a single index seek from the previous page's
+last key instead of an OFFSET scan over every earlier row. Sittings page
+on their unique date and bills on (first_reading_date, id), both indexed
+in schema.sql.
+
+Ingest calls refresh_for_sittings() for the sittings it wrote (the first
+call on an older database backfills every key); rows for deleted
+sections go with them via ON DELETE CASCADE. Run directly to rebuild
+every key.
+"""
+import json
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import db_sqlite as db
+
+# Which sections belong to each list feed; the shards (export_lists_sqlite.py) use it too
+SECTION_FEEDS = {
+    'questions': "sec.section_type IN ('OA', 'WA', 'WANA')",
+    'motions': "sec.category IN ('motion', 'adjournment_motion')",
+    'clarifications': "sec.category = 'clarification'",
+}
+
+SECTION_COLUMNS = '''
+    sec.id,
+    sec.sitting_id,
+    k.sitting_date,
+    sec.section_type,
+    sec.section_title,
+    sec.category,
+    sec.ministry_id,
+    k.section_order'''
+
+Cursor = Optional[Tuple]
+
+
+def _refresh_keys(where: str, params: Sequence):
+    """Recompute keys for the sections matching `where` (on sections sec)."""
+    conn = db.get_connection()
+    conn.execute(
+        f'DELETE FROM section_list_keys WHERE section_id IN (SELECT sec.id FROM sections sec WHERE {where})',
+        params
+    )
+    for feed, condition in SECTION_FEEDS.items():
+        conn.execute(
+            f'''INSERT INTO section_list_keys (feed, sitting_date, section_order, section_id)
+                SELECT ?, s.date, COALESCE(sec.section_order, 0), sec.id
+                FROM sections sec
+                JOIN sittings s ON sec.sitting_id = s.id
+                WHERE {condition} AND {where}''',
+            (feed, *params)
+        )
+    conn.commit()
+
+
+def refresh_for_sittings(sitting_ids):
+    """Recompute the sort keys of every section in the given sittings."""
+    conn = db.get_connection()
+    if not conn.execute('SELECT 1 FROM section_list_keys LIMIT 1').fetchone():
+        # First run against a database that predates the table: backfill everything
+        rebuild_all()
+        return
+    _refresh_keys('sec.sitting_id IN (SELECT value FROM json_each(?))', (json.dumps(list(sitting_ids)),))
+
+
+def refresh_for_sections(section_ids):
+    """Recompute the sort keys of the given sections, e.g. after they are reclassified."""
+    _refresh_keys('sec.id IN (SELECT value FROM json_each(?))', (json.dumps(list(section_ids)),))
+
+
+def rebuild_all():
+    db.get_connection().execute('DELETE FROM section_list_keys')
+    _refresh_keys('1', ())
+
+
+def fetch_section_page(feed: str, limit: int, after: Cursor = None) -> Tuple[List, Cursor]:
+    """
+    One page of a section feed in list order, starting after the given
+    cursor (the first page if None). Returns (rows, cursor for the next
+    page); the cursor is None once the feed is exhausted.
+    """
+    if feed not in SECTION_FEEDS:
+        raise ValueError(f"Unknown section feed: {feed}")
+    conn = db.get_connection()
+    query = f'''SELECT {SECTION_COLUMNS}
+                FROM section_list_keys k
+                JOIN sections sec ON sec.id = k.section_id
+                WHERE k.feed = ? AND {{where}}
+                ORDER BY k.sitting_date DESC, k.section_order, k.section_id
+                LIMIT ?'''
+
+    if after is None:
+        rows = conn.execute(query.format(where='1'), (feed, limit)).fetchall()
+    else:
+        # Dates run newest first but order within a date runs forwards, so the
+        # rest of the cursor's sitting and the older sittings are two seeks
+        sitting_date, section_order, section_id = after
+        rows = conn.execute(
+            query.format(where='k.sitting_date = ? AND (k.section_order, k.section_id) > (?, ?)'),
+            (feed, sitting_date, section_order, section_id, limit)
+        ).fetchall()
+        if len(rows) < limit:
+            rows += conn.execute(
+                query.format(where='k.sitting_date < ?'),
+                (feed, sitting_date, limit - len(rows))
+            ).fetchall()
+
+    if len(rows) < limit:
+        return rows, None
+    last = rows[-1]
+    return rows, (last['sitting_date'], last['section_order'], last['id'])
+
+
+def fetch_sitting_page(limit: int, after: Cursor = None) -> Tuple[List, Cursor]:
+    """One page of sittings, newest first, with their section counts."""
+    conn = db.get_connection()
+    rows = conn.execute(
+        f'''SELECT s.id, s.date, s.parliament, s.session_no, s.sitting_no,
+                   (SELECT COUNT(*) FROM sections sec WHERE sec.sitting_id = s.id) AS section_count
+            FROM sittings s
+            WHERE {'s.date < ?' if after else '1'}
+            ORDER BY s.date DESC
+            LIMIT ?''',
+        (*(after or ()), limit)
+    ).fetchall()
+    if len(rows) < limit:
+        return rows, None
+    return rows, (rows[-1]['date'],)
+
+
+def fetch_bill_page(limit: int, after: Cursor = None) -> Tuple[List, Cursor]:
+    """One page of bills, newest first reading first, undated bills last."""
+    conn = db.get_connection()
+    query = '''SELECT b.id, b.title, b.ministry_id, b.first_reading_date
+               FROM bills b
+               WHERE {where}
+               ORDER BY b.first_reading_date DESC, b.id DESC
+               LIMIT ?'''
+
+    if after is None:
+        rows = conn.execute(query.format(where='1'), (limit,)).fetchall()
+    elif after[0] is None:
+        rows = conn.execute(
+            query.format(where='b.first_reading_date IS NULL AND b.id < ?'), (after[1], limit)
+        ).fetchall()
+    else:
+        # NULL dates sort last in descending order, so they follow every dated bill
+        rows = conn.execute(
+            query.format(where='(b.first_reading_date, b.id) < (?, ?)'), (*after, limit)
+        ).fetchall()
+        if len(rows) < limit:
+            rows += conn.execute(
+                query.format(where='b.first_reading_date IS NULL'), (limit - len(rows),)
+            ).fetchall()
+
+    if len(rows) < limit:
+        return rows, None
+    return rows, (rows[-1]['first_reading_date'], rows[-1]['id'])
+
+
+def fetch_page(feed: str, limit: int, after: Cursor = None) -> Tuple[List, Cursor]:
+    if feed == 'sittings':
+        return fetch_sitting_page(limit, after)
+    if feed == 'bills':
+        return fetch_bill_page(limit, after)
+    return fetch_section_page(feed, limit, after)
+
+
+def iter_pages(feed: str, page_size: int) -> Iterator[List]:
+    """Yield every page of a feed in list order."""
+    cursor = None
+    while True:
+        rows, cursor = fetch_page(feed, page_size, cursor)
+        if rows:
+            yield rows
+        if cursor is None:
+            return
+
+
+if __name__ == "__main__":
+    db.init_db()
+    rebuild_all()
+    count = db.get_connection().execute('SELECT COUNT(*) FROM section_list_keys').fetchone()[0]
+    print(f"Rebuilt {count} section list key(s)")
+    db.close_connection()
@@ -1,8 +1,10 @@
 import re
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional, Set
-from util import parse_mp_name, extract_name_from_speaker_text, clean_html_for_display, strip_all_html, extract_name_from_br_text
+import metrics
+from util import parse_mp_name, extract_name_from_speaker_text, clean_html_for_display, strip_all_html, extract_name_from_br_text, split_transcript_turns
 
 # OA: Oral Answer to Oral Question
 # WANA: Written Answer to Oral Question not answered by end of Question Time
@@ -32,12 +34,71 @@ PROCEDURAL_KEYWORDS = [
     'permission to members',
 ]
 
+def categorize_section(title: str, section_type: str, report_type: str = '') -> str:
+    """Assign a section's category from its title, type and the API's report type."""
+    if 'clarification' in title.lower() and (section_type == 'OS' or section_type == 'WS'):
+        return 'clarification'
+    if report_type == 'Matter Raised On Adjournment Motion' and section_type == 'OS':
+        return 'adjournment_motion'
+    if section_type in QUESTION_SECTION_TYPES:
+        return 'question'
+    if section_type in BILL_TYPES:
+        return 'bill'
+    if section_type in STATEMENT_TYPES:
+        return 'motion' # Renamed from statement to motion
+    return 'other'
+
+
+def section_key(section: Dict) -> Tuple[str, str]:
+    """The title and type under which raw sections are merged."""
+    return section.get('title', 'Untitled'), section.get('sectionType')
+
+
+def section_merge_plan(raw_sections: Iterable[Dict]) -> Dict[Tuple[str, str], int]:
+    """Index of the last raw section of each merge group, where the group is complete."""
+    return {section_key(section): idx for idx, section in enumerate(raw_sections)}
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+class _RecordMapping:
+    """Item access to a record's fields, for code written against the dicts the records replaced."""
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+
+# Names, constituencies and appointments repeat in every sitting's attendance
+# and speaker lists, so one copy of each is shared through sys.intern(). Titles
+# and content are not interned: they rarely repeat, and interned strings are
+# never freed.
+
+@dataclass(slots=True, eq=False, repr=False)
 class MP:
-    def __init__(self, name: str, constituency: str, appointment: str = None):
-        self.name = name
-        self.constituency = constituency
-        self.appointment = appointment
-    
+    name: str
+    constituency: str
+    appointment: str = None
+
+    def __post_init__(self):
+        self.name = _intern(self.name)
+        self.constituency = _intern(self.constituency)
+        self.appointment = _intern(self.appointment)
+
     def get_details(self):
         return (self.name, self.constituency, self.appointment)
 
@@ -45,31 +106,67 @@ class MP:
         return f"MP ({self.name}, {self.constituency}, {self.appointment})"
 
 
+@dataclass(slots=True, eq=False)
+class Section(_RecordMapping):
+    """A parsed section, merged from every raw section with its title and type."""
+    section_type: str
+    category: str
+    title: str
+    speakers: List[MP]
+    content_html: str
+    content_plain: str
+    order: int
+    source_url: Optional[str] = None
+    turns: List[Dict] = field(default_factory=list)  # Set at ingest, see get_section_turns
+
+    def __post_init__(self):
+        self.section_type = sys.intern(self.section_type)
+        self.category = sys.intern(self.category)
+
+
+@dataclass(slots=True)
+class SittingMetadata(_RecordMapping):
+    date: str
+    sitting_no: Optional[int] = None
+    parliament: Optional[int] = None
+    session_no: Optional[int] = None
+    volume_no: Optional[int] = None
+
+
 class ParliamentSitting:
-    metadata: dict
+    metadata: SittingMetadata
     present_members: List[MP]
     absent_members: List[MP]
-    sections: List[Dict]
+    sections: List[Section]
 
     def __init__(self, date: str):
-        self.metadata = {"date": date, "sitting_no": None, "parliament": None, "session_no": None, "volume_no": None}
+        self.metadata = SittingMetadata(date)
         self.present_members = []
         self.absent_members = []
         self.sections = []
         self._mp_name_index: Dict[str, MP] = {}  # Cache for name lookups
+        self._section_source = None
+        self._merge_plan = None
 
     def set_metadata(self, metadata: Dict):
-        self.metadata["sitting_no"] = metadata["sitting_no"]
-        self.metadata["parliament"] = metadata["parliament"]
-        self.metadata["session_no"] = metadata["session_no"]
-        self.metadata["volume_no"] = metadata["volume_no"]
+        self.metadata.sitting_no = metadata["sitting_no"]
+        self.metadata.parliament = metadata["parliament"]
+        self.metadata.session_no = metadata["session_no"]
+        self.metadata.volume_no = metadata["volume_no"]
 
     def set_attendance(self, attendanceList: List[Dict]):
         present = filter(lambda x: x['attendance'], attendanceList)
         absent = filter(lambda x: not x['attendance'], attendanceList)
-        self.present_members = list(map(lambda x: MP(*parse_mp_name(x['mpName'])), present))
-        self.absent_members = list(map(lambda x: MP(*parse_mp_name(x['mpName'])), absent))
-        
+        self.set_members(
+            list(map(lambda x: MP(*parse_mp_name(x['mpName'])), present)),
+            list(map(lambda x: MP(*parse_mp_name(x['mpName'])), absent)),
+        )
+
+    def set_members(self, present: List[MP], absent: List[MP]):
+        """Set the attendance lists directly, e.g. from stored attendance."""
+        self.present_members = present
+        self.absent_members = absent
+
         # Build name index for fast lookups
         self._build_name_index()
     
@@ -122,6 +219,23 @@ class ParliamentSitting:
         # No match found - could be external speaker or parsing issue
         return None
 
+    def get_section_turns(self, section: Dict) -> List[Dict]:
+        """
+        Split a section's display HTML into ordered transcript rows
+        (see split_transcript_turns) and resolve each speech turn's
+        speaker to an MP under the 'mp' key (None if unmatched).
+        """
+        with metrics.span('split_turns'):
+            turns = split_transcript_turns(section.get('content_html', ''))
+        with metrics.span('speaker_matching'):
+            matched = {}
+            for turn in turns:
+                label = turn['speaker_label']
+                if label and label not in matched:
+                    matched[label] = self.match_speaker(label)
+                turn['mp'] = matched.get(label) if label else None
+        return turns
+
     def set_attendance_from_html(self, html_content: str):
         """Parse attendance from 'PRESENT:' and 'ABSENT:' sections in HTML."""
         
@@ -199,123 +313,184 @@ class ParliamentSitting:
         
         return speakers
 
+    def match_section_speakers(self, content_html: str, category: str) -> List[MP]:
+        """Match the bold speaker names in a section's HTML to MPs in attendance."""
+        matched_speakers = []
+
+        for speaker_text in self._extract_speakers_from_html(content_html):
+            mp = self.match_speaker(speaker_text)
+            if mp:
+                # Avoid duplicates and Speaker (who is not involved in PQs)
+                if mp in matched_speakers or mp.appointment == "Speaker":
+                    continue
+
+                # EXCLUSION: For Adjournment Motions, exclude Leader/Deputy Leader of the House
+                # because they only say "General/Procedural" lines like "I beg to move".
+                if category == 'adjournment_motion':
+                    appt_lower = (mp.appointment or "").lower()
+                    if "leader of the house" in appt_lower:
+                        continue
+
+                matched_speakers.append(mp)
+
+        return matched_speakers
+
     def set_sections(self, raw_sections: List[Dict]):
         """
         Parse raw section data and store as Section objects with matched speakers.
         Processes questions (OA, WA, WANA), bills (BI, BP), and statements (OS, WS).
         Filters out procedural/short content for statements.
         """
-        for idx, section in enumerate(raw_sections):
-            section_type = section.get('sectionType')
-            if section_type not in ALL_VALID_TYPES:
+        self.sections.extend(sorted(self.merge_sections(raw_sections), key=lambda s: s.order))
+
+    def set_section_source(self, open_sections: Callable[[], Iterator[Dict]], merge_plan: Dict):
+        """
+        Read sections lazily: open_sections() returns an iterator over the
+        raw sections and merge_plan is their section_merge_plan(). The source
+        is consumed by the first stream_sections() or get_sections() call.
+        """
+        self._section_source = open_sections
+        self._merge_plan = merge_plan
+
+    def stream_sections(self) -> Iterator[Section]:
+        """
+        Yield the sitting's sections in the order a writer needs them, first
+        readings (BI) before second readings (BP) of the same bill. From a
+        section source only the merge groups still open are held in memory.
+        """
+        if self._section_source is None:
+            yield from sorted(self.sections, key=lambda s: ({'BI': 0, 'BP': 2}.get(s.section_type, 1), s.order))
+            return
+        open_sections, self._section_source = self._section_source, None
+        yield from self.merge_sections(open_sections(), self._merge_plan)
+
+    def merge_sections(self, raw_sections: Iterable[Dict], merge_plan: Dict = None) -> Iterator[Section]:
+        """
+        Parse raw sections, merging those with the same title and type into
+        the first, and yield each merged section once the last raw section
+        of its group has been read. merge_plan gives that last index per
+        group (see section_merge_plan); without one, raw_sections is read
+        into a list to compute it.
+
+        Second readings are held back until any first reading of the same
+        bill title in the sitting has been yielded, so the bill exists
+        before a writer looks it up.
+        """
+        if merge_plan is None:
+            raw_sections = list(raw_sections)
+            merge_plan = section_merge_plan(raw_sections)
+
+        pending_bills = {title.strip() for title, section_type in merge_plan if section_type == 'BI'}
+        held_readings: Dict[str, List[Section]] = {}
+        open_groups: Dict[Tuple[str, str], Section] = {}
+
+        for idx, raw_section in enumerate(raw_sections):
+            key = section_key(raw_section)
+            section = self._parse_section(idx, raw_section)
+            if section is not None:
+                if key in open_groups:
+                    self._merge_section(open_groups[key], section)
+                else:
+                    open_groups[key] = section
+
+            if merge_plan.get(key, idx) > idx:
                 continue
-            
-            title = section.get('title', 'Untitled')
-            # Determine category early for logic checks
-            report_type = section.get('reportType', '')
-            
-            if 'clarification' in title.lower() and (section_type == 'OS' or section_type == 'WS'):
-                category = 'clarification'
-            elif report_type == 'Matter Raised On Adjournment Motion' and section_type == 'OS':
-                category = 'adjournment_motion'
-            elif section_type in QUESTION_SECTION_TYPES:
-                category = 'question'
-            elif section_type in BILL_TYPES:
-                category = 'bill'
-            elif section_type in STATEMENT_TYPES:
-                category = 'motion' # Renamed from statement to motion
-            else:
-                category = 'other'
-
-            content_html = section.get('content', '')
-            if not content_html:
+
+            # That was the group's last part, so it is complete
+            title, section_type = key
+            ready = [open_groups.pop(key)] if key in open_groups else []
+            if section_type == 'BP' and title.strip() in pending_bills:
+                held_readings.setdefault(title.strip(), []).extend(ready)
                 continue
-            
-            # Clean content
+            if section_type == 'BI':
+                pending_bills.discard(title.strip())
+                ready.extend(held_readings.pop(title.strip(), []))
+            yield from ready
+
+        # Left over only if merge_plan does not describe raw_sections
+        leftovers = list(open_groups.values()) + [s for held in held_readings.values() for s in held]
+        yield from sorted(leftovers, key=lambda s: s.order)
+
+    def _parse_section(self, idx: int, section: Dict) -> Optional[Section]:
+        """Clean and match one raw section, None if it is filtered out."""
+        section_type = section.get('sectionType')
+        if section_type not in ALL_VALID_TYPES:
+            return None
+
+        title = section.get('title', 'Untitled')
+        # Determine category early for logic checks
+        category = categorize_section(title, section_type, section.get('reportType', ''))
+
+        content_html = section.get('content', '')
+        if not content_html:
+            return None
+
+        # Clean content
+        with metrics.span('clean_html'):
             content_display = clean_html_for_display(content_html)
             content_plain = strip_all_html(content_html)
-            
-            # For statements (OS, WS), filter out procedural/short content
-            if section_type in STATEMENT_TYPES:
-                # Check minimum length (except if it's explicitly adjournment motion)
-                is_adjournment = category == 'adjournment_motion'
-                
-                if not is_adjournment and len(content_plain) < MIN_CONTENT_LENGTH:
-                    continue
-                
-                # Check for procedural keywords in title
-                title_lower = title.lower()
-                extended_keywords = PROCEDURAL_KEYWORDS + [
-                    'administration of oaths',
-                    'personal explanation',
-                    'time limit',
-                    'commencement of business',
-                    'order of business',
-                    'adjournment' # careful with adjournment *motion* vs adjournment of sitting
-                ]
-                
-                # Exclude if meaningful
-                if not is_adjournment and any(keyword in title_lower for keyword in extended_keywords):
-                     continue
-            
-            # Extract and match speakers
-            raw_speakers = self._extract_speakers_from_html(content_html)
-            matched_speakers = []
-            
-            for speaker_text in raw_speakers:
-                mp = self.match_speaker(speaker_text)
-                if mp:
-                    # Avoid duplicates and Speaker (who is not involved in PQs)
-                    if mp in matched_speakers or mp.appointment == "Speaker":
-                        continue
-                        
-                    # EXCLUSION: For Adjournment Motions, exclude Leader/Deputy Leader of the House
-                    # because they only say "General/Procedural" lines like "I beg to move".
-                    if category == 'adjournment_motion':
-                        appt_lower = (mp.appointment or "").lower()
-                        if "leader of the house" in appt_lower:
-                            continue
-                            
-                    matched_speakers.append(mp)
-            
-            # Construct source URL
-            section_id = section.get('sectionId')
-            source_url = f"https://sprs.parl.gov.sg/search/sprs3topic?reportid={section_id}" if section_id else None
-            
-            
-            # MERGING LOGIC: Check if we already have a section with this title AND same type
-            existing_index = next((i for i, s in enumerate(self.sections) if s['title'] == title and s['section_type'] == section_type), None)
-            
-            if existing_index is not None:
-                # Merge into existing section
-                existing_section = self.sections[existing_index]
-                existing_section['content_html'] += "<br><hr><br>" + content_display
-                existing_section['content_plain'] += "\n\n" + content_plain
-                
-                # Merge speakers (avoid duplicates)
-                current_speaker_names = {s.name for s in existing_section['speakers']}
-                for mp in matched_speakers:
-                    if mp.name not in current_speaker_names:
-                        existing_section['speakers'].append(mp)
-                        current_speaker_names.add(mp.name)
-                        
-                # Keep the original order/id/url (or update if needed, but keeping separate is complex)
-                # We assume the first occurrence is the main one.
-            else:
-                # Add new section
-                self.sections.append({
-                    "section_type": section_type,
-                    "category": category,
-                    "title": title,
-                    "speakers": matched_speakers,
-                    "content_html": content_display,
-                    "content_plain": content_plain,
-                    "order": idx,
-                    "source_url": source_url
-                })
 
+        # For statements (OS, WS), filter out procedural/short content
+        if section_type in STATEMENT_TYPES:
+            # Check minimum length (except if it's explicitly adjournment motion)
+            is_adjournment = category == 'adjournment_motion'
+
+            if not is_adjournment and len(content_plain) < MIN_CONTENT_LENGTH:
+                return None
+
+            # Check for procedural keywords in title
+            title_lower = title.lower()
+            extended_keywords = PROCEDURAL_KEYWORDS + [
+                'administration of oaths',
+                'personal explanation',
+                'time limit',
+                'commencement of business',
+                'order of business',
+                'adjournment' # careful with adjournment *motion* vs adjournment of sitting
+            ]
+
+            # Exclude if meaningful
+            if not is_adjournment and any(keyword in title_lower for keyword in extended_keywords):
+                return None
+
+        # Extract and match speakers
+        with metrics.span('speaker_matching'):
+            matched_speakers = self.match_section_speakers(content_html, category)
+
+        # Construct source URL
+        section_id = section.get('sectionId')
+        source_url = f"https://sprs.parl.gov.sg/search/sprs3topic?reportid={section_id}" if section_id else None
+
+        return Section(
+            section_type=section_type,
+            category=category,
+            title=title,
+            speakers=matched_speakers,
+            content_html=content_display,
+            content_plain=content_plain,
+            order=idx,
+            source_url=source_url,
+        )
+
+    @staticmethod
+    def _merge_section(existing_section: Section, section: Section):
+        """Append a later part of a section to the first part with its title and type."""
+        existing_section.content_html += "<br><hr><br>" + section.content_html
+        existing_section.content_plain += "\n\n" + section.content_plain
+
+        # Merge speakers (avoid duplicates)
+        current_speaker_names = {s.name for s in existing_section.speakers}
+        for mp in section.speakers:
+            if mp.name not in current_speaker_names:
+                existing_section.speakers.append(mp)
+                current_speaker_names.add(mp.name)
+
+        # Keep the original order/id/url (or update if needed, but keeping separate is complex)
+        # We assume the first occurrence is the main one.
 
     def get_sections(self):
+        if self._section_source is not None:
+            self.sections = sorted(self.stream_sections(), key=lambda s: s.order)
         return self.sections
     
     def get_metadata(self):
@@ -331,11 +506,12 @@ class ParliamentSitting:
             print(mp.get_details())
 
     def print_sections(self):
-        print(f"\nSections for sitting on {self.metadata['date']}:")
-        print(f"Total: {len(self.sections)} question sections\n")
-        for section in self.sections:
-            print(f"--- {section['section_type']}: {section['title'][:60]}... ---")
-            print(f"Speakers ({len(section['speakers'])}):") 
-            for speaker in section['speakers']:
+        print(f"\nSections for sitting on {self.metadata.date}:")
+        sections = self.get_sections()
+        print(f"Total: {len(sections)} question sections\n")
+        for section in sections:
+            print(f"--- {section.section_type}: {section.title[:60]}... ---")
+            print(f"Speakers ({len(section.speakers)}):") 
+            for speaker in section.speakers:
                 print(f"  - {speaker.name} ({speaker.constituency})")
             print()
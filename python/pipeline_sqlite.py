@@ -0,0 +1,109 @@
+"""
+Run ingest, duplicate cleanup, the member graph and sitting summaries in
+one process.
+
+The stages share one database connection, one schema initialisation, one
+Hansard HTTP session, one LLM provider and one event loop, instead of
+paying interpreter start-up, imports and init_db() once per script. The
+sittings ingested by the first stage are passed straight to the later
+stages rather than re-selected by date. A per-stage timing
+summary is logged at the end, and each stage is recorded in the
+pipeline_runs ledger (see run_ledger.py). --profile-memory adds a memory
+report per stage and sitting (see memory_profile.py).
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from contextlib import contextmanager
+
+from batch_process_sqlite import ingest_range
+from cleanup_duplicates_sqlite import cleanup_sittings
+import memory_profile
+import run_ledger
+from db_sqlite import close_connection, init_db
+from generate_summaries_sqlite import summarise_sittings
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """Records the wall time of each named stage."""
+
+    def __init__(self):
+        self.timings = []
+
+    @contextmanager
+    def stage(self, name):
+        logger.info(f"== {name} ==")
+        start = time.perf_counter()
+        try:
+            with run_ledger.stage(name):
+                yield
+        finally:
+            self.timings.append((name, time.perf_counter() - start))
+
+    def report(self):
+        total = sum(seconds for _, seconds in self.timings)
+        width = max(len(name) for name, _ in self.timings)
+        lines = [f"{name:<{width}}  {seconds:8.2f}s" for name, seconds in self.timings]
+        lines.append(f"{'total':<{width}}  {total:8.2f}s")
+        return "\n".join(lines)
+
+
+async def run_pipeline(start_date_str, end_date_str, keep_newest=False, only_blanks=False,
+                       skip_summaries=False):
+    timer = StageTimer()
+
+    with timer.stage('init'):
+        init_db()
+
+    with timer.stage('ingest'):
+        sitting_ids = ingest_range(start_date_str, end_date_str)
+    logger.info(f"Ingested {len(sitting_ids)} sitting(s)")
+
+    if sitting_ids:
+        with timer.stage('dedupe'):
+            cleanup_sittings(sitting_ids, keep_newest)
+
+        # The graph only needs speakers, so it is rebuilt before the slow summary stage
+        with timer.stage('member_graph'):
+            from member_graph_sqlite import sitting_scopes, update_member_graph
+            update_member_graph(sitting_scopes(sitting_ids))
+
+        if skip_summaries:
+            logger.info("Skipping sitting summaries (--skip-summaries).")
+        else:
+            with timer.stage('summarise'):
+                await summarise_sittings(sitting_ids, only_blanks)
+
+    close_connection()
+    logger.info("Stage timings:\n" + timer.report())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: uv run pipeline_sqlite.py START_DATE [END_DATE] [--keep-newest] [--only-blank] [--skip-summaries] [--profile-memory]")
+        print("Example: uv run pipeline_sqlite.py 14-01-2026 --keep-newest --only-blank")
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    dates = [arg for arg in args if not arg.startswith("--")]
+
+    if not dates:
+        print("Error: Start date required")
+        sys.exit(1)
+
+    start = dates[0]
+    end = dates[1] if len(dates) > 1 else start
+
+    if "--profile-memory" in args:
+        memory_profile.enable()
+
+    asyncio.run(run_pipeline(
+        start, end,
+        keep_newest="--keep-newest" in args,
+        only_blanks="--only-blank" in args,
+        skip_summaries="--skip-summaries" in args,
+    ))
@@ -0,0 +1,246 @@
+"""
+Token-aware prompt construction for summary generation.
+
+Cleans procedural boilerplate out of section text, counts tokens with a
+cheap subword approximation, packs short sections into multi-item
+requests, and splits long bill debates into map-reduce chunks.
+"""
+import json
+import logging
+import re
+from typing import Dict, List, Optional
+
+from prompts import (
+    BILL_CHUNK_PROMPT,
+    BILL_PROMPT,
+    MULTI_SECTION_PROMPT,
+    PQ_PROMPT,
+    SECTION_PROMPT,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sections below this size are packed together into multi-item requests
+PACK_MAX_ITEM_TOKENS = 1200
+# Total section text allowed in one packed request
+PACK_TOKEN_BUDGET = 6000
+PACK_MAX_ITEMS = 8
+
+# Upper bound on section text sent in a single-section request
+MAX_SECTION_TOKENS = 5000
+
+# Bill debates above this size are summarised chunk by chunk, then reduced.
+# Debates too long for MAX_BILL_CHUNKS chunks get proportionally larger chunks
+BILL_CHUNK_TOKENS = 5000
+MAX_BILL_CHUNKS = 8
+
+# Approximates BPE tokenisation: short words are one token, long words are
+# split into 6-character pieces, and each punctuation mark is its own token.
+_TOKEN_RE = re.compile(r"\w{1,6}|[^\w\s]")
+
+_PROC_BLOCK_RE = re.compile(r"\[\(proc text\).*?\(proc text\)\]", re.DOTALL)
+_PROC_MARKER_RE = re.compile(r"\[?\(proc text\)\]?")
+_COLUMN_RE = re.compile(r"\bColumn:\s*\d+\b")
+
+# Procedural lines that carry no substance for a summary
+BOILERPLATE_PATTERNS = [
+    r"Question put, and agreed to\.?",
+    r"Question put\.?",
+    r"Bill accordingly read a [A-Za-z]+ time[^.]*\.",
+    r"Bill considered in Committee[^.]*\.",
+    r"The House immediately resolved itself into a Committee on the Bill\.?",
+    r"Bill reported without amendment[^.]*\.",
+    r"(?:Mr|Madam|Mdm) (?:Speaker|Deputy Speaker|Chairman), (?:Sir, )?I beg to move\.?",
+    r"I beg to move\.?",
+    r"Debate resumed\.?",
+    r"Thereupon (?:Mr|Madam|Mdm) (?:Speaker|Deputy Speaker) left the Chair[^.]*\.",
+    r"Sitting accordingly suspended[^.]*\.",
+    r"Sitting resumed[^.]*\.",
+]
+_BOILERPLATE_RE = re.compile("|".join(f"(?:{p})" for p in BOILERPLATE_PATTERNS))
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of model tokens in a piece of text."""
+    if not text:
+        return 0
+    return len(_TOKEN_RE.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text at the character offset where max_tokens is reached."""
+    for i, match in enumerate(_TOKEN_RE.finditer(text)):
+        if i == max_tokens:
+            return text[:match.start()].rstrip()
+    return text
+
+
+def clean_for_prompt(text: str) -> str:
+    """
+    Remove content that costs tokens without helping the summary:
+    procedural blocks, stray "(proc text)" markers, column references,
+    boilerplate motions and fragments repeated by section merging.
+    """
+    if not text:
+        return ""
+
+    clean = _PROC_BLOCK_RE.sub(" ", text)
+    clean = _PROC_MARKER_RE.sub(" ", clean)
+    clean = _COLUMN_RE.sub(" ", clean)
+    clean = _BOILERPLATE_RE.sub(" ", clean)
+
+    # Merged sections are joined by blank lines; drop repeated fragments
+    fragments = []
+    seen = set()
+    for fragment in clean.split("\n\n"):
+        fragment = re.sub(r"[ \t\xa0]+", " ", fragment).strip()
+        key = fragment.lower()
+        if not fragment or key in seen:
+            continue
+        seen.add(key)
+        fragments.append(fragment)
+
+    return "\n\n".join(fragments)
+
+
+def split_at_tokens(text: str, max_tokens: int) -> List[str]:
+    """Cut text into consecutive pieces of at most max_tokens each, losing nothing."""
+    offsets = [match.start() for match in _TOKEN_RE.finditer(text)][max_tokens::max_tokens]
+    bounds = [0, *offsets, len(text)]
+    return [text[start:end].strip() for start, end in zip(bounds, bounds[1:])]
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text on fragment/sentence boundaries into chunks of at most
+    max_tokens. A sentence longer than that is cut into several pieces.
+    """
+    pieces = []
+    for fragment in text.split("\n\n"):
+        if count_tokens(fragment) <= max_tokens:
+            pieces.append(fragment)
+            continue
+        for sentence in re.split(r"(?<=[.?!])\s+", fragment):
+            if count_tokens(sentence) <= max_tokens:
+                pieces.append(sentence)
+            else:
+                pieces.extend(split_at_tokens(sentence, max_tokens))
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for piece in pieces:
+        tokens = count_tokens(piece)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current = []
+            current_tokens = 0
+        current.append(piece)
+        current_tokens += tokens
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def build_section_prompt(section: Dict) -> str:
+    """Single-section prompt with cleaned, token-bounded text."""
+    template = PQ_PROMPT if section['category'] == 'question' else SECTION_PROMPT
+    text = truncate_to_tokens(clean_for_prompt(section['content_plain']), MAX_SECTION_TOKENS)
+    return template.format(title=section['section_title'], text=text)
+
+
+def pack_sections(sections: List[Dict]) -> List[List[Dict]]:
+    """
+    Group sections into request batches. Long sections get a batch of
+    their own; short ones are packed up to PACK_TOKEN_BUDGET / PACK_MAX_ITEMS.
+    Each section dict gains a 'prompt_text' key with its cleaned text.
+    """
+    singles = []
+    packs = []
+    current = []
+    current_tokens = 0
+
+    for section in sections:
+        text = clean_for_prompt(section['content_plain'])
+        tokens = count_tokens(text)
+        section['prompt_text'] = text
+
+        if tokens > PACK_MAX_ITEM_TOKENS:
+            singles.append([section])
+            continue
+
+        if current and (current_tokens + tokens > PACK_TOKEN_BUDGET or len(current) >= PACK_MAX_ITEMS):
+            packs.append(current)
+            current = []
+            current_tokens = 0
+        current.append(section)
+        current_tokens += tokens
+
+    if current:
+        packs.append(current)
+
+    return singles + packs
+
+
+def build_multi_section_prompt(batch: List[Dict]) -> str:
+    """Prompt asking for one summary per item, returned as a JSON object keyed by item number."""
+    items = []
+    for i, section in enumerate(batch, start=1):
+        kind = 'Parliamentary Question' if section['category'] == 'question' else 'Section'
+        items.append(
+            f"### Item {i} ({kind})\n"
+            f"Title: {section['section_title']}\n"
+            f"Content:\n{section['prompt_text']}"
+        )
+    return MULTI_SECTION_PROMPT.format(count=len(batch), items="\n\n".join(items))
+
+
+def parse_multi_section_response(response: str, batch: List[Dict]) -> Dict[str, str]:
+    """Map section IDs to summaries from a multi-item JSON response. Missing items are omitted."""
+    if not response:
+        return {}
+
+    match = re.search(r"\{.*\}", response, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        parsed = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+
+    summaries = {}
+    for i, section in enumerate(batch, start=1):
+        summary = parsed.get(str(i))
+        if isinstance(summary, str) and summary.strip():
+            summaries[section['id']] = summary.strip()
+    return summaries
+
+
+def build_bill_prompts(title: str, text: str) -> Optional[List[str]]:
+    """
+    Map-stage prompts for a bill debate, or None if the cleaned text fits in
+    a single BILL_PROMPT (use build_bill_prompt in that case).
+    """
+    tokens = count_tokens(text)
+    if tokens <= BILL_CHUNK_TOKENS:
+        return None
+    chunk_tokens = max(BILL_CHUNK_TOKENS, -(-tokens // MAX_BILL_CHUNKS))
+    chunks = split_into_chunks(text, chunk_tokens)
+    # Splitting on boundaries leaves chunks short of the limit, so there can be a few too many
+    while len(chunks) > MAX_BILL_CHUNKS:
+        chunk_tokens += chunk_tokens // 4
+        chunks = split_into_chunks(text, chunk_tokens)
+    if chunk_tokens > BILL_CHUNK_TOKENS:
+        logger.info(f"Bill {title} has {tokens} tokens; using {len(chunks)} chunks of up to {chunk_tokens}")
+    return [
+        BILL_CHUNK_PROMPT.format(title=title, part=i, total=len(chunks), text=chunk)
+        for i, chunk in enumerate(chunks, start=1)
+    ]
+
+
+def build_bill_prompt(title: str, text: str) -> str:
+    """Reduce-stage (or single-pass) bill prompt."""
+    return BILL_PROMPT.format(title=title, text=truncate_to_tokens(text, BILL_CHUNK_TOKENS * 2))
@@ -78,4 +78,42 @@ MEMBER_PROMPT = """Based on the recent parliamentary questions/statements by {na
     6. Refer to all office holders (Ministers, Ministers of State, Parliamentary Secretaries etc.) by their full titles. For example, Senior 
     Minister of State for Health and Manpower Koh Poh Koon should be referred to as Senior Minister of State Koh Poh Koon.
     7. DO NOT include any information that is not included in the text, such as any comments or descriptions of instructions from this prompt.
-    """
\ No newline at end of file
+    """
+# one single-paragraph summary per item, returned as JSON
+MULTI_SECTION_PROMPT = """You are summarizing {count} separate sections from the Singapore Parliament hansard.
+    
+    {items}
+    
+    For EACH item, write a concise 5-line, single paragraph summary. Summarize each item independently.
+    - For a Parliamentary Question, begin with "This question concerns...". Mention the question raised by the MP and the key points 
+    of the Minister's response. Focus on facts and policy details.
+    - For any other section, summarize the key points discussed, arguments raised, and any conclusions or decisions reached. 
+    Begin with "This motion/statement/clarification/etc. concerns..."
+
+    Return strictly a JSON object mapping each item number (as a string) to its summary, for example:
+    {{"1": "This question concerns...", "2": "This motion concerns..."}}
+
+    Rules:
+    1. Refer to all office holders (Ministers, Ministers of State, Parliamentary Secretaries etc.) by their full titles. For example, Senior 
+    Minister of State for Health and Manpower Koh Poh Koon should be referred to as Senior Minister of State Koh Poh Koon.
+    2. DO NOT include any information that is not included in the text, such as any comments or descriptions of instructions from this prompt.
+    3. Do not include any text outside the JSON object.
+    """
+
+# map stage for long bill debates; the notes are combined with BILL_PROMPT
+BILL_CHUNK_PROMPT = """You are taking notes on part {part} of {total} of a debate on a bill from the Singapore Parliament hansard.
+    Title: {title}
+    
+    Content:
+    {text}
+    
+    List the key points from this part only, as short plain bullet points covering:
+    - The bill's purpose and main provisions, if described.
+    - Concerns raised by MPs, attributed by name.
+    - The Minister's responses and justifications.
+
+    Rules:
+    1. Refer to all office holders (Ministers, Ministers of State, Parliamentary Secretaries etc.) by their full titles.
+    2. DO NOT include any information that is not included in the text.
+    3. Do not include any intro or outro text.
+    """
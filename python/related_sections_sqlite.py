@@ -0,0 +1,312 @@
+"""
+Precompute related sections using TF-IDF cosine similarity.
+
+Each section's title and text (or its summary, when one exists) is
+vectorised into a sparse TF-IDF matrix, and the top-k most similar
+sections are stored in the related_sections table. Term counts are
+cached per section in section_terms, so a run only tokenises sections
+that are new or whose text changed; document frequencies are recomputed
+from the cached counts, which is a cheap pass over small arrays. Similarities are
+computed in row blocks so memory stays bounded, and an incremental run
+only scores sections from the given sittings against the corpus, then
+merges them into the existing neighbour lists of older sections.
+"""
+
+import json
+import logging
+import re
+import sys
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import numpy as np
+from scipy import sparse
+
+import metrics
+import run_ledger
+from db_sqlite import close_connection, get_connection, init_db, record_changes
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+TOP_K = 10
+MIN_SCORE = 0.1
+BLOCK_SIZE = 256
+# Titles are short but highly descriptive, so their terms count extra
+TITLE_WEIGHT = 3
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9]{2,}")
+
+STOPWORDS = frozenset("""
+    about above after again against all also and any are because been before being below between both but
+    can could did does doing down during each few for from further had has have having her here hers herself
+    him himself his how into its itself just more most not now off once only other our ours ourselves out over
+    own same she should some such than that the their theirs them themselves then there these they this those
+    through too under until very was were what when where which while who whom why will with would you your
+    yours yourself yourselves
+    minister ministry member members sir speaker mr mrs ms mdm dr asked whether what how many number
+    government house parliament singapore please state ask question questions answer reply year years
+""".split())
+
+
+def tokenize(text):
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS]
+
+
+def cache_term_counts():
+    """
+    Tokenise the sections without cached term counts (new ones, and those
+    whose text changed since) into section_terms. Returns how many were
+    tokenised.
+    """
+    conn = get_connection()
+    cursor = conn.execute(
+        '''SELECT s.id, s.section_title, COALESCE(s.summary, s.content_plain) AS body
+           FROM sections s
+           LEFT JOIN section_terms st ON st.section_id = s.id
+           WHERE st.section_id IS NULL'''
+    )
+
+    vocabulary = None
+    new_terms = []
+    rows = []
+    for row in cursor:
+        if vocabulary is None:
+            vocabulary = dict(conn.execute('SELECT term, term_id FROM section_vocabulary').fetchall())
+            next_id = max(vocabulary.values(), default=-1) + 1
+        terms = Counter(tokenize(row['body'] or ''))
+        for term in tokenize(row['section_title'] or ''):
+            terms[term] += TITLE_WEIGHT
+        for term in terms:
+            if term not in vocabulary:
+                vocabulary[term] = next_id
+                new_terms.append((next_id, term))
+                next_id += 1
+        rows.append((
+            row['id'],
+            np.fromiter((vocabulary[term] for term in terms), dtype='<i4', count=len(terms)).tobytes(),
+            np.fromiter(terms.values(), dtype='<i4', count=len(terms)).tobytes(),
+        ))
+
+    if rows:
+        conn.executemany('INSERT INTO section_vocabulary (term_id, term) VALUES (?, ?)', new_terms)
+        conn.executemany('INSERT INTO section_terms (section_id, term_ids, counts) VALUES (?, ?, ?)', rows)
+        conn.commit()
+    return len(rows)
+
+
+def load_corpus():
+    """
+    Build an L2-normalised TF-IDF matrix over every section from the cached
+    term counts, tokenising only sections not cached yet.
+    Returns (section_ids, sitting_ids, matrix).
+    """
+    tokenised = cache_term_counts()
+    conn = get_connection()
+    n_terms = conn.execute('SELECT COALESCE(MAX(term_id), -1) + 1 FROM section_vocabulary').fetchone()[0]
+    cursor = conn.execute(
+        '''SELECT s.id, s.sitting_id, st.term_ids, st.counts
+           FROM sections s
+           JOIN section_terms st ON st.section_id = s.id
+           ORDER BY s.rowid'''
+    )
+
+    section_ids, sitting_ids = [], []
+    indptr, indices, counts = [0], [], []
+    for row in cursor:
+        term_ids = np.frombuffer(row['term_ids'], dtype='<i4')
+        indices.append(term_ids)
+        counts.append(np.frombuffer(row['counts'], dtype='<i4'))
+        indptr.append(indptr[-1] + len(term_ids))
+        section_ids.append(row['id'])
+        sitting_ids.append(row['sitting_id'])
+
+    n_docs = len(section_ids)
+    matrix = sparse.csr_matrix(
+        (
+            np.concatenate(counts).astype(np.float32) if counts else np.zeros(0, dtype=np.float32),
+            np.concatenate(indices).astype(np.int32) if indices else np.zeros(0, dtype=np.int32),
+            np.asarray(indptr),
+        ),
+        shape=(n_docs, n_terms),
+    )
+
+    # Terms in a single document cannot link two sections; drop them
+    df = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+    idf[df < 2] = 0
+
+    matrix.data = (1 + np.log(matrix.data)) * idf[matrix.indices]
+    matrix.eliminate_zeros()
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    matrix = sparse.diags(1 / norms).astype(np.float32) @ matrix
+
+    logger.info(f"Vectorised {n_docs} sections over {int((df >= 2).sum())} terms "
+                f"({tokenised} tokenised, the rest from cache)")
+    return section_ids, sitting_ids, matrix.tocsr()
+
+
+def compute_neighbours(matrix, rows, top_k=TOP_K, min_score=MIN_SCORE, block_size=BLOCK_SIZE):
+    """
+    Score the given rows against all rows, one block at a time.
+
+    Returns (neighbours, reverse): neighbours maps each row to its top-k
+    [(col, score)], and reverse maps each column outside `rows` to the
+    [(row, score)] pairs above min_score, for merging into older lists.
+    """
+    rows = np.asarray(rows)
+    is_query = np.zeros(matrix.shape[0], dtype=bool)
+    is_query[rows] = True
+    matrix_t = matrix.T.tocsc()
+
+    neighbours = {}
+    reverse = defaultdict(list)
+
+    for start in range(0, len(rows), block_size):
+        block = rows[start:start + block_size]
+        scores = (matrix[block] @ matrix_t).toarray()
+        scores[np.arange(len(block)), block] = -1  # exclude self
+
+        k = min(top_k, scores.shape[1] - 1)
+        if k <= 0:
+            continue
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        for i, row in enumerate(block):
+            keep = top_scores[i] >= min_score
+            neighbours[int(row)] = list(zip(top[i][keep].tolist(), top_scores[i][keep].tolist()))
+
+        scores[:, is_query] = -1
+        for i, col in zip(*np.nonzero(scores >= min_score)):
+            reverse[int(col)].append((int(block[i]), float(scores[i, col])))
+
+    return neighbours, reverse
+
+
+def load_existing_neighbours(section_ids):
+    """Stored neighbour lists for the given sections as {section_id: [(related_id, score)]}."""
+    conn = get_connection()
+    existing = defaultdict(list)
+    cursor = conn.execute(
+        '''SELECT section_id, related_section_id, score FROM related_sections
+           WHERE section_id IN (SELECT value FROM json_each(?))
+           ORDER BY section_id, rank''',
+        (json.dumps(section_ids),)
+    )
+    for row in cursor:
+        existing[row['section_id']].append((row['related_section_id'], row['score']))
+    return existing
+
+
+def store_neighbours(lists):
+    """Replace the neighbour lists for the given sections: {section_id: [(related_id, score)]}."""
+    conn = get_connection()
+    conn.executemany('DELETE FROM related_sections WHERE section_id = ?', [(sid,) for sid in lists])
+    conn.executemany(
+        '''INSERT INTO related_sections (section_id, related_section_id, rank, score)
+           VALUES (?, ?, ?, ?)''',
+        [
+            (sid, related_id, rank, round(score, 4))
+            for sid, related in lists.items()
+            for rank, (related_id, score) in enumerate(related)
+        ]
+    )
+    conn.commit()
+    metrics.inc('rows_written_total', sum(map(len, lists.values())), table='related_sections')
+
+
+def update_related_sections(start_date_str=None, end_date_str=None):
+    """
+    Recompute neighbours for sections in sittings within the date range
+    (every section if no range is given) and merge them into the lists of
+    older sections they now rank against.
+    """
+    init_db()
+    conn = get_connection()
+
+    section_ids, sitting_ids, matrix = load_corpus()
+    if not section_ids:
+        logger.info("No sections to index.")
+        close_connection()
+        return
+
+    if start_date_str:
+        start_date = datetime.strptime(start_date_str, '%d-%m-%Y').strftime('%Y-%m-%d')
+        end_date = datetime.strptime(end_date_str, '%d-%m-%Y').strftime('%Y-%m-%d')
+        target_sittings = {
+            row['id'] for row in conn.execute(
+                'SELECT id FROM sittings WHERE date >= ? AND date <= ?', (start_date, end_date)
+            )
+        }
+        rows = [i for i, sid in enumerate(sitting_ids) if sid in target_sittings]
+    else:
+        rows = list(range(len(section_ids)))
+
+    if not rows:
+        logger.info("No sections in the given range.")
+        close_connection()
+        return
+
+    logger.info(f"Scoring {len(rows)} sections against {len(section_ids)}...")
+    neighbours, reverse = compute_neighbours(matrix, rows)
+
+    lists = {
+        section_ids[row]: [(section_ids[col], score) for col, score in related]
+        for row, related in neighbours.items()
+    }
+
+    # Fold the new sections into older sections' existing top-k lists
+    affected = [section_ids[col] for col in reverse]
+    existing = load_existing_neighbours(affected + list(lists))
+    for col, candidates in reverse.items():
+        sid = section_ids[col]
+        current = existing.get(sid, [])
+        merged = dict(current)
+        for row, score in candidates:
+            merged[section_ids[row]] = score
+        updated = sorted(merged.items(), key=lambda item: -item[1])[:TOP_K]
+        if [related_id for related_id, _ in updated] != [related_id for related_id, _ in current]:
+            lists[sid] = updated
+
+    # Section pages list their related sections, so only lists that changed are logged
+    changed = [
+        sid for sid, related in lists.items()
+        if [related_id for related_id, _ in related] != [related_id for related_id, _ in existing.get(sid, [])]
+    ]
+    record_changes('section', changed)
+    store_neighbours(lists)
+    logger.info(f"Updated related sections for {len(lists)} sections "
+                f"({len(neighbours)} scored, {len(lists) - len(neighbours)} merged)")
+    close_connection()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: uv run related_sections_sqlite.py START_DATE [END_DATE]")
+        print("       uv run related_sections_sqlite.py --all")
+        print("Example: uv run related_sections_sqlite.py 14-01-2026")
+        sys.exit(1)
+
+    if sys.argv[1] == "--all":
+        with run_ledger.stage('related_sections'):
+            update_related_sections()
+        sys.exit(0)
+
+    args = sys.argv[1:]
+    dates = [arg for arg in args if not arg.startswith("--")]
+
+    start = dates[0]
+    end = dates[1] if len(dates) > 1 else start
+
+    with run_ledger.stage('related_sections'):
+        update_related_sections(start, end)
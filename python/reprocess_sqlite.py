@@ -0,0 +1,395 @@
+"""
+Rebuild derived section columns from stored data, without refetching.
+
+Reruns category assignment, ministry detection, speaker matching
+(section_speakers and the member of each transcript turn) and second
+reading bill linkage over the sections already in the database, using
+each sitting's stored attendance as the list of MPs to match against.
+Use it after changing the detection rules instead of re-ingesting.
+
+Sittings are classified in parallel worker processes, a batch at a
+time. Only rows whose values changed are written, one transaction per
+batch. Afterwards the rollups, sitting documents and list keys of the
+affected sittings are refreshed, the member graph is rebuilt for their
+parliaments and ministries, and the list feed shards of their months are
+regenerated in astro/public/data.
+
+The API's report type is not stored, so adjournment motions keep their
+stored category. First reading sections keep their bill (each first
+reading is its own bill), and a second reading with no matching bill
+keeps its current link rather than creating a new bill.
+"""
+
+import json
+import logging
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pagination
+import rollups
+from batch_process_sqlite import detect_section_ministry
+from db_sqlite import close_connection, generate_id, get_connection, init_db, record_changes
+from export_lists_sqlite import DEFAULT_OUTPUT_DIR as LISTS_OUTPUT_DIR, FEEDS, export_feed, months_for_sittings
+from parliament_sitting import MP, ParliamentSitting, categorize_section
+from sitting_documents import refresh_sitting_documents
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+# Sittings classified and written per transaction
+BATCH_SITTINGS = 50
+
+
+def load_sitting_payloads(sitting_ids):
+    """Everything the classifier needs for each sitting, as picklable dicts."""
+    conn = get_connection()
+    ids_json = json.dumps(sitting_ids)
+    payloads = {
+        sitting_id: {'sitting_id': sitting_id, 'members': [], 'sections': [], 'turns': defaultdict(list)}
+        for sitting_id in sitting_ids
+    }
+
+    rows = conn.execute(
+        '''SELECT sa.sitting_id, m.name, sa.constituency, sa.designation, sa.present
+           FROM sitting_attendance sa
+           JOIN members m ON sa.member_id = m.id
+           WHERE sa.sitting_id IN (SELECT value FROM json_each(?))
+           ORDER BY sa.rowid''',
+        (ids_json,)
+    )
+    for row in rows:
+        payloads[row['sitting_id']]['members'].append(
+            (row['name'], row['constituency'], row['designation'], bool(row['present']))
+        )
+
+    rows = conn.execute(
+        '''SELECT id, sitting_id, section_type, section_title, category, content_html, content_plain
+           FROM sections
+           WHERE sitting_id IN (SELECT value FROM json_each(?))
+           ORDER BY section_order''',
+        (ids_json,)
+    )
+    for row in rows:
+        payloads[row['sitting_id']]['sections'].append(dict(row))
+
+    rows = conn.execute(
+        '''SELECT sec.sitting_id, su.section_id, su.turn_index, su.speaker_label
+           FROM section_utterances su
+           JOIN sections sec ON su.section_id = sec.id
+           WHERE sec.sitting_id IN (SELECT value FROM json_each(?)) AND su.speaker_label IS NOT NULL''',
+        (ids_json,)
+    )
+    for row in rows:
+        payloads[row['sitting_id']]['turns'][row['section_id']].append((row['turn_index'], row['speaker_label']))
+
+    return [payloads[sitting_id] for sitting_id in sitting_ids]
+
+
+def classify_sitting(payload):
+    """
+    Rerun the ingest rules over one stored sitting. Runs in a worker
+    process and does not touch the database.
+
+    Returns {section_id: {'category', 'ministry', 'speakers', 'turns'}},
+    where speakers is [(name, constituency, designation)] and turns maps
+    turn_index to the matched MP's name. speakers and turns are None when
+    the sitting has no stored attendance to match against.
+    """
+    sitting = ParliamentSitting(payload['sitting_id'])
+    sitting.set_members(
+        [MP(name, constituency, designation) for name, constituency, designation, present in payload['members'] if present],
+        [MP(name, constituency, designation) for name, constituency, designation, present in payload['members'] if not present],
+    )
+    can_match = bool(payload['members'])
+
+    results = {}
+    for section in payload['sections']:
+        title = section['section_title'] or ''
+        # Only the stored category records that a section came from an adjournment motion report
+        report_type = 'Matter Raised On Adjournment Motion' if section['category'] == 'adjournment_motion' else ''
+        category = categorize_section(title, section['section_type'], report_type)
+
+        speakers = sitting.match_section_speakers(section['content_html'] or '', category) if can_match else []
+        ministry = detect_section_ministry({
+            'category': category,
+            'title': title,
+            'content_plain': section['content_plain'] or '',
+            'speakers': speakers,
+        })
+
+        turns = None
+        if can_match:
+            turns = {}
+            for turn_index, label in payload['turns'].get(section['id'], []):
+                mp = sitting.match_speaker(label)
+                turns[turn_index] = mp.name if mp else None
+
+        results[section['id']] = {
+            'category': category,
+            'ministry': ministry,
+            'speakers': [(mp.name, mp.constituency, mp.appointment) for mp in speakers] if can_match else None,
+            'turns': turns,
+        }
+    return results
+
+
+class Reprocessor:
+    """Diffs classifier results against stored rows and writes the changes."""
+
+    def __init__(self, dry_run=False):
+        self.conn = get_connection()
+        self.dry_run = dry_run
+        self.ministries = {
+            row['acronym']: row['id'] for row in self.conn.execute('SELECT id, acronym FROM ministries')
+        }
+        self.members = {row['name']: row['id'] for row in self.conn.execute('SELECT id, name FROM members')}
+        self.counts = defaultdict(int)
+        self.changed_sittings = set()
+        self.changed_sections = set()
+        # Ministries and bills that sections (or a bill's ministry) moved away from, whose
+        # rollups the changed sittings alone would not refresh
+        self.previous_ministries = set()
+        self.previous_bills = set()
+
+    def member_id(self, name):
+        if name not in self.members:
+            self.members[name] = generate_id()
+            self.conn.execute('INSERT INTO members (id, name) VALUES (?, ?)', (self.members[name], name))
+            record_changes('member', [self.members[name]])
+            self.counts['members_created'] += 1
+        return self.members[name]
+
+    def second_reading_bill(self, title, sitting_date):
+        """The bill a second reading links to: the latest with this title first read by then."""
+        return self.conn.execute(
+            '''SELECT id, ministry_id FROM bills
+               WHERE title = ? AND (first_reading_date IS NULL OR first_reading_date <= ?)
+               ORDER BY first_reading_date DESC LIMIT 1''',
+            (title.strip(), sitting_date)
+        ).fetchone()
+
+    def apply(self, results):
+        """Write the changed rows for a batch of sittings in one transaction."""
+        conn = self.conn
+        section_ids = [section_id for result in results for section_id in result]
+        ids_json = json.dumps(section_ids)
+
+        stored = {
+            row['id']: row for row in conn.execute(
+                '''SELECT sec.id, sec.sitting_id, sec.section_type, sec.section_title, sec.category,
+                          sec.ministry_id, sec.bill_id, s.date, b.ministry_id AS bill_ministry_id
+                   FROM sections sec
+                   JOIN sittings s ON sec.sitting_id = s.id
+                   LEFT JOIN bills b ON sec.bill_id = b.id
+                   WHERE sec.id IN (SELECT value FROM json_each(?))''',
+                (ids_json,)
+            )
+        }
+        stored_speakers = defaultdict(dict)
+        for row in conn.execute(
+            '''SELECT section_id, member_id, constituency, designation FROM section_speakers
+               WHERE section_id IN (SELECT value FROM json_each(?))''',
+            (ids_json,)
+        ):
+            stored_speakers[row['section_id']][row['member_id']] = (row['constituency'], row['designation'])
+        stored_turns = defaultdict(dict)
+        for row in conn.execute(
+            '''SELECT section_id, turn_index, member_id FROM section_utterances
+               WHERE section_id IN (SELECT value FROM json_each(?)) AND speaker_label IS NOT NULL''',
+            (ids_json,)
+        ):
+            stored_turns[row['section_id']][row['turn_index']] = row['member_id']
+
+        section_updates, bill_updates = [], {}
+        speaker_deletes, speaker_upserts, turn_updates = [], [], []
+
+        for result in results:
+            for section_id, new in result.items():
+                old = stored[section_id]
+                touched = False
+                ministry_id = self.ministries.get(new['ministry']) if new['ministry'] else None
+
+                bill_id, bill_ministry = old['bill_id'], old['bill_ministry_id']
+                if old['section_type'] == 'BP':
+                    bill = self.second_reading_bill(old['section_title'] or '', old['date'])
+                    if bill:
+                        bill_id, bill_ministry = bill['id'], bill['ministry_id']
+                # As at ingest, a bill takes its first reading's ministry, or a second
+                # reading's if it has none; leave ministries set any other way alone
+                bill_ministry = bill_updates.get(bill_id, bill_ministry)
+                if (bill_id and ministry_id and bill_ministry != ministry_id
+                        and (bill_ministry is None or
+                             (old['section_type'] == 'BI' and bill_ministry == old['ministry_id']))):
+                    bill_updates[bill_id] = ministry_id
+
+                if (new['category'], ministry_id, bill_id) != (old['category'], old['ministry_id'], old['bill_id']):
+                    section_updates.append((new['category'], ministry_id, bill_id, section_id))
+                    touched = True
+
+                if new['speakers'] is not None:
+                    matched = {
+                        self.member_id(name): (constituency, designation)
+                        for name, constituency, designation in new['speakers']
+                    }
+                    current = stored_speakers[section_id]
+                    removed = current.keys() - matched.keys()
+                    speaker_deletes += [(section_id, member_id) for member_id in removed]
+                    changed = [
+                        (section_id, member_id, *details)
+                        for member_id, details in matched.items() if current.get(member_id) != details
+                    ]
+                    speaker_upserts += changed
+                    touched = touched or bool(removed or changed)
+
+                if new['turns'] is not None:
+                    for turn_index, name in new['turns'].items():
+                        member_id = self.member_id(name) if name else None
+                        if stored_turns[section_id].get(turn_index) != member_id:
+                            turn_updates.append((member_id, section_id, turn_index))
+                            touched = True
+
+                if touched:
+                    self.changed_sections.add(section_id)
+                    self.changed_sittings.add(old['sitting_id'])
+
+        self.counts['sections_checked'] += len(section_ids)
+        self.counts['sections_updated'] += len(section_updates)
+        self.counts['bills_updated'] += len(bill_updates)
+        self.counts['speakers_removed'] += len(speaker_deletes)
+        self.counts['speakers_upserted'] += len(speaker_upserts)
+        self.counts['turns_updated'] += len(turn_updates)
+
+        if self.dry_run:
+            conn.rollback()
+            return
+
+        updated = [stored[update[3]] for update in section_updates]
+        for old in updated:
+            self.previous_ministries.update({old['ministry_id'], old['bill_ministry_id']})
+            self.previous_bills.add(old['bill_id'])
+        for row in conn.execute(
+            'SELECT id, ministry_id FROM bills WHERE id IN (SELECT value FROM json_each(?))',
+            (json.dumps(list(bill_updates)),)
+        ):
+            self.previous_ministries.add(row['ministry_id'])
+        self.previous_ministries.discard(None)
+        self.previous_bills.discard(None)
+
+        conn.executemany(
+            'UPDATE sections SET category = ?, ministry_id = ?, bill_id = ? WHERE id = ?', section_updates
+        )
+        conn.executemany('UPDATE bills SET ministry_id = ? WHERE id = ?', [(m, b) for b, m in bill_updates.items()])
+        conn.executemany('DELETE FROM section_speakers WHERE section_id = ? AND member_id = ?', speaker_deletes)
+        conn.executemany(
+            '''INSERT INTO section_speakers (section_id, member_id, constituency, designation)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT (section_id, member_id) DO UPDATE SET
+               constituency = excluded.constituency,
+               designation = excluded.designation''',
+            speaker_upserts
+        )
+        conn.executemany(
+            'UPDATE section_utterances SET member_id = ? WHERE section_id = ? AND turn_index = ?', turn_updates
+        )
+
+        # The sections' current sitting, bill, ministry and speaker pages follow
+        # from the section entries; log the bills and ministries they moved away from
+        record_changes('section', {
+            *(update[3] for update in section_updates), *(d[0] for d in speaker_deletes),
+            *(u[0] for u in speaker_upserts), *(t[1] for t in turn_updates)
+        })
+        record_changes('bill', {*bill_updates, *(old['bill_id'] for old in updated if old['bill_id'])})
+        record_changes('ministry', {old['ministry_id'] for old in updated if old['ministry_id']})
+        record_changes('member', {
+            *(d[1] for d in speaker_deletes), *(u[1] for u in speaker_upserts), *(t[0] for t in turn_updates if t[0])
+        })
+        conn.commit()
+
+
+def reprocess(start_date_str=None, end_date_str=None, workers=None, dry_run=False):
+    """Reclassify every stored section in the date range (all sittings if no range)."""
+    init_db()
+    conn = get_connection()
+
+    if start_date_str:
+        start_date = datetime.strptime(start_date_str, '%d-%m-%Y').strftime('%Y-%m-%d')
+        end_date = datetime.strptime(end_date_str, '%d-%m-%Y').strftime('%Y-%m-%d')
+        rows = conn.execute(
+            'SELECT id FROM sittings WHERE date >= ? AND date <= ? ORDER BY date', (start_date, end_date)
+        ).fetchall()
+    else:
+        rows = conn.execute('SELECT id FROM sittings ORDER BY date').fetchall()
+    sitting_ids = [row['id'] for row in rows]
+
+    if not sitting_ids:
+        logger.info("No sittings to reprocess.")
+        close_connection()
+        return
+
+    workers = workers or os.cpu_count()
+    logger.info(f"Reprocessing {len(sitting_ids)} sittings with {workers} workers"
+                f"{' (dry run)' if dry_run else ''}...")
+
+    reprocessor = Reprocessor(dry_run=dry_run)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(sitting_ids), BATCH_SITTINGS):
+            batch = sitting_ids[start:start + BATCH_SITTINGS]
+            results = list(pool.map(classify_sitting, load_sitting_payloads(batch)))
+            reprocessor.apply(results)
+            logger.info(f"  {min(start + BATCH_SITTINGS, len(sitting_ids))}/{len(sitting_ids)} sittings")
+
+    changed = sorted(reprocessor.changed_sittings)
+    if changed and not dry_run:
+        ministry_ids, bill_ids = rollups.refresh_for_sittings(changed)
+        rollups.refresh_ministry_activity(reprocessor.previous_ministries - ministry_ids)
+        rollups.refresh_bill_status(reprocessor.previous_bills - bill_ids)
+        refresh_sitting_documents(changed)
+        pagination.refresh_for_sections(reprocessor.changed_sections)
+
+        from member_graph_sqlite import sitting_scopes, update_member_graph
+        scopes = sitting_scopes(changed)
+        scopes['ministry'] |= reprocessor.previous_ministries
+        update_member_graph(scopes)
+
+        # List shards embed each section's category, ministry and speakers
+        for feed in FEEDS:
+            export_feed(feed, LISTS_OUTPUT_DIR, months_for_sittings(feed, changed, reprocessor.previous_bills | bill_ids))
+        logger.info(f"Refreshed rollups, documents, list keys, member graph and list feeds for {len(changed)} sittings")
+
+    for key, value in reprocessor.counts.items():
+        logger.info(f"  {key}: {value}")
+    close_connection()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: uv run reprocess_sqlite.py START_DATE [END_DATE] [--workers N] [--dry-run]")
+        print("       uv run reprocess_sqlite.py --all [--workers N] [--dry-run]")
+        print("Example: uv run reprocess_sqlite.py --all --dry-run")
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    workers = None
+    if "--workers" in args:
+        idx = args.index("--workers")
+        workers = int(args[idx + 1])
+        del args[idx:idx + 2]
+    dry_run = "--dry-run" in args
+
+    if "--all" in args:
+        reprocess(workers=workers, dry_run=dry_run)
+        sys.exit(0)
+
+    dates = [arg for arg in args if not arg.startswith("--")]
+
+    start = dates[0]
+    end = dates[1] if len(dates) > 1 else start
+
+    reprocess(start, end, workers, dry_run)
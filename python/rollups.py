@@ -0,0 +1,163 @@
+"""
+Rollup tables for ministry and bill pages.
+
+ministry_activity holds section counts per ministry, parliament, month,
+category and section type; bill_status holds each bill's reading dates,
+sittings and section counts. Both are derived from sections, and are
+refreshed only for the ministries and bills a run touched:
+batch_process_sqlite.py refreshes what it ingested and
+cleanup_duplicates_sqlite.py what it deleted from. While both tables are
+still empty, e.g. just created on an existing database, the first
+refresh rebuilds them in full.
+
+Run directly to rebuild both tables.
+"""
+import json
+from collections import defaultdict
+from typing import Iterable, Set, Tuple
+
+import db_sqlite as db
+
+# Sections are attributed to their bill's ministry first, as on the site
+SECTION_MINISTRY = 'COALESCE(b.ministry_id, sec.ministry_id)'
+
+
+def touched_by_sittings(sitting_ids: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+    """Ministry and bill IDs with sections in the given sittings."""
+    conn = db.get_connection()
+    rows = conn.execute(
+        f'''SELECT DISTINCT {SECTION_MINISTRY} AS ministry_id, sec.bill_id
+            FROM sections sec
+            LEFT JOIN bills b ON sec.bill_id = b.id
+            WHERE sec.sitting_id IN (SELECT value FROM json_each(?))''',
+        (json.dumps(list(sitting_ids)),)
+    ).fetchall()
+    return ({r['ministry_id'] for r in rows if r['ministry_id']},
+            {r['bill_id'] for r in rows if r['bill_id']})
+
+
+def refresh_ministry_activity(ministry_ids: Iterable[str]):
+    """Recompute ministry_activity rows for the given ministries."""
+    ministry_json = json.dumps(sorted(ministry_ids))
+    conn = db.get_connection()
+    conn.execute(
+        'DELETE FROM ministry_activity WHERE ministry_id IN (SELECT value FROM json_each(?))',
+        (ministry_json,)
+    )
+    conn.execute(
+        f'''INSERT INTO ministry_activity
+            (ministry_id, parliament, month, category, section_type,
+             section_count, bill_count, latest_sitting_date)
+            SELECT
+                {SECTION_MINISTRY},
+                sit.parliament,
+                substr(sit.date, 1, 7),
+                COALESCE(sec.category, 'other'),
+                COALESCE(sec.section_type, ''),
+                COUNT(*),
+                COUNT(DISTINCT sec.bill_id),
+                MAX(sit.date)
+            FROM sections sec
+            JOIN sittings sit ON sec.sitting_id = sit.id
+            LEFT JOIN bills b ON sec.bill_id = b.id
+            WHERE {SECTION_MINISTRY} IN (SELECT value FROM json_each(?))
+            GROUP BY 1, 2, 3, 4, 5''',
+        (ministry_json,)
+    )
+    conn.commit()
+
+
+def refresh_bill_status(bill_ids: Iterable[str]):
+    """Recompute bill_status rows for the given bills."""
+    bill_json = json.dumps(sorted(bill_ids))
+    conn = db.get_connection()
+
+    bills = {
+        row['id']: row for row in conn.execute(
+            '''SELECT id, ministry_id, first_reading_date, first_reading_sitting_id
+               FROM bills WHERE id IN (SELECT value FROM json_each(?))''',
+            (bill_json,)
+        )
+    }
+    readings = defaultdict(list)
+    rows = conn.execute(
+        '''SELECT sec.bill_id, sec.section_type, sec.ministry_id, sit.id AS sitting_id, sit.date, sit.parliament
+           FROM sections sec
+           JOIN sittings sit ON sec.sitting_id = sit.id
+           WHERE sec.bill_id IN (SELECT value FROM json_each(?))
+           ORDER BY sit.date, sec.section_order''',
+        (bill_json,)
+    )
+    for row in rows:
+        readings[row['bill_id']].append(row)
+
+    status_rows = []
+    for bill_id, bill in bills.items():
+        sections = readings[bill_id]
+        first = [s for s in sections if s['section_type'] == 'BI']
+        second = [s for s in sections if s['section_type'] == 'BP']
+
+        second_sittings = []
+        for s in second:
+            if not second_sittings or second_sittings[-1]['sittingId'] != s['sitting_id']:
+                second_sittings.append({'sittingDate': s['date'], 'sittingId': s['sitting_id']})
+
+        first_date = bill['first_reading_date'] or (first[0]['date'] if first else None)
+        first_sitting = bill['first_reading_sitting_id'] or (first[0]['sitting_id'] if first else None)
+        status_rows.append((
+            bill_id,
+            bill['ministry_id'] or next((s['ministry_id'] for s in sections if s['ministry_id']), None),
+            json.dumps(sorted({s['parliament'] for s in sections if s['parliament'] is not None})),
+            first_date,
+            first_sitting,
+            second_sittings[0]['sittingDate'] if second_sittings else None,
+            second_sittings[0]['sittingId'] if second_sittings else None,
+            json.dumps(second_sittings),
+            1 if second else 0,
+            sections[-1]['date'] if sections else first_date,
+            len(first),
+            len(second),
+            len(sections),
+        ))
+
+    conn.execute('DELETE FROM bill_status WHERE bill_id IN (SELECT value FROM json_each(?))', (bill_json,))
+    conn.executemany(
+        '''INSERT INTO bill_status
+           (bill_id, ministry_id, parliaments, first_reading_date, first_reading_sitting_id,
+            second_reading_date, second_reading_sitting_id, second_reading_sittings,
+            has_second_reading, latest_activity_date,
+            first_reading_sections, second_reading_sections, section_count)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+        status_rows
+    )
+    conn.commit()
+
+
+def refresh_for_sittings(sitting_ids: Iterable[str]):
+    """Refresh rollups for everything with sections in the given sittings."""
+    sitting_ids = list(sitting_ids)
+    ministry_ids, bill_ids = touched_by_sittings(sitting_ids)
+    conn = db.get_connection()
+    if not (conn.execute('SELECT 1 FROM ministry_activity LIMIT 1').fetchone()
+            or conn.execute('SELECT 1 FROM bill_status LIMIT 1').fetchone()):
+        # First run against a database that predates the tables: backfill everything
+        rebuild_all()
+        return ministry_ids, bill_ids
+    refresh_ministry_activity(ministry_ids)
+    refresh_bill_status(bill_ids)
+    return ministry_ids, bill_ids
+
+
+def rebuild_all():
+    conn = db.get_connection()
+    conn.execute('DELETE FROM ministry_activity')
+    conn.execute('DELETE FROM bill_status')
+    refresh_ministry_activity(row['id'] for row in conn.execute('SELECT id FROM ministries').fetchall())
+    refresh_bill_status(row['id'] for row in conn.execute('SELECT id FROM bills').fetchall())
+
+
+if __name__ == "__main__":
+    db.init_db()
+    rebuild_all()
+    print("Rebuilt ministry_activity and bill_status")
+    db.close_connection()
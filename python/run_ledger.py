@@ -0,0 +1,207 @@
+"""
+Ledger of pipeline stage runs, with a performance regression report.
+
+Each Python stage (ingest, dedupe, summarise, related sections, member
+graph, list export) runs inside stage(), which records one pipeline_runs
+row: wall time, status, and what the stage did according to its metrics
+counters: rows written, Hansard API calls, LLM requests and tokens, and
+cache hits and misses (unchanged sitting documents and list shards).
+Stages started by one daily_pipeline.sh run share its PIPELINE_RUN_ID.
+With --profile-memory, each stage is also profiled by memory_profile.
+
+The report compares each stage of the latest run against the median of
+its previous runs and flags stages that got significantly slower. Rows
+written are compared too, so a slowdown is attributed either to more
+upstream data (time per row steady) or to the stage itself (time per row
+up).
+
+Usage:
+  uv run run_ledger.py report [--run RUN_ID] [--runs N] [--ratio R]
+"""
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import db_sqlite as db
+import memory_profile
+import metrics
+
+logger = logging.getLogger(__name__)
+
+RUN_ID = os.getenv('PIPELINE_RUN_ID') or datetime.now().strftime('%Y%m%d-%H%M%S')
+
+# Baseline: the median of this many previous successful runs of a stage
+BASELINE_RUNS = 14
+MIN_BASELINE_RUNS = 3
+# A stage is flagged when it takes this many times its baseline, and at
+# least MIN_SLOWDOWN_MS longer, so short stages don't flag on jitter
+SLOWDOWN_RATIO = 1.5
+MIN_SLOWDOWN_MS = 1000
+
+COLUMNS = {
+    'rows_written': [('rows_written_total', {})],
+    'api_calls': [('hansard_requests_total', {}), ('hansard_request_errors_total', {})],
+    'llm_requests': [('llm_requests_total', {})],
+    'llm_prompt_tokens': [('llm_prompt_tokens_total', {})],
+    'llm_output_tokens': [('llm_output_tokens_total', {})],
+    'cache_hits': [('cache_requests_total', {'result': 'hit'})],
+    'cache_misses': [('cache_requests_total', {'result': 'miss'})],
+}
+
+
+def _counter_values():
+    return {
+        (c['name'], tuple(sorted(c['labels'].items()))): c['value']
+        for c in metrics.snapshot()['counters']
+    }
+
+
+def _format_key(key):
+    name, labels = key
+    if not labels:
+        return name
+    return name + '{' + ','.join(f'{k}={v}' for k, v in labels) + '}'
+
+
+def record(stage_name, started_at, duration_ms, status, counters):
+    """Write one stage's row. counters maps (name, labels) to the stage's increments."""
+    totals = {
+        column: sum(
+            value for (name, labels), value in counters.items()
+            if any(name == metric and set(match.items()) <= set(labels) for metric, match in sources)
+        )
+        for column, sources in COLUMNS.items()
+    }
+    conn = db.get_connection()
+    conn.execute(
+        f'''INSERT INTO pipeline_runs
+            (run_id, stage, started_at, duration_ms, status, {', '.join(COLUMNS)}, counters)
+            VALUES (?, ?, ?, ?, ?, {', '.join('?' * len(COLUMNS))}, ?)''',
+        (RUN_ID, stage_name, started_at, duration_ms, status, *(int(totals[c]) for c in COLUMNS),
+         json.dumps({_format_key(key): value for key, value in sorted(counters.items())}))
+    )
+    conn.commit()
+
+
+@contextmanager
+def stage(name):
+    """Time a stage and record it in the ledger, whether it succeeds or raises."""
+    # Counters are only kept while metrics are on. Unless PARLIAMENT_METRICS_DIR
+    # already enabled them with file output, they are collected in memory
+    metrics.enable()
+    before = _counter_values()
+    started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    start = time.perf_counter()
+    status = 'failed'
+    try:
+        with memory_profile.stage(name):
+            yield
+        status = 'ok'
+    finally:
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        counters = {
+            key: value - before.get(key, 0)
+            for key, value in _counter_values().items() if value != before.get(key, 0)
+        }
+        try:
+            if status == 'failed':
+                # Recording commits on the shared connection, which would otherwise also
+                # commit whatever the failed stage left half-written
+                db.get_connection().rollback()
+            record(name, started_at, duration_ms, status, counters)
+        except Exception as e:
+            # The ledger is diagnostic; never fail a stage because it could not be written
+            logger.warning(f"Could not record {name} in pipeline_runs: {e}")
+
+
+def compare(run_id=None, baseline_runs=BASELINE_RUNS, ratio=SLOWDOWN_RATIO):
+    """
+    Each stage of a run (the latest if None) against the median of its
+    previous successful runs. Returns (run_id, rows), one dict per stage.
+    """
+    conn = db.get_connection()
+    if run_id is None:
+        row = conn.execute('SELECT run_id FROM pipeline_runs ORDER BY id DESC LIMIT 1').fetchone()
+        if row is None:
+            return None, []
+        run_id = row['run_id']
+
+    results = []
+    for current in conn.execute('SELECT * FROM pipeline_runs WHERE run_id = ? ORDER BY id', (run_id,)).fetchall():
+        baseline = conn.execute(
+            '''SELECT duration_ms, rows_written FROM pipeline_runs
+               WHERE stage = ? AND status = 'ok' AND id < ? AND run_id != ?
+               ORDER BY id DESC LIMIT ?''',
+            (current['stage'], current['id'], run_id, baseline_runs)
+        ).fetchall()
+        result = {
+            'stage': current['stage'],
+            'status': current['status'],
+            'duration_ms': current['duration_ms'],
+            'rows_written': current['rows_written'],
+            'baseline_runs': len(baseline),
+            'baseline_ms': None,
+            'baseline_rows': None,
+            'ratio': None,
+            'flag': None,
+        }
+        if current['status'] != 'ok':
+            result['flag'] = 'failed'
+        if len(baseline) >= MIN_BASELINE_RUNS:
+            baseline_ms = statistics.median(row['duration_ms'] for row in baseline)
+            baseline_rows = statistics.median(row['rows_written'] for row in baseline)
+            result.update(baseline_ms=baseline_ms, baseline_rows=baseline_rows)
+            result['ratio'] = round(current['duration_ms'] / baseline_ms, 2) if baseline_ms else None
+            slower = (current['duration_ms'] > ratio * baseline_ms
+                      and current['duration_ms'] - baseline_ms >= MIN_SLOWDOWN_MS)
+            if slower and current['status'] == 'ok':
+                # Time per row written separates more data from slower code
+                per_row = current['duration_ms'] / max(current['rows_written'], 1)
+                baseline_per_row = baseline_ms / max(baseline_rows, 1)
+                result['flag'] = 'slower per row' if per_row > ratio * baseline_per_row else 'more data'
+        results.append(result)
+    return run_id, results
+
+
+def format_report(run_id, results):
+    if not results:
+        return "No pipeline runs recorded."
+    width = max(len(r['stage']) for r in results)
+    lines = [
+        f"Run {run_id}",
+        f"{'stage':<{width}}  {'time':>9}  {'baseline':>9}  {'ratio':>6}  {'rows':>7}  {'base rows':>9}  flag",
+    ]
+    for r in results:
+        baseline = f"{r['baseline_ms'] / 1000:8.1f}s" if r['baseline_ms'] is not None else f"{'-':>9}"
+        ratio = f"{r['ratio']:5.2f}x" if r['ratio'] is not None else f"{'-':>6}"
+        base_rows = f"{r['baseline_rows']:>9g}" if r['baseline_rows'] is not None else f"{'-':>9}"
+        flag = r['flag'] or ('' if r['baseline_runs'] >= MIN_BASELINE_RUNS else 'no baseline')
+        lines.append(
+            f"{r['stage']:<{width}}  {r['duration_ms'] / 1000:8.1f}s  {baseline}  {ratio}  "
+            f"{r['rows_written']:>7}  {base_rows}  {flag}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args or args[0] != 'report':
+        print(__doc__.split('Usage:')[1].rstrip())
+        sys.exit(1)
+
+    run_id = args[args.index("--run") + 1] if "--run" in args else None
+    baseline_runs = int(args[args.index("--runs") + 1]) if "--runs" in args else BASELINE_RUNS
+    ratio = float(args[args.index("--ratio") + 1]) if "--ratio" in args else SLOWDOWN_RATIO
+
+    db.init_db()
+    run_id, results = compare(run_id, baseline_runs, ratio)
+    print(format_report(run_id, results))
+    db.close_connection()
+
+    # Non-zero when a stage failed or slowed down, so the caller can alert
+    sys.exit(1 if any(r['flag'] for r in results) else 0)
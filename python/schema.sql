@@ -53,6 +53,8 @@ CREATE TABLE IF NOT EXISTS bills (
 );
 
 CREATE INDEX IF NOT EXISTS idx_bills_title ON bills(title);
+-- Keyset pagination of the bill list (see pagination.py)
+CREATE INDEX IF NOT EXISTS idx_bills_first_reading ON bills(first_reading_date DESC, id DESC);
 
 -- Sections table (main content: questions, bills, motions)
 CREATE TABLE IF NOT EXISTS sections (
@@ -88,6 +90,147 @@ CREATE TABLE IF NOT EXISTS section_speakers (
 CREATE INDEX IF NOT EXISTS idx_section_speakers_section ON section_speakers(section_id);
 CREATE INDEX IF NOT EXISTS idx_section_speakers_member ON section_speakers(member_id);
 
+-- Section utterances (each section's transcript split into ordered speaker turns at ingest)
+CREATE TABLE IF NOT EXISTS section_utterances (
+    section_id TEXT NOT NULL REFERENCES sections(id) ON DELETE CASCADE,
+    turn_index INTEGER NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('speech', 'procedural', 'timestamp', 'standalone')),
+    speaker_label TEXT,  -- speaker text as printed, e.g. "The Minister for Health (Mr Ong Ye Kung)"
+    member_id TEXT REFERENCES members(id) ON DELETE SET NULL,  -- NULL if the speaker could not be matched
+    content_html TEXT,  -- turn body without the speaker label
+    content_plain TEXT,
+    char_start INTEGER NOT NULL,  -- offsets of the turn within sections.content_html
+    char_end INTEGER NOT NULL,
+    PRIMARY KEY (section_id, turn_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_section_utterances_member ON section_utterances(member_id);
+
+-- Sort keys for keyset pagination of the section list feeds (maintained by pagination.py)
+-- The primary key is the list order: newest sitting first, then section order
+CREATE TABLE IF NOT EXISTS section_list_keys (
+    feed TEXT NOT NULL CHECK (feed IN ('questions', 'motions', 'clarifications')),
+    sitting_date TEXT NOT NULL,
+    section_order INTEGER NOT NULL,
+    section_id TEXT NOT NULL REFERENCES sections(id) ON DELETE CASCADE,
+    PRIMARY KEY (feed, sitting_date DESC, section_order, section_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_section_list_keys_section ON section_list_keys(section_id);
+
+-- Append-only log of changed entities (written through db_sqlite.record_changes, read by change_log.py)
+-- seq never repeats, so "changed since seq N" is a range scan over the new rows
+CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity_type TEXT NOT NULL CHECK (entity_type IN ('sitting', 'section', 'bill', 'member', 'ministry')),
+    entity_id TEXT NOT NULL,
+    op TEXT NOT NULL DEFAULT 'upsert' CHECK (op IN ('upsert', 'delete')),
+    changed_at TEXT DEFAULT (datetime('now'))
+);
+
+-- Related sections (top-k TF-IDF neighbours, built by related_sections_sqlite.py)
+CREATE TABLE IF NOT EXISTS related_sections (
+    section_id TEXT NOT NULL REFERENCES sections(id) ON DELETE CASCADE,
+    related_section_id TEXT NOT NULL REFERENCES sections(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,  -- 0 = most similar
+    score REAL NOT NULL,  -- cosine similarity
+    PRIMARY KEY (section_id, rank)
+);
+
+CREATE INDEX IF NOT EXISTS idx_related_sections_related ON related_sections(related_section_id);
+
+-- Term counts cache for related sections, so a run only tokenises new or edited sections
+CREATE TABLE IF NOT EXISTS section_vocabulary (
+    term_id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS section_terms (
+    section_id TEXT PRIMARY KEY REFERENCES sections(id) ON DELETE CASCADE,
+    term_ids BLOB NOT NULL,  -- int32 array of section_vocabulary term_ids
+    counts BLOB NOT NULL  -- int32 array, title terms weighted
+);
+
+-- A section whose text changes (e.g. gains a summary) is tokenised again
+CREATE TRIGGER IF NOT EXISTS section_terms_stale
+AFTER UPDATE OF section_title, content_plain, summary ON sections
+BEGIN
+    DELETE FROM section_terms WHERE section_id = NEW.id;
+END;
+
+-- Packed attendance per member and parliament (maintained by attendance_bitmaps.py)
+-- Bit i refers to the parliament's i-th sitting by date; neither bit set = not in that sitting's attendance list
+CREATE TABLE IF NOT EXISTS member_attendance (
+    member_id TEXT NOT NULL REFERENCES members(id) ON DELETE CASCADE,
+    parliament INTEGER NOT NULL,
+    sitting_count INTEGER NOT NULL,  -- sittings covered by the bitsets
+    present_bits BLOB NOT NULL,  -- little-endian bitset
+    absent_bits BLOB NOT NULL,
+    present_count INTEGER NOT NULL,
+    absent_count INTEGER NOT NULL,
+    updated_at TEXT DEFAULT (datetime('now')),
+    PRIMARY KEY (member_id, parliament)
+);
+
+CREATE INDEX IF NOT EXISTS idx_member_attendance_parliament ON member_attendance(parliament);
+
+-- Ministry activity rollup (maintained by rollups.py)
+-- Sections are attributed to their bill's ministry where they belong to a bill
+CREATE TABLE IF NOT EXISTS ministry_activity (
+    ministry_id TEXT NOT NULL REFERENCES ministries(id) ON DELETE CASCADE,
+    parliament INTEGER,
+    month TEXT NOT NULL,  -- YYYY-MM
+    category TEXT NOT NULL,
+    section_type TEXT NOT NULL,  -- '' if unknown
+    section_count INTEGER NOT NULL,
+    bill_count INTEGER NOT NULL,  -- distinct bills among these sections
+    latest_sitting_date TEXT,
+    PRIMARY KEY (ministry_id, parliament, month, category, section_type)
+);
+
+-- Bill reading status rollup (maintained by rollups.py)
+CREATE TABLE IF NOT EXISTS bill_status (
+    bill_id TEXT PRIMARY KEY REFERENCES bills(id) ON DELETE CASCADE,
+    ministry_id TEXT REFERENCES ministries(id),
+    parliaments TEXT NOT NULL DEFAULT '[]',  -- JSON array of parliaments with a reading of this bill
+    first_reading_date TEXT,
+    first_reading_sitting_id TEXT REFERENCES sittings(id),
+    second_reading_date TEXT,  -- first sitting with a second reading section
+    second_reading_sitting_id TEXT REFERENCES sittings(id),
+    second_reading_sittings TEXT NOT NULL DEFAULT '[]',  -- JSON [{sittingDate, sittingId}] in date order
+    has_second_reading INTEGER NOT NULL DEFAULT 0,
+    latest_activity_date TEXT,
+    first_reading_sections INTEGER NOT NULL DEFAULT 0,
+    second_reading_sections INTEGER NOT NULL DEFAULT 0,
+    section_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_bill_status_ministry ON bill_status(ministry_id);
+
+-- Denormalised sitting page documents (maintained by sitting_documents.py)
+CREATE TABLE IF NOT EXISTS sitting_documents (
+    sitting_id TEXT PRIMARY KEY REFERENCES sittings(id) ON DELETE CASCADE,
+    document TEXT NOT NULL,  -- JSON: sitting, sections, attendees, bills
+    content_hash TEXT NOT NULL,  -- sha256 of document, to skip unchanged rewrites
+    updated_at TEXT DEFAULT (datetime('now'))
+);
+
+-- Member co-participation graph (built by member_graph_sqlite.py)
+-- Each member's strongest partners by number of sections both spoke in, per parliament or ministry
+CREATE TABLE IF NOT EXISTS member_edges (
+    scope_type TEXT NOT NULL CHECK (scope_type IN ('parliament', 'ministry')),
+    scope_id TEXT NOT NULL,  -- parliament number or ministries.id
+    member_id TEXT NOT NULL REFERENCES members(id) ON DELETE CASCADE,
+    other_member_id TEXT NOT NULL REFERENCES members(id) ON DELETE CASCADE,
+    shared_sections INTEGER NOT NULL,
+    rank INTEGER NOT NULL,  -- 0 = strongest edge for member_id in this scope
+    PRIMARY KEY (scope_type, scope_id, member_id, rank)
+);
+
+CREATE INDEX IF NOT EXISTS idx_member_edges_member ON member_edges(member_id, scope_type);
+CREATE INDEX IF NOT EXISTS idx_member_edges_scope ON member_edges(scope_type, scope_id, shared_sections DESC);
+
 -- Sitting attendance (who attended each sitting)
 CREATE TABLE IF NOT EXISTS sitting_attendance (
     sitting_id TEXT NOT NULL REFERENCES sittings(id) ON DELETE CASCADE,
@@ -101,6 +244,42 @@ CREATE TABLE IF NOT EXISTS sitting_attendance (
 CREATE INDEX IF NOT EXISTS idx_sitting_attendance_sitting ON sitting_attendance(sitting_id);
 CREATE INDEX IF NOT EXISTS idx_sitting_attendance_member ON sitting_attendance(member_id);
 
+-- Summary job ledger (one row per summarisable section, bill or member)
+CREATE TABLE IF NOT EXISTS summary_jobs (
+    job_type TEXT NOT NULL CHECK (job_type IN ('section', 'bill', 'member')),
+    target_id TEXT NOT NULL,  -- sections.id, bills.id or members.id
+    sitting_id TEXT REFERENCES sittings(id) ON DELETE CASCADE,
+    state TEXT NOT NULL DEFAULT 'pending' CHECK (state IN ('pending', 'running', 'done', 'failed', 'skipped')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    latency_ms INTEGER,  -- duration of the last attempt
+    created_at TEXT DEFAULT (datetime('now')),
+    updated_at TEXT DEFAULT (datetime('now')),
+    PRIMARY KEY (job_type, target_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_summary_jobs_state ON summary_jobs(state);
+
+-- One row per pipeline stage per run (written by run_ledger.py), for timing regressions
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,  -- shared by the stages of one pipeline run (PIPELINE_RUN_ID)
+    stage TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('ok', 'failed')),
+    rows_written INTEGER NOT NULL DEFAULT 0,
+    api_calls INTEGER NOT NULL DEFAULT 0,  -- Hansard requests
+    llm_requests INTEGER NOT NULL DEFAULT 0,
+    llm_prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    llm_output_tokens INTEGER NOT NULL DEFAULT 0,
+    cache_hits INTEGER NOT NULL DEFAULT 0,
+    cache_misses INTEGER NOT NULL DEFAULT 0,
+    counters TEXT  -- JSON: every counter the stage incremented
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_stage ON pipeline_runs(stage, started_at);
+
 -- Pre-seed ministries
 INSERT OR IGNORE INTO ministries (id, name, acronym) VALUES
     ('01', 'Prime Minister''s Office', 'PMO'),
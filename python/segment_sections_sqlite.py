@@ -0,0 +1,96 @@
+"""
+Backfill speaker-turn rows (section_utterances) for sittings already in
+the SQLite database, using the stored section HTML and attendance list.
+Newly ingested sittings are segmented by batch_process_sqlite.py.
+"""
+
+import sys
+from datetime import datetime
+
+from db_sqlite import (
+    close_connection,
+    find_or_create_member,
+    get_connection,
+    init_db,
+    replace_section_utterances,
+)
+from parliament_sitting import MP, ParliamentSitting
+
+
+def load_sitting_members(sitting_id, date):
+    """Rebuild a ParliamentSitting's attendance from stored rows so speakers can be matched."""
+    conn = get_connection()
+    rows = conn.execute(
+        '''SELECT m.name, sa.constituency, sa.designation, sa.present
+           FROM sitting_attendance sa
+           JOIN members m ON m.id = sa.member_id
+           WHERE sa.sitting_id = ?''',
+        (sitting_id,)
+    ).fetchall()
+
+    sitting = ParliamentSitting(date)
+    sitting.present_members = [MP(r['name'], r['constituency'], r['designation']) for r in rows if r['present']]
+    sitting.absent_members = [MP(r['name'], r['constituency'], r['designation']) for r in rows if not r['present']]
+    sitting._build_name_index()
+    return sitting
+
+
+def segment(start_date_str, end_date_str):
+    init_db()
+    conn = get_connection()
+
+    start_date = datetime.strptime(start_date_str, '%d-%m-%Y').strftime('%Y-%m-%d')
+    end_date = datetime.strptime(end_date_str, '%d-%m-%Y').strftime('%Y-%m-%d')
+
+    sittings = conn.execute(
+        "SELECT id, date FROM sittings WHERE date >= ? AND date <= ? ORDER BY date",
+        (start_date, end_date)
+    ).fetchall()
+
+    if not sittings:
+        print(f"No sittings found in range {start_date_str} to {end_date_str}.")
+        close_connection()
+        return
+
+    print(f"Segmenting sections in {len(sittings)} sitting(s)...")
+    total_sections = 0
+    total_turns = 0
+
+    for sitting_row in sittings:
+        sitting = load_sitting_members(sitting_row['id'], sitting_row['date'])
+        sections = conn.execute(
+            "SELECT id, content_html FROM sections WHERE sitting_id = ?",
+            (sitting_row['id'],)
+        ).fetchall()
+
+        member_ids = {}
+        for section in sections:
+            turns = sitting.get_section_turns({'content_html': section['content_html']})
+            for turn in turns:
+                mp = turn['mp']
+                if mp and mp.name not in member_ids:
+                    member_ids[mp.name] = find_or_create_member(mp.name)
+                turn['member_id'] = member_ids[mp.name] if mp else None
+            replace_section_utterances(section['id'], turns)
+            total_turns += len(turns)
+
+        total_sections += len(sections)
+        print(f"  {sitting_row['date']}: {len(sections)} sections")
+
+    print(f"Stored {total_turns} turns for {total_sections} sections.")
+    close_connection()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: uv run segment_sections_sqlite.py START_DATE [END_DATE]")
+        print("Example: uv run segment_sections_sqlite.py 01-01-2024 31-12-2024")
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    dates = [arg for arg in args if not arg.startswith('--')]
+
+    start = dates[0]
+    end = dates[1] if len(dates) > 1 else start
+
+    segment(start, end)
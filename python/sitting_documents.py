@@ -0,0 +1,161 @@
+"""
+Denormalised per-sitting documents for page rendering.
+
+Each sitting gets one JSON document in sitting_documents holding its
+metadata, ordered sections (with speakers, ministry, bill link, summary
+and a plain-text snippet), attendance and bills, keyed the way the
+site's db.ts returns them. Rendering a sitting page is then a single
+primary-key read.
+
+Documents are rebuilt by ingest, duplicate cleanup and summary
+generation for the sittings they touch; a document is only rewritten
+when its content hash changes. Run directly to rebuild every sitting.
+"""
+import hashlib
+import json
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+
+import db_sqlite as db
+import metrics
+
+# Section cards show the first 200 characters, plus an ellipsis if there is more;
+# keeping 300 lets the card tell that there is more
+SNIPPET_CHARS = 300
+
+
+def build_sitting_document(sitting_id: str) -> Optional[Dict]:
+    """Assemble the sitting page document, or None if the sitting does not exist."""
+    conn = db.get_connection()
+    sitting = conn.execute(
+        '''SELECT id, date, sitting_no as sittingNo, parliament, session_no as sessionNo,
+                  volume_no as volumeNo, format, url
+           FROM sittings WHERE id = ?''',
+        (sitting_id,)
+    ).fetchone()
+    if not sitting:
+        return None
+
+    sections = [dict(row) for row in conn.execute(
+        '''SELECT
+               sec.id,
+               sec.sitting_id as sittingId,
+               sec.section_type as sectionType,
+               sec.section_title as sectionTitle,
+               substr(sec.content_plain, 1, ?) as contentPlain,
+               sec.section_order as sectionOrder,
+               sec.category,
+               sec.source_url as sourceUrl,
+               sec.summary,
+               m.name as ministry,
+               COALESCE(b.ministry_id, sec.ministry_id) as ministryId,
+               sec.bill_id as billId,
+               b.title as billTitle
+           FROM sections sec
+           LEFT JOIN bills b ON sec.bill_id = b.id
+           LEFT JOIN ministries m ON COALESCE(b.ministry_id, sec.ministry_id) = m.id
+           WHERE sec.sitting_id = ?
+           ORDER BY sec.section_order ASC''',
+        (SNIPPET_CHARS, sitting_id)
+    )]
+
+    speakers = defaultdict(list)
+    rows = conn.execute(
+        '''SELECT ss.section_id, ss.member_id, m.name, ss.constituency, ss.designation
+           FROM section_speakers ss
+           JOIN sections sec ON ss.section_id = sec.id
+           JOIN members m ON ss.member_id = m.id
+           WHERE sec.sitting_id = ?
+           ORDER BY m.name''',
+        (sitting_id,)
+    )
+    for row in rows:
+        speakers[row['section_id']].append({
+            'memberId': row['member_id'],
+            'name': row['name'],
+            'constituency': row['constituency'],
+            'designation': row['designation'],
+        })
+
+    bills = {}
+    for section in sections:
+        section['speakers'] = speakers[section['id']]
+        bill_title = section.pop('billTitle')
+        if not section['billId']:
+            continue
+        if section['billId'] not in bills:
+            bills[section['billId']] = {
+                'billId': section['billId'],
+                'billTitle': bill_title,
+                'sectionTitle': section['sectionTitle'],
+                'ministry': section['ministry'],
+                'ministryId': section['ministryId'],
+                'readingTypes': [],
+                'sectionOrder': section['sectionOrder'],
+            }
+        bills[section['billId']]['readingTypes'].append(section['sectionType'])
+
+    attendees = [
+        {**dict(row), 'present': row['present'] == 1}
+        for row in conn.execute(
+            '''SELECT m.id, m.name, sa.present, sa.constituency, sa.designation
+               FROM sitting_attendance sa
+               JOIN members m ON sa.member_id = m.id
+               WHERE sa.sitting_id = ?
+               ORDER BY m.name ASC''',
+            (sitting_id,)
+        )
+    ]
+
+    return {
+        'sitting': dict(sitting),
+        'sections': sections,
+        'attendees': attendees,
+        'bills': list(bills.values()),
+    }
+
+
+def refresh_sitting_documents(sitting_ids: Iterable[str]) -> int:
+    """Rebuild documents for the given sittings, writing only those that changed. Returns the number written."""
+    conn = db.get_connection()
+    written = 0
+    for sitting_id in sitting_ids:
+        document = build_sitting_document(sitting_id)
+        if document is None:
+            conn.execute('DELETE FROM sitting_documents WHERE sitting_id = ?', (sitting_id,))
+            continue
+
+        payload = json.dumps(document, ensure_ascii=False, separators=(',', ':'))
+        content_hash = hashlib.sha256(payload.encode()).hexdigest()
+        current = conn.execute(
+            'SELECT content_hash FROM sitting_documents WHERE sitting_id = ?', (sitting_id,)
+        ).fetchone()
+        if current and current['content_hash'] == content_hash:
+            metrics.inc('cache_requests_total', cache='sitting_documents', result='hit')
+            continue
+        metrics.inc('cache_requests_total', cache='sitting_documents', result='miss')
+
+        conn.execute(
+            '''INSERT INTO sitting_documents (sitting_id, document, content_hash)
+               VALUES (?, ?, ?)
+               ON CONFLICT (sitting_id) DO UPDATE SET
+               document = excluded.document,
+               content_hash = excluded.content_hash,
+               updated_at = datetime('now')''',
+            (sitting_id, payload, content_hash)
+        )
+        written += 1
+    conn.commit()
+    return written
+
+
+def rebuild_all() -> int:
+    conn = db.get_connection()
+    sitting_ids = [row['id'] for row in conn.execute('SELECT id FROM sittings ORDER BY date').fetchall()]
+    return refresh_sitting_documents(sitting_ids)
+
+
+if __name__ == "__main__":
+    db.init_db()
+    print(f"Rewrote {rebuild_all()} sitting document(s)")
+    db.close_connection()
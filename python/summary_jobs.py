@@ -0,0 +1,116 @@
+"""
+Persistent ledger of summary generation jobs.
+
+Every section, bill and member selected for summarisation gets a row in
+summary_jobs before any model call is made. Rows move through
+pending -> running -> done/failed, so an interrupted run can be resumed
+with only the jobs that never finished.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import db_sqlite as db
+
+JOB_TYPES = ('section', 'bill', 'member')
+
+# Jobs that have failed this many times are left for manual inspection
+MAX_ATTEMPTS = 5
+
+
+def enqueue_jobs(job_type: str, targets: Iterable[Tuple[str, Optional[str]]]):
+    """Register (target_id, sitting_id) pairs as pending, resetting any previous outcome."""
+    conn = db.get_connection()
+    conn.executemany(
+        '''INSERT INTO summary_jobs (job_type, target_id, sitting_id, state, attempts)
+           VALUES (?, ?, ?, 'pending', 0)
+           ON CONFLICT (job_type, target_id) DO UPDATE SET
+           sitting_id = excluded.sitting_id,
+           state = 'pending',
+           attempts = 0,
+           error = NULL,
+           latency_ms = NULL,
+           updated_at = datetime('now')''',
+        [(job_type, target_id, sitting_id) for target_id, sitting_id in targets]
+    )
+    conn.commit()
+
+
+def start_jobs(job_type: str, target_ids: List[str]):
+    """Mark jobs as in flight and count the attempt."""
+    conn = db.get_connection()
+    conn.executemany(
+        '''INSERT INTO summary_jobs (job_type, target_id, state, attempts)
+           VALUES (?, ?, 'running', 1)
+           ON CONFLICT (job_type, target_id) DO UPDATE SET
+           state = 'running',
+           attempts = attempts + 1,
+           updated_at = datetime('now')''',
+        [(job_type, target_id) for target_id in target_ids]
+    )
+    conn.commit()
+
+
+def complete_jobs(job_type: str, target_ids: List[str], latency_ms: int):
+    """
+    Mark jobs as done. Commits the connection, so any summary writes made
+    beforehand land in the same transaction as the state change.
+    """
+    conn = db.get_connection()
+    conn.executemany(
+        '''UPDATE summary_jobs SET state = 'done', error = NULL, latency_ms = ?,
+           updated_at = datetime('now')
+           WHERE job_type = ? AND target_id = ?''',
+        [(latency_ms, job_type, target_id) for target_id in target_ids]
+    )
+    conn.commit()
+
+
+def fail_jobs(job_type: str, target_ids: List[str], error: str, latency_ms: int = None):
+    """Record a failed attempt."""
+    conn = db.get_connection()
+    conn.executemany(
+        '''UPDATE summary_jobs SET state = 'failed', error = ?, latency_ms = ?,
+           updated_at = datetime('now')
+           WHERE job_type = ? AND target_id = ?''',
+        [(error, latency_ms, job_type, target_id) for target_id in target_ids]
+    )
+    conn.commit()
+
+
+def skip_jobs(job_type: str, target_ids: List[str]):
+    """Mark jobs that turned out to have nothing to summarise."""
+    conn = db.get_connection()
+    conn.executemany(
+        '''UPDATE summary_jobs SET state = 'skipped', updated_at = datetime('now')
+           WHERE job_type = ? AND target_id = ?''',
+        [(job_type, target_id) for target_id in target_ids]
+    )
+    conn.commit()
+
+
+def get_resumable_jobs(job_type: str, max_attempts: int = MAX_ATTEMPTS) -> List[str]:
+    """
+    Target IDs that still need work: never started, interrupted mid-flight
+    (left as 'running' by a crashed run) or failed under the attempt limit.
+    """
+    conn = db.get_connection()
+    cursor = conn.execute(
+        '''SELECT target_id FROM summary_jobs
+           WHERE job_type = ?
+             AND state IN ('pending', 'running', 'failed')
+             AND attempts < ?
+           ORDER BY created_at, target_id''',
+        (job_type, max_attempts)
+    )
+    return [row['target_id'] for row in cursor.fetchall()]
+
+
+def get_job_counts() -> Dict[str, Dict[str, int]]:
+    """Job counts by type and state."""
+    conn = db.get_connection()
+    cursor = conn.execute(
+        'SELECT job_type, state, COUNT(*) as count FROM summary_jobs GROUP BY job_type, state'
+    )
+    counts = {job_type: {} for job_type in JOB_TYPES}
+    for row in cursor.fetchall():
+        counts[row['job_type']][row['state']] = row['count']
+    return counts
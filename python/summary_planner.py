@@ -0,0 +1,178 @@
+"""
+Workload planning for summary generation.
+
+Given the sections, bills and members a run would select, estimates the
+number of model requests, input/output tokens, how much of the work
+already has summaries, and the wall-clock time at the configured
+concurrency, using latencies recorded in the summary_jobs ledger.
+No model calls are made.
+"""
+import json
+import math
+from typing import Dict, List
+
+import db_sqlite as db
+from prompt_builder import (
+    build_bill_prompt,
+    build_bill_prompts,
+    build_multi_section_prompt,
+    build_section_prompt,
+    clean_for_prompt,
+    count_tokens,
+    pack_sections,
+)
+
+# Output size per request when there is no summary history to sample
+DEFAULT_OUTPUT_TOKENS = {'section': 150, 'bill': 300, 'member': 250}
+# Notes produced by each map-stage request for long bills
+CHUNK_NOTE_TOKENS = 300
+# Request latency when the ledger has no history for a job type, excluding the cooldown
+DEFAULT_LATENCY_MS = 5000
+
+SUMMARY_SAMPLES = {
+    'section': 'SELECT summary FROM sections WHERE summary IS NOT NULL ORDER BY rowid DESC LIMIT 200',
+    'bill': 'SELECT summary FROM bills WHERE summary IS NOT NULL ORDER BY rowid DESC LIMIT 200',
+    'member': 'SELECT summary FROM member_summaries WHERE summary IS NOT NULL ORDER BY rowid DESC LIMIT 200',
+}
+
+EXISTING_SUMMARY_QUERIES = {
+    'section': 'SELECT COUNT(*) FROM sections WHERE summary IS NOT NULL AND id IN (SELECT value FROM json_each(?))',
+    'bill': 'SELECT COUNT(*) FROM bills WHERE summary IS NOT NULL AND id IN (SELECT value FROM json_each(?))',
+    'member': '''SELECT COUNT(*) FROM member_summaries
+                 WHERE summary IS NOT NULL AND member_id IN (SELECT value FROM json_each(?))''',
+}
+
+
+def average_output_tokens(job_type: str) -> int:
+    """Mean token count of recent summaries of this type, or a default."""
+    conn = db.get_connection()
+    rows = conn.execute(SUMMARY_SAMPLES[job_type]).fetchall()
+    if not rows:
+        return DEFAULT_OUTPUT_TOKENS[job_type]
+    return round(sum(count_tokens(row[0]) for row in rows) / len(rows))
+
+
+def latency_percentiles(job_type: str) -> Dict[str, int]:
+    """Median and p90 latency of completed jobs of this type from the ledger."""
+    conn = db.get_connection()
+    rows = conn.execute(
+        '''SELECT latency_ms FROM summary_jobs
+           WHERE job_type = ? AND state = 'done' AND latency_ms IS NOT NULL
+           ORDER BY latency_ms''',
+        (job_type,)
+    ).fetchall()
+    if not rows:
+        return {'p50': DEFAULT_LATENCY_MS, 'p90': DEFAULT_LATENCY_MS, 'samples': 0}
+    values = [row[0] for row in rows]
+    return {
+        'p50': values[len(values) // 2],
+        'p90': values[min(len(values) - 1, int(len(values) * 0.9))],
+        'samples': len(values),
+    }
+
+
+def count_existing_summaries(job_type: str, ids: List[str]) -> int:
+    if not ids:
+        return 0
+    conn = db.get_connection()
+    return conn.execute(EXISTING_SUMMARY_QUERIES[job_type], (json.dumps(ids),)).fetchone()[0]
+
+
+class SummaryPlan:
+    """Accumulates the estimated cost of a summary run, one selection at a time."""
+
+    def __init__(self, concurrency: int, cooldown: float):
+        self.concurrency = concurrency
+        self.cooldown = cooldown
+        self.stats = {
+            job_type: {'jobs': 0, 'requests': 0, 'input_tokens': 0, 'output_tokens': 0,
+                       'existing': 0, 'waves': 0}
+            for job_type in DEFAULT_OUTPUT_TOKENS
+        }
+        self._output_per_request = {job_type: average_output_tokens(job_type) for job_type in DEFAULT_OUTPUT_TOKENS}
+
+    def add_sections(self, sections: List[Dict]):
+        """Sections selected for one sitting, packed exactly as a real run would."""
+        stats = self.stats['section']
+        batches = pack_sections([dict(s) for s in sections])
+        for batch in batches:
+            prompt = build_section_prompt(batch[0]) if len(batch) == 1 else build_multi_section_prompt(batch)
+            stats['input_tokens'] += count_tokens(prompt)
+            stats['output_tokens'] += self._output_per_request['section'] * len(batch)
+        stats['jobs'] += len(sections)
+        stats['requests'] += len(batches)
+        stats['waves'] += math.ceil(len(batches) / self.concurrency)
+        stats['existing'] += count_existing_summaries('section', [s['id'] for s in sections])
+
+    def add_bills(self, bills: List[Dict]):
+        """Bills selected for one sitting; each needs a 'text' key. Bills run one after another."""
+        stats = self.stats['bill']
+        for bill in bills:
+            text = clean_for_prompt(bill['text'])
+            chunk_prompts = build_bill_prompts(bill['title'], text)
+            if chunk_prompts is None:
+                stats['input_tokens'] += count_tokens(build_bill_prompt(bill['title'], text))
+                stats['requests'] += 1
+            else:
+                notes_tokens = CHUNK_NOTE_TOKENS * len(chunk_prompts)
+                stats['input_tokens'] += sum(count_tokens(p) for p in chunk_prompts)
+                stats['input_tokens'] += count_tokens(build_bill_prompt(bill['title'], '')) + notes_tokens
+                stats['output_tokens'] += notes_tokens
+                stats['requests'] += len(chunk_prompts) + 1
+            stats['output_tokens'] += self._output_per_request['bill']
+            # A bill job's ledger latency already covers its map and reduce requests
+            stats['waves'] += 1
+        stats['jobs'] += len(bills)
+        stats['existing'] += count_existing_summaries('bill', [b['id'] for b in bills])
+
+    def add_members(self, members: List[Dict], prompts: List[str]):
+        """Members selected for summarising and the prompts built for those with activity."""
+        stats = self.stats['member']
+        stats['jobs'] += len(prompts)
+        stats['requests'] += len(prompts)
+        stats['input_tokens'] += sum(count_tokens(p) for p in prompts)
+        stats['output_tokens'] += self._output_per_request['member'] * len(prompts)
+        stats['waves'] += math.ceil(len(prompts) / self.concurrency)
+        stats['existing'] += count_existing_summaries('member', [m['id'] for m in members])
+
+    def report(self) -> Dict:
+        """Per job type and total estimates, including wall-clock time in seconds."""
+        report = {}
+        totals = {'jobs': 0, 'requests': 0, 'input_tokens': 0, 'output_tokens': 0,
+                  'existing': 0, 'estimated_seconds': 0.0}
+        for job_type, stats in self.stats.items():
+            if not stats['jobs']:
+                continue
+            latency = latency_percentiles(job_type)
+            # Each wave of concurrent requests lasts roughly as long as its slowest request.
+            # Ledger latencies already include the semaphore wait and the cooldown after each request
+            wave_seconds = latency['p90'] / 1000 + (0 if latency['samples'] else self.cooldown)
+            seconds = stats['waves'] * wave_seconds
+            report[job_type] = {
+                **{k: v for k, v in stats.items() if k != 'waves'},
+                'existing_ratio': round(stats['existing'] / stats['jobs'], 3),
+                'latency_ms': latency,
+                'estimated_seconds': round(seconds, 1),
+            }
+            for key in totals:
+                totals[key] += report[job_type][key]
+        totals['estimated_seconds'] = round(totals['estimated_seconds'], 1)
+        report['total'] = totals
+        return report
+
+
+def format_report(report: Dict) -> str:
+    """Human-readable table for a plan report."""
+    lines = [
+        f"{'Job type':<10}{'Jobs':>8}{'Requests':>10}{'In tokens':>12}{'Out tokens':>12}"
+        f"{'Existing':>10}{'p90 ms':>9}{'Est. time':>11}",
+    ]
+    for job_type, row in report.items():
+        p90 = row['latency_ms']['p90'] if 'latency_ms' in row else ''
+        minutes, seconds = divmod(int(row['estimated_seconds']), 60)
+        lines.append(
+            f"{job_type:<10}{row['jobs']:>8}{row['requests']:>10}{row['input_tokens']:>12}"
+            f"{row['output_tokens']:>12}{row['existing']:>10}{p90:>9}{f'{minutes}m{seconds:02d}s':>11}"
+        )
+    lines.append("'Existing' jobs already have a summary and are skipped with --only-blank.")
+    return "\n".join(lines)
@@ -0,0 +1,440 @@
+"""
+Synthetic getHansardReport payloads for scale and load testing.
+
+Generates sittings in the shape the Hansard API returns them, with the
+features ingest has to handle: an attendance list of about a hundred
+members with salutations, constituencies and ministerial appointments;
+oral and written questions, ministerial statements and clarifications,
+adjournment motions, and first and second readings of bills whose titles
+recur across sittings; bold speaker labels in the forms match_speaker
+parses; proc text markers and timestamps; and duplicate titles that
+set_sections merges (questions grouped under one title, second reading
+debates resumed after a break, and Committee of Supply Heads debated in
+many cuts each March).
+
+Output is deterministic for a seed: the payload for a date does not
+depend on which other dates were generated, so a range can be generated
+in any order or in parts. Members are fictitious; each parliament (five
+years) keeps most of the previous one's members and brings in new ones.
+
+SyntheticHansardAPI serves the payloads through
+HansardAPI.parse_report_file(), so ingest_sitting() runs exactly as it
+does against the live API.
+
+Usage:
+  uv run synthetic_hansard.py START_DATE [END_DATE] [--seed N] [--output DIR]
+"""
+import io
+import json
+import random
+import sys
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from hansard_api import HansardAPI
+from parliament_sitting import ParliamentSitting
+
+# Parliament numbers advance every five years from here
+BASE_YEAR = 1900
+PARLIAMENT_YEARS = 5
+MEMBERS_PER_PARLIAMENT = 100
+RETURNING_MEMBERS = 70
+
+GIVEN_NAMES = [
+    "Adrian", "Aisha", "Arun", "Beatrice", "Benedict", "Chen Wei", "Cheryl", "Darius", "Deepa", "Elaine",
+    "Eugene", "Farid", "Fiona", "Gerald", "Grace", "Hafiz", "Hui Min", "Irene", "Ivan", "Jasmine",
+    "Jonathan", "Kamala", "Kenneth", "Lionel", "Li Ting", "Marcus", "Mei Ling", "Nadia", "Nicholas", "Oscar",
+    "Pei Shan", "Priya", "Qamar", "Rachel", "Rizwan", "Shanti", "Suresh", "Tessa", "Umar", "Valerie",
+    "Vikram", "Wen Jie", "Xavier", "Yasmin", "Yong Hao", "Zachary", "Zulkifli", "Siew Lan",
+]
+SURNAMES = [
+    "Ang", "Balakrishnan", "Chan", "Chua", "Danial", "Eng", "Fernandez", "Foo", "Goh", "Haris",
+    "Ho", "Ismail", "Jayaram", "Kang", "Koh", "Kumar", "Lee", "Lim", "Loh", "Mohamed",
+    "Nair", "Ng", "Ong", "Pillai", "Quek", "Rahman", "Sim", "Seow", "Tan", "Teo",
+    "Vasu", "Wee", "Wong", "Yap", "Yeo", "Yusof",
+]
+SALUTATIONS = ["Mr", "Mr", "Mr", "Ms", "Ms", "Dr", "Mdm", "Mrs", "Assoc Prof", "Er Dr"]
+PLACES = [
+    "Anchorvale", "Bukit Serene", "Cempaka", "Dunearn Heights", "East Harbour", "Fernvale Ridge",
+    "Garden Vale", "Hillcrest", "Jurong Lakeside", "Kembangan North", "Loyang Bay", "Marsiling Park",
+    "Northshore", "Orchid Heights", "Pasir Timur", "Queenstown Rise", "Riverside", "Sembawang Hills",
+    "Tampines Vista", "Upper Thomson", "Woodgrove", "Yew Tee Hills", "Kallang Point", "Bedok Reservoir",
+]
+TOPICS = [
+    "Culture, Community and Youth", "Defence", "Digital Development and Information", "Education",
+    "Finance", "Foreign Affairs", "Health", "Home Affairs", "Law", "Manpower", "National Development",
+    "Social and Family Development", "Sustainability and the Environment", "Trade and Industry", "Transport",
+]
+SUPPLY_HEADS = "ABCDEFGHIJKLMNOPQ"
+WORDS = (
+    "the ministry will review scheme support households workers residents estate public housing transport "
+    "fares healthcare subsidies schools teachers training grants businesses productivity climate resilience "
+    "coastal protection rental flats seniors caregivers community programmes data cybersecurity manpower "
+    "employment wage growth families children preschool infrastructure polyclinic waiting times applications "
+    "eligibility criteria assessment framework measures outcomes agencies partners consultation feedback year "
+    "percentage increase cost budget enforcement regulations licensing safety standards review committee"
+).split()
+TITLE_WORDS = (
+    "Housing Grants Polyclinic Waiting Times School Admissions Rental Flats Public Transport Fares Caregiver "
+    "Support Cybersecurity Incidents Coastal Protection Foreign Workers Dormitories Preschool Places Wage "
+    "Credits Scam Losses Food Security Carbon Tax Active Mobility Hawker Centres Lift Upgrading Mental Health"
+).split()
+BILL_SUBJECTS = [
+    "Employment", "Road Traffic", "Income Tax", "Housing and Development", "Healthcare Services", "Maritime",
+    "Energy Conservation", "Online Safety", "Children and Young Persons", "Workplace Safety", "Civil Aviation",
+    "Public Utilities", "Goods and Services Tax", "Infectious Diseases", "Land Transport", "Criminal Procedure",
+]
+PROCEDURAL = [
+    ("Papers Presented to Parliament", "Papers Presented"),
+    ("Permission to Members to be Absent", "Oral Statements"),
+    ("Administration of Oaths", "Oral Statements"),
+]
+
+
+def parliament_for(year: int) -> int:
+    return (year - BASE_YEAR) // PARLIAMENT_YEARS + 1
+
+
+def is_sitting_day(day: date) -> bool:
+    """
+    About 70 sittings a year: Monday to Wednesday in two weeks of three,
+    every weekday in the first week of March, and none over the year end.
+    """
+    if day.month == 3 and day.day <= 7:
+        return day.weekday() < 5
+    if (day.month == 12 and day.day > 20) or (day.month == 1 and day.day < 7):
+        return False
+    return day.weekday() < 3 and day.isocalendar()[1] % 3 != 0
+
+
+@lru_cache(maxsize=None)
+def sitting_days(year: int) -> List[date]:
+    day = date(year, 1, 1)
+    days = []
+    while day.year == year:
+        if is_sitting_day(day):
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+class SyntheticHansard:
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self._rosters = {}
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random('|'.join(map(str, (self.seed, *key))))
+
+    def roster(self, parliament: int) -> List[Dict]:
+        """Members of a parliament; most carry over from the previous one."""
+        if parliament in self._rosters:
+            return self._rosters[parliament]
+        rng = self._rng('roster', parliament)
+        previous = self.roster(parliament - 1) if parliament > 1 else []
+        returning = rng.sample(previous, min(RETURNING_MEMBERS, len(previous)))
+        members = [dict(member, appointment=None) for member in returning]
+        names = {member['name'] for member in members}
+        while len(members) < MEMBERS_PER_PARLIAMENT:
+            given = rng.choice(GIVEN_NAMES)
+            name = f"{given} {rng.choice(SURNAMES)}"
+            if rng.random() < 0.2:
+                name = f"{rng.choice(SURNAMES)} {given}"
+            if name in names:
+                continue
+            names.add(name)
+            members.append({
+                'salutation': rng.choice(SALUTATIONS),
+                'name': name,
+                'constituency': rng.choice(PLACES),
+                'appointment': None,
+            })
+        rng.shuffle(members)
+
+        members[0]['appointment'] = 'Speaker'
+        members[1]['appointment'] = "Prime Minister"
+        for member, topic in zip(members[2:], TOPICS):
+            member['appointment'] = f"Minister for {topic}"
+        for member, topic in zip(members[2 + len(TOPICS):], rng.sample(TOPICS, 8)):
+            member['appointment'] = rng.choice(["Minister of State", "Senior Minister of State"]) + f" for {topic}"
+        for member in members[-9:-6]:
+            member['constituency'] = 'Nominated Member'
+        for member in members[-6:-4]:
+            member['constituency'] = 'Non-Constituency Member'
+        self._rosters[parliament] = members
+        return members
+
+    def bill_title(self, year: int, index: int, k: int) -> str:
+        rng = self._rng('bill', year, index, k)
+        return f"{rng.choice(BILL_SUBJECTS)} ({rng.choice(['Amendment', 'Miscellaneous Amendments'])}) Bill {year}-{index}-{k}"
+
+    def payload(self, day: date) -> Optional[Dict]:
+        """The getHansardReport payload for a date, or None if Parliament did not sit."""
+        if not is_sitting_day(day):
+            return None
+        days = sitting_days(day.year)
+        index = days.index(day)
+        parliament = parliament_for(day.year)
+        rng = self._rng('sitting', day.isoformat())
+        writer = _SittingWriter(rng, self.roster(parliament))
+
+        if day.month == 3 and day.day <= 7:
+            writer.committee_of_supply()
+        else:
+            writer.question_time()
+            for k in range(rng.choice([0, 0, 1, 2, 3])):
+                writer.first_reading(self.bill_title(day.year, index, k))
+            # Bills introduced three sittings earlier come up for second reading
+            if index >= 3:
+                for k in range(rng.choice([0, 1, 1, 2])):
+                    writer.second_reading(self.bill_title(day.year, index - 3, k))
+            if rng.random() < 0.3:
+                writer.ministerial_statement()
+            if rng.random() < 0.6:
+                writer.adjournment_motion()
+            writer.written_answers()
+
+        date_str = day.strftime('%d-%m-%Y')
+        term_year = (day.year - BASE_YEAR) % PARLIAMENT_YEARS
+        return {
+            'metadata': {
+                'sittingDate': date_str,
+                'sittingNO': index + 1,
+                'parlimentNO': parliament,
+                'sessionNO': 1 if term_year < 3 else 2,
+                'volumeNO': parliament * 10 + term_year,
+            },
+            'attendanceList': writer.attendance(),
+            'takesSectionVOList': [
+                {
+                    'sectionId': f"{section_type.lower()}-{date_str}-{i}",
+                    'sectionType': section_type,
+                    'title': title,
+                    'content': content,
+                    'reportType': report_type,
+                }
+                for i, (section_type, title, content, report_type) in enumerate(writer.sections)
+            ],
+        }
+
+
+class _SittingWriter:
+    """Builds one sitting's sections from a roster."""
+
+    def __init__(self, rng: random.Random, roster: List[Dict]):
+        self.rng = rng
+        self.roster = roster
+        self.speaker = roster[0]
+        self.ministers = {m['appointment'][len('Minister for '):]: m for m in roster
+                          if (m['appointment'] or '').startswith('Minister for ')}
+        self.backbench = [m for m in roster if not m['appointment']]
+        self.absent = {m['name'] for m in rng.sample(roster[1:], rng.randint(2, 12))}
+        self.sections = []
+
+    # Text
+
+    def sentence(self) -> str:
+        words = self.rng.choices(WORDS, k=self.rng.randint(10, 28))
+        return words[0].capitalize() + ' ' + ' '.join(words[1:]) + '.'
+
+    def paragraph(self, sentences: int = None) -> str:
+        return ' '.join(self.sentence() for _ in range(sentences or self.rng.randint(2, 6)))
+
+    def p(self, html: str) -> str:
+        return f'<p class="ql-align-justify">{html}</p>'
+
+    def title(self) -> str:
+        return ' '.join(self.rng.sample(TITLE_WORDS, self.rng.randint(2, 4)))
+
+    def timestamp(self) -> str:
+        return f'<h6>{self.rng.randint(1, 11)}.{self.rng.randint(10, 59):02d} pm</h6>'
+
+    @staticmethod
+    def label(member: Dict, constituency: bool = False) -> str:
+        text = f"{member['salutation']} {member['name']}"
+        return f"{text} ({member['constituency']})" if constituency else text
+
+    def role_label(self, topic: str) -> str:
+        minister = self.ministers[topic]
+        return f"The Minister for {topic} ({self.label(minister)})"
+
+    def speech(self, label: str, paragraphs: int) -> List[str]:
+        parts = [self.p(f"<strong>{label}</strong>: {self.paragraph()}")]
+        parts.extend(self.p(self.paragraph(5)) for _ in range(paragraphs))
+        return parts
+
+    # Sections
+
+    def add(self, section_type: str, title: str, parts: List[str], report_type: str):
+        self.sections.append((section_type, title, ''.join(parts), report_type))
+
+    def question(self, topic: str, supplementaries: int) -> List[str]:
+        asker = self.rng.choice(self.backbench)
+        parts = [
+            self.p(f"{self.rng.randint(1, 60)} <strong>{self.label(asker)}</strong> asked the Minister for "
+                   f"{topic} {self.paragraph(2).lower()}"),
+            *self.speech(self.role_label(topic), self.rng.randint(1, 4)),
+        ]
+        minister = self.ministers[topic]
+        for _ in range(supplementaries):
+            member = self.rng.choice(self.backbench)
+            parts.append(self.p(f"<strong>Mr Speaker</strong>: {self.label(member)}."))
+            parts.extend(self.speech(self.label(member, constituency=True), 0))
+            parts.extend(self.speech(self.label(minister), self.rng.randint(0, 1)))
+        return parts
+
+    def question_time(self):
+        for _ in range(self.rng.randint(8, 20)):
+            topic = self.rng.choice(TOPICS)
+            parts = self.question(topic, self.rng.randint(0, 3))
+            # Related questions are answered together under one title
+            if self.sections and self.rng.random() < 0.15:
+                title = self.sections[-1][1]
+            else:
+                title = self.title()
+            self.add('OA', title, parts, 'Oral Answers to Questions')
+        for _ in range(self.rng.randint(0, 8)):
+            self.add('WANA', self.title(), self.question(self.rng.choice(TOPICS), 0),
+                     'Written Answers to Oral Questions Not Answered by End of Question Time')
+        for title, report_type in self.rng.sample(PROCEDURAL, self.rng.randint(0, 2)):
+            self.add('OS', title, [self.p(f"[(proc text) {self.sentence()} (proc text)]")], report_type)
+
+    def first_reading(self, title: str):
+        topic = self.rng.choice(TOPICS)
+        self.add('BI', title, [self.p(
+            f'[(proc text) "{self.sentence()}", presented by the Minister for {topic}; read the first time; '
+            f'to be read a second time at the next available Sitting of Parliament, and to be printed. (proc text)]'
+        )], 'Bills Introduced')
+
+    def debate(self, topic: str, speeches: int, opening: bool, closing: bool) -> List[str]:
+        parts = [self.timestamp()]
+        if opening:
+            parts.append(self.p('[(proc text) Order for Second Reading read. (proc text)]'))
+            parts.extend(self.speech(self.role_label(topic), self.rng.randint(3, 8)))
+        for i in range(speeches):
+            if i and i % 5 == 0:
+                parts.append(self.timestamp())
+            parts.extend(self.speech(self.label(self.rng.choice(self.backbench), constituency=True),
+                                     self.rng.randint(1, 5)))
+        if closing:
+            parts.extend(self.speech(self.label(self.ministers[topic]), self.rng.randint(2, 6)))
+            parts.append(self.p('[(proc text) Question put, and agreed to. (proc text)]'))
+            parts.append(self.p('[(proc text) Bill accordingly read a second time and committed to a '
+                                'Committee of the whole House. (proc text)]'))
+        return parts
+
+    def second_reading(self, title: str):
+        topic = self.rng.choice(TOPICS)
+        # A debate resumed after the break arrives as another section with the same title
+        cuts = self.rng.choice([1, 1, 2, 3])
+        for cut in range(cuts):
+            self.add('BP', title, self.debate(topic, self.rng.randint(2, 6), cut == 0, cut == cuts - 1),
+                     'Second Reading Bills')
+
+    def committee_of_supply(self):
+        for head, topic in self.rng.sample(list(zip(SUPPLY_HEADS, TOPICS)), 4):
+            title = f"Committee of Supply – Head {head} (Ministry of {topic})"
+            cuts = self.rng.randint(8, 16)
+            for cut in range(cuts):
+                self.add('BP', title, self.debate(topic, self.rng.randint(1, 3), cut == 0, cut == cuts - 1),
+                         'Second Reading Bills')
+        self.written_answers()
+
+    def ministerial_statement(self):
+        topic = self.rng.choice(TOPICS)
+        subject = self.title()
+        self.add('OS', f"Ministerial Statement on {subject}",
+                 self.speech(self.role_label(topic), self.rng.randint(5, 12)), 'Ministerial Statements')
+        parts = []
+        for _ in range(self.rng.randint(2, 6)):
+            parts.extend(self.speech(self.label(self.rng.choice(self.backbench), constituency=True), 1))
+            parts.extend(self.speech(self.label(self.ministers[topic]), 1))
+        self.add('OS', f"Clarifications on {subject}", parts, 'Ministerial Statements')
+
+    def adjournment_motion(self):
+        self.add('OS', 'Adjournment Motion',
+                 [self.p('[(proc text) Motion made, and Question proposed, "That Parliament do now adjourn." (proc text)]')],
+                 'Oral Statements')
+        member = self.rng.choice(self.backbench)
+        topic = self.rng.choice(TOPICS)
+        parts = self.speech(self.label(member, constituency=True), self.rng.randint(4, 8))
+        parts.extend(self.speech(self.role_label(topic), self.rng.randint(3, 6)))
+        parts.append(self.p('[(proc text) Question put, and agreed to. (proc text)]'))
+        self.add('OS', self.title(), parts, 'Matter Raised On Adjournment Motion')
+
+    def written_answers(self):
+        for _ in range(self.rng.randint(10, 45)):
+            topic = self.rng.choice(TOPICS)
+            asker = self.rng.choice(self.backbench)
+            self.add('WA', self.title(), [
+                self.p(f"{self.rng.randint(1, 60)} <strong>{self.label(asker)}</strong> asked the Minister for "
+                       f"{topic} {self.paragraph(1).lower()}"),
+                *self.speech(self.label(self.ministers[topic]), self.rng.randint(0, 3)),
+            ], 'Written Answers to Questions')
+
+    def attendance(self) -> List[Dict]:
+        entries = []
+        for member in self.roster:
+            text = self.label(member, constituency=True)
+            if member['appointment'] == 'Speaker':
+                entry = f"Mr SPEAKER ({text})."
+            elif member['appointment']:
+                entry = f"{text}, {member['appointment']}."
+            else:
+                entry = f"{text}."
+            entries.append({'mpName': entry, 'attendance': member['name'] not in self.absent})
+        return entries
+
+
+class SyntheticHansardAPI(HansardAPI):
+    """HansardAPI that parses generated payloads instead of fetching them."""
+
+    def __init__(self, seed: int = 0):
+        super().__init__()
+        self.generator = SyntheticHansard(seed)
+
+    def fetch_by_date(self, date_str: str) -> Optional[ParliamentSitting]:
+        payload = self.generator.payload(datetime.strptime(date_str, '%d-%m-%Y').date())
+        if not payload:
+            return None
+        return self.parse_report_file(date_str, io.BytesIO(json.dumps(payload).encode()))
+
+
+def sitting_dates(start: date, end: date) -> List[str]:
+    """Dates (DD-MM-YYYY) Parliament sits on between start and end inclusive."""
+    dates = []
+    for year in range(start.year, end.year + 1):
+        dates.extend(day.strftime('%d-%m-%Y') for day in sitting_days(year) if start <= day <= end)
+    return dates
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    options = {}
+    for option in ('--seed', '--output'):
+        if option in args:
+            idx = args.index(option)
+            options[option] = args[idx + 1]
+            del args[idx:idx + 2]
+
+    dates = [arg for arg in args if not arg.startswith('--')]
+    if not dates:
+        print(__doc__.split('Usage:')[1].rstrip())
+        sys.exit(1)
+
+    seed = int(options.get('--seed', 0))
+    output_dir = Path(options['--output']) if '--output' in options else None
+
+    start = datetime.strptime(dates[0], '%d-%m-%Y').date()
+    end = datetime.strptime(dates[1], '%d-%m-%Y').date() if len(dates) > 1 else start
+    generator = SyntheticHansard(seed)
+
+    for date_str in sitting_dates(start, end):
+        payload = generator.payload(datetime.strptime(date_str, '%d-%m-%Y').date())
+        size = len(json.dumps(payload))
+        print(f"{date_str}: {len(payload['takesSectionVOList'])} sections, {size / 1000:.0f} KB")
+        if output_dir:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            (output_dir / f"{date_str}.json").write_text(json.dumps(payload, indent=1))
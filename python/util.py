@@ -1,7 +1,7 @@
 import re
 
-from bs4 import BeautifulSoup
-from typing import Optional, Tuple
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
 
 SALUTATIONS = [
     "Assoc Prof Dr",
@@ -155,7 +155,9 @@ def clean_html_for_display(html_content: str) -> str:
     clean = re.sub(r'\s*\(proc text\)\]', '</span>', clean)
     
     # Keep <p>, <strong>, <br> tags for formatting
-    # Remove other tags
+    # Remove other tags. bs4 is imported here, on first use, so importing
+    # this module (and everything that imports it) stays fast
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(clean, 'html.parser')
     
     # Convert to formatted text preserving structure
@@ -193,4 +195,150 @@ def strip_all_html(html: str) -> str:
     clean = clean.replace('&quot;', '"')
     clean = re.sub(r'\s+', ' ', clean)
     
-    return clean.strip()
\ No newline at end of file
+    return clean.strip()
+
+
+VOID_TAGS = {'br', 'hr', 'img', 'wbr', 'input', 'meta', 'link', 'col', 'area', 'base', 'embed', 'source', 'track', 'param'}
+
+
+class _TopLevelBlockParser(HTMLParser):
+    """Collects (tag, start, end) character spans of top-level elements."""
+
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=True)
+        self.html = html
+        self.line_starts = [0] + [m.end() for m in re.finditer(r'\n', html)]
+        self.blocks = []
+        self.depth = 0
+        self.current = None
+
+    def _offset(self) -> int:
+        line, col = self.getpos()
+        return self.line_starts[line - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        start = self._offset()
+        if self.depth == 0:
+            if tag in VOID_TAGS:
+                end = self.html.find('>', start) + 1
+                self.blocks.append((tag, start, end))
+                return
+            self.current = (tag, start)
+        if tag not in VOID_TAGS:
+            self.depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self.depth == 0:
+            start = self._offset()
+            self.blocks.append((tag, start, self.html.find('>', start) + 1))
+
+    def handle_endtag(self, tag):
+        if self.depth == 0 or tag in VOID_TAGS:
+            return
+        self.depth -= 1
+        if self.depth == 0 and self.current:
+            end = self.html.find('>', self._offset()) + 1
+            self.blocks.append((self.current[0], self.current[1], end))
+            self.current = None
+
+    def close(self):
+        super().close()
+        # Unclosed trailing element runs to the end of the document
+        if self.current:
+            self.blocks.append((self.current[0], self.current[1], len(self.html)))
+            self.current = None
+
+
+_SPEAKER_PARAGRAPH = re.compile(
+    r'^(<p\b[^>]*>)\s*<strong\b[^>]*>(.*?)</strong>(.*)</p>\s*$',
+    re.DOTALL | re.IGNORECASE
+)
+
+
+def _parse_speaker_paragraph(block_html: str) -> Optional[Tuple[str, str]]:
+    """Return (speaker label, body html) if the paragraph opens with a bold speaker label."""
+    match = _SPEAKER_PARAGRAPH.match(block_html)
+    if not match:
+        return None
+    open_tag, speaker_html, tail_html = match.groups()
+    speaker_raw = re.sub(r'\s+', ' ', strip_all_html(speaker_html)).strip()
+    if not speaker_raw:
+        return None
+
+    tail_text = strip_all_html(tail_html)
+    if not (re.search(r'[:：]\s*$', speaker_raw) or re.match(r'\s*[:：]', tail_text)):
+        return None
+
+    label = re.sub(r'[:：]\s*$', '', speaker_raw).strip()
+    if not label:
+        return None
+
+    body = re.sub(r'^\s*[:：]\s*', '', tail_html)
+    body_html = f"{open_tag}{body}</p>" if strip_all_html(body) else ""
+    return label, body_html
+
+
+def split_transcript_turns(content_html: str) -> List[Dict]:
+    """
+    Split display HTML into ordered transcript rows, mirroring how the site
+    lays out a transcript: a paragraph opening with "<strong>Speaker:</strong>"
+    starts a speech turn, following paragraphs belong to that turn, and
+    timestamps (<h6>) or procedural blocks close it.
+
+    Each row has kind ('speech', 'procedural', 'timestamp' or 'standalone'),
+    speaker_label, content_html, content_plain, and char_start/char_end
+    offsets of the row in content_html.
+    """
+    if not content_html:
+        return []
+
+    parser = _TopLevelBlockParser(content_html)
+    parser.feed(content_html)
+    parser.close()
+
+    rows = []
+    current_turn = None
+    for tag, start, end in parser.blocks:
+        block_html = content_html[start:end]
+
+        if tag == 'h6':
+            rows.append(_turn_row('timestamp', None, block_html, start, end))
+            current_turn = None
+            continue
+
+        if re.search(r'class="[^"]*\bproc\b', block_html):
+            rows.append(_turn_row('procedural', None, block_html, start, end))
+            current_turn = None
+            continue
+
+        speaker = _parse_speaker_paragraph(block_html) if tag == 'p' else None
+        if speaker:
+            label, body_html = speaker
+            current_turn = _turn_row('speech', label, body_html, start, end)
+            rows.append(current_turn)
+            continue
+
+        if current_turn:
+            current_turn['parts'].append(block_html)
+            current_turn['char_end'] = end
+            continue
+
+        if tag in VOID_TAGS:
+            continue
+        rows.append(_turn_row('standalone', None, block_html, start, end))
+
+    for row in rows:
+        parts = row.pop('parts')
+        row['content_html'] = ''.join(parts)
+        row['content_plain'] = '\n\n'.join(filter(None, (strip_all_html(part) for part in parts)))
+    return rows
+
+
+def _turn_row(kind: str, speaker_label: Optional[str], html: str, start: int, end: int) -> Dict:
+    return {
+        'kind': kind,
+        'speaker_label': speaker_label,
+        'parts': [html] if html else [],
+        'char_start': start,
+        'char_end': end,
+    }
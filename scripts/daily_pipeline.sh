@@ -32,6 +32,8 @@ LOCK_DIR="${LOCK_BASE_DIR}/daily_pipeline.lock"
 LOG_DIR="${REPO_ROOT}/logs/pipeline"
 RUN_TS="$(TZ="${TZ_REGION}" date '+%Y%m%d-%H%M%S')"
 LOG_FILE="${LOG_DIR}/run-${RUN_TS}.log"
+# Groups this run's stages in the pipeline_runs ledger
+export PIPELINE_RUN_ID="${RUN_TS}"
 
 START_EPOCH="$(date +%s)"
 DEPLOY_DECISION="not-evaluated"
@@ -46,7 +48,7 @@ Options:
   --lookback-days N        Recent window override: today-N through today
   --skip-summaries         Skip sitting summaries
   --skip-deploy            Skip Astro build/deploy even when data changed
-  --force-deploy           Force Astro build/deploy regardless of data digest
+  --force-deploy           Force Astro build/deploy regardless of data changes
   --dry-run                Print commands without executing them
   -h, --help               Show this help text
 EOF
@@ -128,66 +130,13 @@ get_latest_sitting_iso() {
   printf '%s' "${latest}"
 }
 
-compute_digest() {
-  local db_path="$1"
-  local iso_start="$2"
-  local iso_end="$3"
-
-  if [[ ! -f "${db_path}" ]]; then
-    printf 'MISSING'
-    return 0
-  fi
+change_log_head() {
+  (cd "${PYTHON_DIR}" && uv run --quiet change_log.py head)
+}
 
-  sqlite3 -readonly "${db_path}" <<SQL | shasum -a 256 | awk '{print $1}'
-.mode list
-.separator |
-SELECT 'sittings', s.id, s.date,
-       COALESCE(s.sitting_no, ''), COALESCE(s.parliament, ''), COALESCE(s.session_no, ''),
-       COALESCE(s.volume_no, ''), COALESCE(s.format, ''), COALESCE(s.url, '')
-FROM sittings s
-WHERE s.date >= '${iso_start}' AND s.date <= '${iso_end}'
-ORDER BY s.date, s.id;
-
-SELECT 'sections', sec.id, sec.sitting_id,
-       COALESCE(sec.ministry_id, ''), COALESCE(sec.bill_id, ''), COALESCE(sec.category, ''),
-       COALESCE(sec.section_type, ''), COALESCE(sec.section_title, ''), COALESCE(sec.content_html, ''),
-       COALESCE(sec.content_plain, ''), COALESCE(sec.section_order, ''), COALESCE(sec.source_url, ''),
-       COALESCE(sec.summary, '')
-FROM sections sec
-JOIN sittings s ON s.id = sec.sitting_id
-WHERE s.date >= '${iso_start}' AND s.date <= '${iso_end}'
-ORDER BY s.date, sec.section_order, sec.id;
-
-SELECT 'section_speakers', ss.section_id, ss.member_id,
-       COALESCE(ss.constituency, ''), COALESCE(ss.designation, '')
-FROM section_speakers ss
-WHERE ss.section_id IN (
-  SELECT sec.id
-  FROM sections sec
-  JOIN sittings s ON s.id = sec.sitting_id
-  WHERE s.date >= '${iso_start}' AND s.date <= '${iso_end}'
-)
-ORDER BY ss.section_id, ss.member_id;
-
-SELECT 'sitting_attendance', sa.sitting_id, sa.member_id, sa.present,
-       COALESCE(sa.constituency, ''), COALESCE(sa.designation, '')
-FROM sitting_attendance sa
-JOIN sittings s ON s.id = sa.sitting_id
-WHERE s.date >= '${iso_start}' AND s.date <= '${iso_end}'
-ORDER BY s.date, sa.member_id;
-
-SELECT 'bills', b.id, b.title,
-       COALESCE(b.ministry_id, ''), COALESCE(b.first_reading_date, ''),
-       COALESCE(b.first_reading_sitting_id, ''), COALESCE(b.summary, '')
-FROM bills b
-WHERE b.id IN (
-  SELECT DISTINCT sec.bill_id
-  FROM sections sec
-  JOIN sittings s ON s.id = sec.sitting_id
-  WHERE s.date >= '${iso_start}' AND s.date <= '${iso_end}' AND sec.bill_id IS NOT NULL
-)
-ORDER BY b.id;
-SQL
+# The deployed site reflects every change through POST_SEQ, so those entries are no longer needed
+prune_change_log() {
+  run_in_dir "${PYTHON_DIR}" uv run change_log.py prune "${POST_SEQ}"
 }
 
 git_is_deploy_safe() {
@@ -321,7 +270,6 @@ require_cmd uv
 require_cmd bun
 require_cmd git
 require_cmd sqlite3
-require_cmd shasum
 
 log "Starting daily pipeline."
 log "Repo root: ${REPO_ROOT}"
@@ -334,30 +282,40 @@ log "DB path: ${DB_PATH}"
 log "Flags: skip_summaries=${SKIP_SUMMARIES}, skip_deploy=${SKIP_DEPLOY}, force_deploy=${FORCE_DEPLOY}, dry_run=${DRY_RUN}"
 
 if [[ "${DRY_RUN}" -eq 1 ]]; then
-  PRE_DIGEST="dry-run"
+  PRE_SEQ="dry-run"
 else
-  PRE_DIGEST="$(compute_digest "${DB_PATH}" "${ISO_START}" "${ISO_END}")"
+  PRE_SEQ="$(change_log_head)"
 fi
-log "Pre-run digest: ${PRE_DIGEST}"
+log "Pre-run change log seq: ${PRE_SEQ}"
 
-run_in_dir "${PYTHON_DIR}" uv run batch_process_sqlite.py "${START_DATE}" "${END_DATE}"
-run_in_dir "${PYTHON_DIR}" uv run cleanup_duplicates_sqlite.py "${START_DATE}" "${END_DATE}" --keep-newest
-
-if [[ "${SKIP_SUMMARIES}" -eq 0 ]]; then
-  run_in_dir "${PYTHON_DIR}" uv run generate_summaries_sqlite.py --sittings "${START_DATE}" "${END_DATE}" --only-blank
-else
+# Ingest, dedupe, the member graph and sitting summaries run in one process
+PIPELINE_ARGS=("${START_DATE}" "${END_DATE}" --keep-newest --only-blank)
+if [[ "${SKIP_SUMMARIES}" -eq 1 ]]; then
   log "Skipping sitting summaries (--skip-summaries)."
+  PIPELINE_ARGS+=(--skip-summaries)
+fi
+run_in_dir "${PYTHON_DIR}" uv run pipeline_sqlite.py "${PIPELINE_ARGS[@]}"
+
+run_in_dir "${PYTHON_DIR}" uv run related_sections_sqlite.py "${START_DATE}" "${END_DATE}"
+run_in_dir "${PYTHON_DIR}" uv run export_lists_sqlite.py "${START_DATE}" "${END_DATE}"
+
+# Compare this run's stage timings with recent runs; a flagged stage is
+# logged for follow-up but does not block the deploy
+if ! run_in_dir "${PYTHON_DIR}" uv run run_ledger.py report; then
+  log "Run ledger flagged a failed or slower stage (see report above)."
 fi
 
-POST_DIGEST="${PRE_DIGEST}"
+POST_SEQ="${PRE_SEQ}"
 if [[ "${DRY_RUN}" -eq 0 ]]; then
-  POST_DIGEST="$(compute_digest "${DB_PATH}" "${ISO_START}" "${ISO_END}")"
+  POST_SEQ="$(change_log_head)"
 fi
-log "Post-run digest: ${POST_DIGEST}"
+log "Post-run change log seq: ${POST_SEQ}"
 
 DATA_CHANGED=0
-if [[ "${PRE_DIGEST}" != "${POST_DIGEST}" ]]; then
+if [[ "${PRE_SEQ}" != "${POST_SEQ}" ]]; then
   DATA_CHANGED=1
+  # Changed entities and the pages that render them, kept beside the run log
+  run_in_dir "${PYTHON_DIR}" uv run change_log.py since "${PRE_SEQ}" --output "${LOG_DIR}/changes-${RUN_TS}.json"
 fi
 log "Data changed: ${DATA_CHANGED}"
 
@@ -373,6 +331,7 @@ elif [[ "${FORCE_DEPLOY}" -eq 1 ]]; then
   fi
   run_in_dir "${ASTRO_DIR}" bun run build
   run_in_dir "${ASTRO_DIR}" bun run deploy
+  prune_change_log
   DEPLOY_DECISION="forced deploy"
 elif [[ "${DATA_CHANGED}" -eq 1 ]]; then
   if ! git_is_deploy_safe; then
@@ -380,6 +339,7 @@ elif [[ "${DATA_CHANGED}" -eq 1 ]]; then
   fi
   run_in_dir "${ASTRO_DIR}" bun run build
   run_in_dir "${ASTRO_DIR}" bun run deploy
+  prune_change_log
   DEPLOY_DECISION="deployed (data changed)"
 else
   DEPLOY_DECISION="skipped (no data changes)"